@@ -1,15 +1,40 @@
 from rest_framework import viewsets
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
+from .optimization import optimize_queryset
+from ..utils.streaming import EXPORT_FORMATS, streaming_export_response
+
+# Параметры SparseFieldsetSerializer для документации GET-методов
+SPARSE_FIELDSET_PARAMETERS = [
+    openapi.Parameter(
+        'fields', openapi.IN_QUERY, type=openapi.TYPE_STRING,
+        description="Поля ответа через запятую, поля вложенных объектов через точку: id,title,department.name"
+    ),
+    openapi.Parameter(
+        'expand', openapi.IN_QUERY, type=openapi.TYPE_STRING,
+        description="Связи, которые отдаются вложенными объектами; остальные отдаются как id. "
+                    "Без параметра раскрыты все связи"
+    ),
+]
 
 class BaseModelViewSet(viewsets.ModelViewSet):
     """
     Базовый класс для всех ViewSet с улучшенной документацией Swagger
     """
+
+    def filter_queryset(self, queryset):
+        """
+        Подгружает вложенные связи сериализатора одним запросом (без N+1)
+        """
+        queryset = super().filter_queryset(queryset)
+        paginator = self.paginator
+        keep = paginator.get_ordering(self) if hasattr(paginator, 'get_ordering') else ()
+        return optimize_queryset(queryset, self.get_serializer(), keep=keep)
     
     @swagger_auto_schema(
         operation_description="Получить список объектов",
-        operation_summary="Список объектов"
+        operation_summary="Список объектов",
+        manual_parameters=SPARSE_FIELDSET_PARAMETERS
     )
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
@@ -17,6 +42,7 @@ class BaseModelViewSet(viewsets.ModelViewSet):
     @swagger_auto_schema(
         operation_description="Получить детальную информацию об объекте",
         operation_summary="Детали объекта",
+        manual_parameters=SPARSE_FIELDSET_PARAMETERS,
         responses={404: "Объект не найден"}
     )
     def retrieve(self, request, *args, **kwargs):
@@ -70,4 +96,26 @@ class BaseModelViewSet(viewsets.ModelViewSet):
         }
     )
     def destroy(self, request, *args, **kwargs):
-        return super().destroy(request, *args, **kwargs) 
\ No newline at end of file
+        return super().destroy(request, *args, **kwargs) 
+
+class StreamingExportMixin:
+    """
+    Потоковая выгрузка списка целиком: ?export=ndjson или ?export=json.
+    Строки читаются из БД порциями и сериализуются по одной.
+    """
+    export_query_param = 'export'
+    # Форматы выгрузки эндпоинта - перечисляются в ошибке о неверном формате
+    export_formats = tuple(EXPORT_FORMATS)
+
+    def list(self, request, *args, **kwargs):
+        export_format = request.query_params.get(self.export_query_param)
+        if export_format:
+            return self.export_response(self.filter_queryset(self.get_queryset()), export_format)
+        return super().list(request, *args, **kwargs)
+
+    def export_response(self, queryset, export_format):
+        """Ответ с выгрузкой; наследники добавляют свои форматы (csv, xlsx)"""
+        serializer = self.get_serializer()
+        return streaming_export_response(
+            self.request, queryset, serializer.to_representation, export_format, self.export_formats
+        )
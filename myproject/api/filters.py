@@ -0,0 +1,175 @@
+from datetime import datetime, time
+from decimal import Decimal, InvalidOperation
+
+from django.db.models import Subquery
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from drf_yasg import openapi
+
+from ..exceptions import ValidationError
+from ..models import Job, JobSkill
+
+
+class InvalidFilterError(ValidationError):
+    default_detail = 'Некорректное значение фильтра'
+    default_code = 'invalid_filter'
+
+
+class InvalidOrderingError(ValidationError):
+    default_detail = 'Сортировка по этому полю недоступна'
+    default_code = 'invalid_ordering'
+
+
+def parse_int(value):
+    return int(value)
+
+
+def parse_int_list(value):
+    """Список id через запятую: "1,2,3" """
+    return [int(item) for item in value.split(',') if item.strip()]
+
+
+def parse_decimal(value):
+    try:
+        return Decimal(value)
+    except InvalidOperation:
+        raise ValueError(value)
+
+
+def parse_bool(value):
+    if value.lower() in ('1', 'true', 'yes'):
+        return True
+    if value.lower() in ('0', 'false', 'no'):
+        return False
+    raise ValueError(value)
+
+
+def parse_moment(value, end_of_day=False):
+    """Дата (YYYY-MM-DD) или дата-время в ISO 8601"""
+    moment = parse_datetime(value)
+    if moment is None:
+        day = parse_date(value)
+        if day is None:
+            raise ValueError(value)
+        moment = datetime.combine(day, time.max if end_of_day else time.min)
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+class Filter:
+    """
+    Один параметр запроса, который превращается в условие WHERE
+    """
+
+    def __init__(self, lookup, parse=str, description=''):
+        self.lookup = lookup
+        self.parse = parse
+        self.description = description
+
+    def apply(self, queryset, value):
+        return queryset.filter(**{self.lookup: value})
+
+
+class RequiredSkillsFilter(Filter):
+    """
+    Вакансии, у которых среди обязательных навыков есть хотя бы один из указанных.
+    Подзапрос по JobSkill вместо JOIN не размножает строки вакансий,
+    поэтому DISTINCT не нужен.
+    """
+
+    def apply(self, queryset, value):
+        skill_jobs = JobSkill.objects.filter(is_required=True, skill__in=value).values('job_id')
+        return queryset.filter(id__in=Subquery(skill_jobs))
+
+
+class FilterSet:
+    """
+    Декларативный набор фильтров и сортировок для списка.
+
+    filters - параметры запроса и соответствующие им условия.
+    ordering_fields - белый список сортировок: каждое поле должно быть
+    ведущей колонкой индекса модели, иначе сортировка вызовет filesort
+    (это проверяется тестом через indexed_ordering_fields()).
+    Сортировка всегда дополняется id, чтобы порядок был однозначным
+    и подходил для курсорной пагинации.
+    """
+    model = None
+    filters = {}
+    ordering_param = 'ordering'
+    ordering_fields = ()
+    default_ordering = ()
+
+    def __init__(self, params):
+        self.params = params
+
+    def filter_queryset(self, queryset, only=None, exclude=()):
+        for name, declared in self.filters.items():
+            if name in exclude or (only is not None and name not in only):
+                continue
+            raw = self.params.get(name, '').strip()
+            if not raw:
+                continue
+            try:
+                value = declared.parse(raw)
+            except (TypeError, ValueError):
+                raise InvalidFilterError(f'Некорректное значение параметра {name}: {raw}')
+            queryset = declared.apply(queryset, value)
+        return queryset
+
+    def get_ordering(self):
+        raw = self.params.get(self.ordering_param, '').strip()
+        if not raw:
+            return tuple(self.default_ordering)
+        field = raw.lstrip('-')
+        if field not in self.ordering_fields:
+            raise InvalidOrderingError(
+                f'Сортировка по полю {field} недоступна. '
+                f'Допустимые значения: {", ".join(self.ordering_fields)} (с "-" для обратного порядка)'
+            )
+        prefix = '-' if raw.startswith('-') else ''
+        return (f'{prefix}{field}', f'{prefix}id')
+
+    @classmethod
+    def openapi_parameters(cls):
+        """Параметры запроса для swagger_auto_schema"""
+        parameters = [
+            openapi.Parameter(name, openapi.IN_QUERY, description=declared.description, type=openapi.TYPE_STRING)
+            for name, declared in cls.filters.items()
+        ]
+        parameters.append(openapi.Parameter(
+            cls.ordering_param, openapi.IN_QUERY, type=openapi.TYPE_STRING,
+            description=f'Сортировка: {", ".join(cls.ordering_fields)} (с "-" для обратного порядка)'
+        ))
+        return parameters
+
+    @classmethod
+    def indexed_ordering_fields(cls):
+        """Поля, которые являются ведущей колонкой хотя бы одного индекса без условия"""
+        leading = set()
+        for index in cls.model._meta.indexes:
+            if index.condition is None:
+                leading.add(index.fields[0].lstrip('-'))
+        return leading
+
+
+class JobFilterSet(FilterSet):
+    """Фильтры и сортировки /api/jobs/"""
+    model = Job
+    filters = {
+        'salary_min': Filter('salary__gte', parse_decimal, 'Минимальная зарплата'),
+        'salary_max': Filter('salary__lte', parse_decimal, 'Максимальная зарплата'),
+        'deadline_after': Filter('deadline__gte', parse_moment, 'Дедлайн не раньше (дата или дата-время)'),
+        'deadline_before': Filter(
+            'deadline__lte', lambda value: parse_moment(value, end_of_day=True),
+            'Дедлайн не позже (дата или дата-время)'
+        ),
+        'is_active': Filter('is_active', parse_bool, 'Только активные (true) или только закрытые (false)'),
+        'department': Filter('department_id', parse_int, 'ID отдела'),
+        'job_type': Filter('job_type', str, 'Тип вакансии'),
+        'employer': Filter('employer_id', parse_int, 'ID работодателя'),
+        'skills': RequiredSkillsFilter('required_skills__skill__in', parse_int_list, 'ID обязательных навыков через запятую'),
+    }
+    # Зарплата может быть NULL, а курсор по NULL не строится - поэтому ее в списке нет
+    ordering_fields = ('created_at', 'deadline')
+    default_ordering = ('-created_at', '-id')
@@ -0,0 +1,101 @@
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from drf_yasg import openapi
+from rest_framework.response import Response
+
+from ..exceptions import IdempotencyKeyInProgressError, IdempotencyKeyReusedError, ValidationError
+from ..utils.resumes import file_sha256
+
+IDEMPOTENCY_HEADER = 'Idempotency-Key'
+MAX_KEY_LENGTH = 255
+
+IDEMPOTENCY_KEY_PARAMETER = openapi.Parameter(
+    IDEMPOTENCY_HEADER, openapi.IN_HEADER, type=openapi.TYPE_STRING, required=False,
+    description="Уникальный ключ запроса (например, UUID). Повтор с тем же ключом "
+                "возвращает сохраненный первый ответ и не создает объект повторно"
+)
+
+
+def _cache_key(user, key):
+    digest = hashlib.sha256(f'{user.pk}:{key}'.encode()).hexdigest()
+    return f'idempotency:{digest}'
+
+
+def _body_digest(request):
+    """
+    Хеш тела запроса. Multipart-запрос целиком в память не читается:
+    хешируются поля формы и SHA-256 файлов (для резюме он уже посчитан
+    обработчиком загрузки)
+    """
+    if not request.content_type.startswith('multipart/'):
+        return hashlib.sha256(request.body).hexdigest()
+    form = {
+        'fields': sorted(request.POST.lists()),
+        'files': sorted(
+            (name, [file_sha256(uploaded) for uploaded in files]) for name, files in request.FILES.lists()
+        ),
+    }
+    return hashlib.sha256(json.dumps(form, ensure_ascii=False).encode()).hexdigest()
+
+
+def _replay(stored):
+    response = Response(stored['data'], status=stored['status'], headers=stored['headers'])
+    response['Idempotent-Replayed'] = 'true'
+    return response
+
+
+def idempotent(request, perform):
+    """
+    Выполняет perform() не больше одного раза для пары (пользователь, ключ).
+
+    Первый успешный ответ сохраняется в кеше на settings.IDEMPOTENCY_KEY_TTL
+    секунд и отдается на повторы как есть: файлы не сохраняются, запись
+    в БД не повторяется. Пока первый запрос выполняется, повтор получает 409;
+    тот же ключ для другого метода, адреса или тела запроса - 422. Если
+    perform() завершился ошибкой, ключ освобождается, и клиент может
+    повторить запрос.
+    """
+    key = request.headers.get(IDEMPOTENCY_HEADER)
+    if not key:
+        return perform()
+    if len(key) > MAX_KEY_LENGTH:
+        raise ValidationError(f'{IDEMPOTENCY_HEADER} не может быть длиннее {MAX_KEY_LENGTH} символов')
+
+    cache_key = _cache_key(request.user, key)
+    fingerprint = f'{request.method} {request.path} {_body_digest(request)}'
+    in_progress_timeout = getattr(settings, 'IDEMPOTENCY_IN_PROGRESS_TIMEOUT', 2 * 60)
+    # add атомарен: из параллельных повторов выполняться будет только один
+    if not cache.add(cache_key, {'fingerprint': fingerprint, 'status': None}, in_progress_timeout):
+        stored = cache.get(cache_key)
+        # stored is None: запись истекла между add и get, клиенту достаточно повторить
+        if stored is not None and stored['fingerprint'] != fingerprint:
+            raise IdempotencyKeyReusedError()
+        if stored is None or stored['status'] is None:
+            raise IdempotencyKeyInProgressError()
+        return _replay(stored)
+
+    try:
+        response = perform()
+    except Exception:
+        cache.delete(cache_key)
+        raise
+    if response.status_code >= 500:
+        cache.delete(cache_key)
+        return response
+    cache.set(cache_key, {
+        'fingerprint': fingerprint,
+        'status': response.status_code,
+        'data': response.data,
+        'headers': {name: value for name, value in response.items() if name == 'Location'},
+    }, getattr(settings, 'IDEMPOTENCY_KEY_TTL', 24 * 60 * 60))
+    return response
+
+
+class IdempotentCreateMixin:
+    """Поддержка заголовка Idempotency-Key для create"""
+
+    def create(self, request, *args, **kwargs):
+        return idempotent(request, lambda: super(IdempotentCreateMixin, self).create(request, *args, **kwargs))
@@ -0,0 +1,144 @@
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework.relations import ManyRelatedField, PrimaryKeyRelatedField, RelatedField
+from rest_framework.serializers import BaseSerializer, ListSerializer
+
+
+def _resolve_relation(model, path):
+    """
+    Проверяет, что путь path (через __) состоит только из связей модели.
+    Возвращает (модель в конце пути, есть ли в пути связь "ко многим")
+    или None, если путь не является связью (например, свойство модели).
+    """
+    to_many = False
+    for name in path.split('__'):
+        try:
+            field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return None
+        if not field.is_relation or field.related_model is None:
+            return None
+        to_many = to_many or field.many_to_many or field.one_to_many
+        model = field.related_model
+    return model, to_many
+
+
+def get_related_lookups(serializer, model, prefix=''):
+    """
+    Собирает пути для select_related/prefetch_related по вложенным полям сериализатора.
+    Вложенный сериализатор на FK/OneToOne превращается в select_related,
+    many=True и связи "ко многим" - в prefetch_related.
+    """
+    select, prefetch = [], []
+    for field in serializer.fields.values():
+        if field.write_only or field.source == '*':
+            continue
+        path = prefix + field.source.replace('.', '__')
+        resolved = _resolve_relation(model, path)
+        if resolved is None:
+            continue
+        related_model, to_many = resolved
+
+        if isinstance(field, ListSerializer):
+            prefetch.append(path)
+            child_select, child_prefetch = get_related_lookups(field.child, model, path + '__')
+            prefetch.extend(child_select + child_prefetch)
+        elif isinstance(field, BaseSerializer):
+            child_select, child_prefetch = get_related_lookups(field, model, path + '__')
+            if to_many:
+                prefetch.append(path)
+                prefetch.extend(child_select + child_prefetch)
+            else:
+                select.append(path)
+                select.extend(child_select)
+                prefetch.extend(child_prefetch)
+        elif isinstance(field, ManyRelatedField):
+            prefetch.append(path)
+        elif isinstance(field, RelatedField) and not isinstance(field, PrimaryKeyRelatedField):
+            # Для PrimaryKeyRelatedField достаточно значения *_id, JOIN не нужен
+            (prefetch if to_many else select).append(path)
+    return select, prefetch
+
+
+def _resolve_column(model, path):
+    """
+    Путь до колонки для only(): список путей связей по дороге и сам путь.
+    None, если путь не ведет к колонке таблицы (свойство, обратная связь).
+    """
+    relations, prefix = [], ''
+    names = path.split('__')
+    for index, name in enumerate(names):
+        try:
+            field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return None
+        if not field.concrete or field.many_to_many:
+            return None
+        prefix += name
+        if field.is_relation and index < len(names) - 1:
+            relations.append(prefix)
+            model = field.related_model
+            prefix += '__'
+    return relations + [prefix]
+
+
+def get_only_fields(serializer, model, prefix=''):
+    """
+    Колонки, которые читает сериализатор, включая колонки вложенных
+    объектов из select_related. None, если хотя бы одно поле нельзя
+    сопоставить колонке - тогда ограничивать SELECT небезопасно.
+    """
+    columns = []
+    for field in serializer.fields.values():
+        if field.write_only:
+            continue
+        if field.source == '*':
+            return None
+        path = prefix + field.source.replace('.', '__')
+        if isinstance(field, ListSerializer):
+            # Связи "ко многим" загружаются prefetch_related отдельным запросом
+            continue
+        if isinstance(field, BaseSerializer):
+            resolved = _resolve_relation(model, path)
+            if resolved is None:
+                return None
+            if resolved[1]:
+                continue
+            columns.append(path)
+            nested = get_only_fields(field, model, path + '__')
+            if nested is None:
+                return None
+            columns.extend(nested)
+            continue
+        if isinstance(field, ManyRelatedField):
+            continue
+        resolved = _resolve_column(model, path)
+        if resolved is None:
+            return None
+        columns.extend(resolved)
+    return columns
+
+
+def optimize_queryset(queryset, serializer, keep=()):
+    """
+    Подготавливает queryset под сериализатор: добавляет select_related и
+    prefetch_related для всех вложенных связей, чтобы число запросов
+    на страницу не зависело от ее размера.
+
+    Если клиент запросил выборочные поля (?fields= / ?expand=, см.
+    SparseFieldsetSerializer), невыбранные колонки исключаются через only().
+    keep - поля, которые нужны помимо сериализатора (например, ключ курсора).
+    """
+    if isinstance(serializer, type):
+        serializer = serializer()
+    select, prefetch = get_related_lookups(serializer, queryset.model)
+    if select:
+        queryset = queryset.select_related(*select)
+    if prefetch:
+        queryset = queryset.prefetch_related(*prefetch)
+    if getattr(serializer, 'is_sparse', False):
+        columns = get_only_fields(serializer, queryset.model)
+        if columns is not None:
+            extra = [name.lstrip('-') for name in keep]
+            extra = [name for name in extra if _resolve_column(queryset.model, name)]
+            queryset = queryset.only(queryset.model._meta.pk.name, *dict.fromkeys(columns + extra))
+    return queryset
@@ -0,0 +1,167 @@
+import base64
+import json
+from collections import OrderedDict
+from functools import reduce
+
+from django.conf import settings
+from django.db.models import Q
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from ..exceptions import ValidationError
+
+
+class InvalidCursorError(ValidationError):
+    default_detail = 'Некорректный курсор страницы'
+    default_code = 'invalid_cursor'
+
+
+class KeysetPagination(BasePagination):
+    """
+    Курсорная (keyset) пагинация по (created_at, id).
+
+    Курсор непрозрачен для клиента и хранит значения ключа последней
+    (или первой) записи страницы, поэтому выборка следующей страницы
+    сводится к WHERE по индексу без OFFSET. Порядок стабилен при
+    конкурентных вставках. Общее количество (COUNT) считается только
+    по явному запросу клиента (?count=true).
+
+    ViewSet может переопределить порядок атрибутом cursor_ordering,
+    например ('-id',) для моделей без created_at.
+    """
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    count_query_param = 'count'
+    ordering = ('-created_at', '-id')
+    max_page_size = 100
+
+    def get_ordering(self, view):
+        return tuple(getattr(view, 'cursor_ordering', self.ordering))
+
+    def get_page_size(self, request):
+        page_size = settings.REST_FRAMEWORK.get('PAGE_SIZE') or 10
+        try:
+            requested = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return page_size
+        return max(1, min(requested, self.max_page_size))
+
+    def encode_cursor(self, values, reverse):
+        payload = json.dumps({'v': values, 'r': int(reverse)}, default=str, separators=(',', ':'))
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+    def decode_cursor(self, request):
+        raw = request.query_params.get(self.cursor_query_param)
+        if not raw:
+            return None
+        try:
+            padded = raw + '=' * (-len(raw) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+            values = payload['v']
+            reverse = bool(payload.get('r'))
+        except (ValueError, KeyError, TypeError):
+            raise InvalidCursorError()
+        if not isinstance(values, list) or len(values) != len(self.fields):
+            raise InvalidCursorError()
+        try:
+            values = [
+                self.model._meta.get_field(name).to_python(value)
+                for name, value in zip(self.fields, values)
+            ]
+        except Exception:
+            raise InvalidCursorError()
+        return values, reverse
+
+    def keyset_filter(self, values, reverse):
+        """
+        Строит условие (a, b) < (x, y) в развернутом виде:
+        a < x OR (a = x AND b < y)
+        """
+        clauses = []
+        for index, (name, descending) in enumerate(zip(self.fields, self.descending)):
+            lookup = 'lt' if descending != reverse else 'gt'
+            condition = {f'{name}__{lookup}': values[index]}
+            for prev_name, prev_value in zip(self.fields[:index], values[:index]):
+                condition[prev_name] = prev_value
+            clauses.append(Q(**condition))
+        return reduce(lambda left, right: left | right, clauses)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        ordering = self.get_ordering(view)
+        self.fields = [field.lstrip('-') for field in ordering]
+        self.descending = [field.startswith('-') for field in ordering]
+        self.model = queryset.model
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+
+        self.count = None
+        if request.query_params.get(self.count_query_param) in ('1', 'true', 'True'):
+            self.count = queryset.count()
+
+        cursor = self.decode_cursor(request)
+        reverse = cursor[1] if cursor else False
+        if cursor:
+            queryset = queryset.filter(self.keyset_filter(*cursor))
+
+        if reverse:
+            order_by = [name if desc else f'-{name}' for name, desc in zip(self.fields, self.descending)]
+        else:
+            order_by = list(ordering)
+        rows = list(queryset.order_by(*order_by)[:self.page_size + 1])
+
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+            self.has_next = cursor is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = cursor is not None
+
+        self.page = rows
+        return rows
+
+    def get_key(self, instance):
+        return [getattr(instance, name) for name in self.fields]
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        cursor = self.encode_cursor(self.get_key(self.page[-1]), reverse=False)
+        return replace_query_param(self.base_url, self.cursor_query_param, cursor)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        cursor = self.encode_cursor(self.get_key(self.page[0]), reverse=True)
+        return replace_query_param(self.base_url, self.cursor_query_param, cursor)
+
+    def get_paginated_response(self, data):
+        fields = [
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+        ]
+        if self.count is not None:
+            fields.insert(0, ('count', self.count))
+        fields.append(('results', data))
+        return Response(OrderedDict(fields))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'count': {
+                    'type': 'integer',
+                    'description': 'Общее количество (только при ?count=true)',
+                },
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
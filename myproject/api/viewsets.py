@@ -1,22 +1,46 @@
+from django.conf import settings
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY
 from django.db import models
-from rest_framework import viewsets, permissions, status
+from django.utils.crypto import constant_time_compare
+from rest_framework import mixins, viewsets, permissions, status
 from rest_framework.decorators import action
+from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from django.db import IntegrityError
-from ..models import User, Department, Application, Skill, UserSkill, Message, Review, Notification, Job
+from ..models import User, Department, Application, Skill, UserSkill, Message, Review, Notification, Job, ConversationParticipant
 from ..serializers import (
-    UserSerializer, DepartmentSerializer, ApplicationSerializer,
+    UserSerializer, DepartmentSerializer, ApplicationSerializer, ApplicationEventSerializer,
     SkillSerializer, UserSkillSerializer, MessageSerializer, ReviewSerializer,
-    NotificationSerializer, JobSerializer
+    NotificationSerializer, JobSerializer, ConversationSerializer
 )
 from ..exceptions import (
     PermissionError, ConflictError, ApplicationAlreadyExistsError, JobNotFoundError,
-    InvalidApplicationStatusError
+    InvalidApplicationStatusError, ValidationError, AuthenticationError
 )
-from .base import BaseModelViewSet
-from drf_yasg.utils import swagger_auto_schema
+from .base import BaseModelViewSet, StreamingExportMixin, SPARSE_FIELDSET_PARAMETERS
+from .pagination import KeysetPagination
+from .idempotency import IdempotentCreateMixin, IDEMPOTENCY_KEY_PARAMETER
+from .filters import JobFilterSet
+from .optimization import optimize_queryset
+from ..utils.search import search_jobs
+from ..utils.facets import JobFacets
+from ..utils.cache import get_or_set_jobs_cache
+from ..utils.recommendations import recommend_jobs
+from ..utils.job_stats import with_job_stats, job_stats_to_dict
+from ..utils.application_status import bulk_update_status, parse_application_ids
+from ..utils.resumes import release_resume, resume_upload, use_hashing_upload_handler
+from ..utils.application_events import record_created
+from ..utils.conversations import mark_conversation_read
+from ..utils.counters import get_counters, get_cached_counters
+from ..utils.notifications import (
+    MAX_BULK_NOTIFICATIONS, parse_notification_selection, mark_notifications_read, delete_notifications
+)
+from ..utils.file_delivery import etag_matches
+from ..utils.streaming import ALL_EXPORT_FORMATS, TABULAR_EXPORT_FORMATS, streaming_export_response
+from ..utils.application_export import applications_export_response
+from drf_yasg.utils import swagger_auto_schema, no_body
 from drf_yasg import openapi
 
 class UserViewSet(BaseModelViewSet):
@@ -118,13 +142,21 @@ class DepartmentViewSet(BaseModelViewSet):
         """Создание нового отдела"""
         return super().create(request, *args, **kwargs)
 
-class ApplicationViewSet(BaseModelViewSet):
+class ApplicationViewSet(IdempotentCreateMixin, StreamingExportMixin, BaseModelViewSet):
     """
     API для работы с заявками на вакансии.
     """
     queryset = Application.objects.all()
     serializer_class = ApplicationSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetPagination
+    export_formats = ALL_EXPORT_FORMATS
+
+    def initialize_request(self, request, *args, **kwargs):
+        # Хеш резюме считается при приеме файла: обработчик ставится
+        # до разбора тела запроса и проверки CSRF
+        use_hashing_upload_handler(request)
+        return super().initialize_request(request, *args, **kwargs)
 
     def get_queryset(self):
         if getattr(self, 'swagger_fake_view', False):
@@ -136,6 +168,9 @@ class ApplicationViewSet(BaseModelViewSet):
     @swagger_auto_schema(
         operation_description="Получить список заявок текущего пользователя. Для работодателей - заявки на их вакансии, для студентов - их собственные заявки.",
         operation_summary="Список заявок",
+        manual_parameters=[
+            openapi.Parameter('export', openapi.IN_QUERY, description="Потоковая выгрузка всех заявок: ndjson, json, csv или xlsx", type=openapi.TYPE_STRING),
+        ] + SPARSE_FIELDSET_PARAMETERS,
         responses={
             200: ApplicationSerializer(many=True)
         }
@@ -143,6 +178,11 @@ class ApplicationViewSet(BaseModelViewSet):
     def list(self, request, *args, **kwargs):
         """Получение списка заявок"""
         return super().list(request, *args, **kwargs)
+
+    def export_response(self, queryset, export_format):
+        if export_format in TABULAR_EXPORT_FORMATS:
+            return applications_export_response(self.request, queryset, export_format)
+        return super().export_response(queryset, export_format)
         
     @swagger_auto_schema(
         operation_description="Получить детали заявки",
@@ -159,6 +199,7 @@ class ApplicationViewSet(BaseModelViewSet):
     @swagger_auto_schema(
         operation_description="Создать новую заявку на вакансию (доступно только для студентов)",
         operation_summary="Создать заявку",
+        manual_parameters=[IDEMPOTENCY_KEY_PARAMETER],
         request_body=openapi.Schema(
             type=openapi.TYPE_OBJECT,
             required=['job', 'cover_letter', 'resume'],
@@ -194,11 +235,26 @@ class ApplicationViewSet(BaseModelViewSet):
             if self.request.user == serializer.validated_data['job'].employer:
                 raise PermissionError('Работодатель не может подавать заявку на свою вакансию')
             
-            serializer.save(applicant=self.request.user)
+            # Одинаковые файлы резюме хранятся один раз
+            with resume_upload(serializer.validated_data['resume']) as resume:
+                application = serializer.save(applicant=self.request.user, **resume)
+                record_created(application, self.request.user)
             
         except IntegrityError:
             raise ApplicationAlreadyExistsError()
 
+    def perform_update(self, serializer):
+        uploaded = serializer.validated_data.get('resume')
+        if uploaded is None:
+            serializer.save()
+            return
+        # Новое резюме - через общий blob, ссылка на прежний освобождается
+        previous_blob_id = serializer.instance.resume_blob_id
+        with resume_upload(uploaded) as resume:
+            serializer.save(**resume)
+            if previous_blob_id:
+                release_resume(previous_blob_id)
+
     @swagger_auto_schema(
         operation_description="Обновить статус заявки (доступно только работодателю вакансии)",
         operation_summary="Обновить статус заявки",
@@ -231,12 +287,62 @@ class ApplicationViewSet(BaseModelViewSet):
         
         if request.user.role != 'employer' or application.job.employer != request.user:
             raise PermissionError(detail='У вас нет прав для изменения статуса этой заявки')
-        
-        application.status = new_status
-        application.save()
-        
+
+        bulk_update_status(request.user, [application.id], new_status)
         return Response({'status': 'success'})
 
+    @swagger_auto_schema(
+        operation_description="Хронология заявки: подача и все смены статуса в порядке времени. "
+                              "Доступна соискателю и работодателю вакансии",
+        operation_summary="История статусов заявки",
+        responses={
+            200: ApplicationEventSerializer(many=True),
+            404: "Заявка не найдена"
+        }
+    )
+    @action(detail=True, methods=['get'])
+    def timeline(self, request, pk=None):
+        """Журнал статусов заявки"""
+        application = self.get_object()
+        events = application.events.order_by('created_at', 'id')
+        serializer = ApplicationEventSerializer(events, many=True, context=self.get_serializer_context())
+        return Response(serializer.data)
+
+    @swagger_auto_schema(
+        operation_description="Изменить статус нескольких заявок одним запросом (доступно только работодателю вакансий). "
+                              "Все заявки должны относиться к вакансиям текущего работодателя, иначе ни одна не изменится",
+        operation_summary="Массовое изменение статуса заявок",
+        request_body=openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            required=['application_ids', 'status'],
+            properties={
+                'application_ids': openapi.Schema(
+                    type=openapi.TYPE_ARRAY, items=openapi.Schema(type=openapi.TYPE_INTEGER),
+                    description='ID заявок (не больше 500)'
+                ),
+                'status': openapi.Schema(
+                    type=openapi.TYPE_STRING,
+                    enum=['pending', 'accepted', 'rejected', 'withdrawn'],
+                    description='Новый статус заявок'
+                )
+            }
+        ),
+        responses={
+            200: "{'status': 'success', 'updated': [id, ...]}",
+            400: "Неверный статус или список заявок",
+            403: "У вас нет прав для изменения статуса части заявок"
+        }
+    )
+    @action(detail=False, methods=['post'], url_path='bulk-status')
+    def bulk_status(self, request):
+        """Массовое обновление статуса заявок"""
+        if request.user.role != 'employer':
+            raise PermissionError(detail='Только работодатели могут изменять статус заявок')
+
+        application_ids = parse_application_ids(request.data.get('application_ids'))
+        changed = bulk_update_status(request.user, application_ids, request.data.get('status'))
+        return Response({'status': 'success', 'updated': [application.id for application in changed]})
+
 class SkillViewSet(BaseModelViewSet):
     """
     API для работы с навыками.
@@ -330,13 +436,14 @@ class UserSkillViewSet(BaseModelViewSet):
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
-class MessageViewSet(BaseModelViewSet):
+class MessageViewSet(IdempotentCreateMixin, BaseModelViewSet):
     """
     API для работы с сообщениями.
     """
     queryset = Message.objects.all()
     serializer_class = MessageSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetPagination
 
     def get_queryset(self):
         if getattr(self, 'swagger_fake_view', False):
@@ -357,11 +464,12 @@ class MessageViewSet(BaseModelViewSet):
     @swagger_auto_schema(
         operation_description="Отправить новое сообщение",
         operation_summary="Отправить сообщение",
+        manual_parameters=[IDEMPOTENCY_KEY_PARAMETER],
         request_body=openapi.Schema(
             type=openapi.TYPE_OBJECT,
-            required=['receiver', 'content'],
+            required=['receiver_id', 'content'],
             properties={
-                'receiver': openapi.Schema(type=openapi.TYPE_INTEGER, description='ID получателя'),
+                'receiver_id': openapi.Schema(type=openapi.TYPE_INTEGER, description='ID получателя'),
                 'content': openapi.Schema(type=openapi.TYPE_STRING, description='Содержание сообщения'),
                 'application': openapi.Schema(type=openapi.TYPE_INTEGER, description='ID заявки (опционально)')
             }
@@ -379,7 +487,60 @@ class MessageViewSet(BaseModelViewSet):
     def perform_create(self, serializer):
         serializer.save(sender=self.request.user)
 
-class ReviewViewSet(BaseModelViewSet):
+class ConversationViewSet(mixins.ListModelMixin, mixins.RetrieveModelMixin, viewsets.GenericViewSet):
+    """
+    API списка чатов (входящих) текущего пользователя.
+    """
+    serializer_class = ConversationSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetPagination
+    cursor_ordering = ('-last_message_at', '-id')
+
+    def get_queryset(self):
+        if getattr(self, 'swagger_fake_view', False):
+            return ConversationParticipant.objects.none()
+        queryset = ConversationParticipant.objects.filter(user=self.request.user)
+        return optimize_queryset(queryset, self.get_serializer(), keep=self.cursor_ordering)
+
+    @swagger_auto_schema(
+        operation_description="Чаты текущего пользователя, последние активные первыми, "
+                              "с последним сообщением и количеством непрочитанных. "
+                              "Читается одним запросом по индексу, пагинация курсорная",
+        operation_summary="Список чатов",
+        manual_parameters=SPARSE_FIELDSET_PARAMETERS
+    )
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @swagger_auto_schema(
+        operation_description="Получить чат текущего пользователя",
+        operation_summary="Детали чата",
+        manual_parameters=SPARSE_FIELDSET_PARAMETERS,
+        responses={404: "Чат не найден"}
+    )
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
+    @swagger_auto_schema(
+        operation_description="Пометить прочитанными все сообщения собеседника в чате",
+        operation_summary="Прочитать чат",
+        request_body=no_body,
+        responses={
+            200: openapi.Schema(
+                type=openapi.TYPE_OBJECT,
+                properties={'read': openapi.Schema(type=openapi.TYPE_INTEGER, description='Сколько сообщений прочитано')}
+            ),
+            404: "Чат не найден"
+        }
+    )
+    @action(detail=True, methods=['post'])
+    def read(self, request, pk=None):
+        """Прочтение чата"""
+        participant = self.get_object()
+        read = mark_conversation_read(request.user, participant.conversation.application_id, participant.partner_id)
+        return Response({'read': read})
+
+class ReviewViewSet(IdempotentCreateMixin, BaseModelViewSet):
     """
     API для работы с отзывами о вакансиях.
     """
@@ -406,6 +567,7 @@ class ReviewViewSet(BaseModelViewSet):
     @swagger_auto_schema(
         operation_description="Создать новый отзыв о вакансии",
         operation_summary="Создать отзыв",
+        manual_parameters=[IDEMPOTENCY_KEY_PARAMETER],
         request_body=openapi.Schema(
             type=openapi.TYPE_OBJECT,
             required=['job', 'rating', 'comment'],
@@ -429,6 +591,25 @@ class ReviewViewSet(BaseModelViewSet):
     def perform_create(self, serializer):
         serializer.save(reviewer=self.request.user)
 
+# Выбор уведомлений для массовых операций
+NOTIFICATION_SELECTION_BODY = openapi.Schema(
+    type=openapi.TYPE_OBJECT,
+    properties={
+        'ids': openapi.Schema(
+            type=openapi.TYPE_ARRAY, items=openapi.Schema(type=openapi.TYPE_INTEGER),
+            description='ID уведомлений'
+        ),
+        'before': openapi.Schema(
+            type=openapi.TYPE_STRING, format=openapi.FORMAT_DATETIME,
+            description='Все уведомления, созданные не позже этого момента'
+        ),
+    }
+)
+NOTIFICATIONS_UPDATED_RESPONSE = openapi.Schema(
+    type=openapi.TYPE_OBJECT,
+    properties={'updated': openapi.Schema(type=openapi.TYPE_INTEGER, description='Сколько уведомлений изменено')}
+)
+
 class NotificationViewSet(BaseModelViewSet):
     """
     API для работы с уведомлениями.
@@ -436,6 +617,7 @@ class NotificationViewSet(BaseModelViewSet):
     queryset = Notification.objects.all()
     serializer_class = NotificationSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetPagination
 
     def get_queryset(self):
         if getattr(self, 'swagger_fake_view', False):
@@ -463,22 +645,204 @@ class NotificationViewSet(BaseModelViewSet):
     def mark_as_read(self, request, pk=None):
         """Отметка уведомления как прочитанного"""
         notification = self.get_object()
-        notification.is_read = True
-        notification.save()
+        if not notification.is_read:
+            notification.is_read = True
+            notification.save(update_fields=['is_read'])
         return Response({'status': 'notification marked as read'})
 
-class JobViewSet(BaseModelViewSet):
+    @swagger_auto_schema(
+        operation_description="Отметить прочитанными все уведомления текущего пользователя одним запросом",
+        operation_summary="Прочитать все уведомления",
+        request_body=no_body,
+        responses={200: NOTIFICATIONS_UPDATED_RESPONSE}
+    )
+    @action(detail=False, methods=['post'])
+    def mark_all_read(self, request):
+        """Отметка всех уведомлений как прочитанных"""
+        return Response({'updated': mark_notifications_read(request.user)})
+
+    @swagger_auto_schema(
+        operation_description="Отметить прочитанными выбранные уведомления текущего пользователя одним UPDATE: "
+                              f"по списку ids (не больше {MAX_BULK_NOTIFICATIONS}) и/или все, созданные не позже before. "
+                              "Чужие id пропускаются",
+        operation_summary="Прочитать уведомления",
+        request_body=NOTIFICATION_SELECTION_BODY,
+        responses={200: NOTIFICATIONS_UPDATED_RESPONSE, 400: "Ошибка валидации данных"}
+    )
+    @action(detail=False, methods=['post'])
+    def mark_read(self, request):
+        """Отметка выбранных уведомлений как прочитанных"""
+        conditions = parse_notification_selection(request.data)
+        return Response({'updated': mark_notifications_read(request.user, **conditions)})
+
+    @swagger_auto_schema(
+        operation_description="Удалить выбранные уведомления текущего пользователя одним DELETE: "
+                              f"по списку ids (не больше {MAX_BULK_NOTIFICATIONS}) и/или все, созданные не позже before. "
+                              "Чужие id пропускаются",
+        operation_summary="Удалить уведомления",
+        request_body=NOTIFICATION_SELECTION_BODY,
+        responses={
+            200: openapi.Schema(
+                type=openapi.TYPE_OBJECT,
+                properties={'deleted': openapi.Schema(type=openapi.TYPE_INTEGER, description='Сколько уведомлений удалено')}
+            ),
+            400: "Ошибка валидации данных"
+        }
+    )
+    @action(detail=False, methods=['post'], url_path='bulk-delete')
+    def bulk_delete(self, request):
+        """Массовое удаление уведомлений"""
+        conditions = parse_notification_selection(request.data)
+        return Response({'deleted': delete_notifications(request.user, **conditions)})
+
+    def perform_destroy(self, instance):
+        delete_notifications(self.request.user, pk=instance.pk)
+
+class MeViewSet(viewsets.ViewSet):
+    """
+    API данных текущего пользователя.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def perform_authentication(self, request):
+        # Счетчики проверяют сессию сами, чтобы ответ 304 обходился без загрузки пользователя
+        if self.action != 'counters':
+            super().perform_authentication(request)
+
+    def _session_counters(self, request):
+        """
+        Счетчики из кеша по сессии без загрузки пользователя: (id пользователя, версия, запись).
+        Сессия читается из БД или, если кеш общий для воркеров, из кеша (см. SESSION_ENGINE
+        в settings.py). Запись используется, только если хеш сессии совпадает с сохраненным
+        вместе с ней, то есть пароль не менялся. Иначе возвращается None.
+        """
+        if 'HTTP_AUTHORIZATION' in request.META:
+            return None
+        session = request.session
+        user_id, session_hash = session.get(SESSION_KEY), session.get(HASH_SESSION_KEY)
+        if not user_id or not session_hash or session.get(BACKEND_SESSION_KEY) not in settings.AUTHENTICATION_BACKENDS:
+            return None
+        user_id = User._meta.pk.to_python(user_id)
+        version, record = get_cached_counters(user_id)
+        if record is None or not constant_time_compare(record['auth_hash'], session_hash):
+            return None
+        return user_id, version, record
+
+    @swagger_auto_schema(
+        operation_description="Счетчики для бейджей: непрочитанные уведомления и сообщения, заявки на рассмотрении "
+                              "(для работодателя - заявки на его вакансии). Ответ содержит ETag; клиент, "
+                              "опрашивающий счетчики, передает его в If-None-Match и, пока ничего не изменилось, "
+                              "получает 304 без загрузки пользователя и пересчета счетчиков",
+        operation_summary="Мои счетчики",
+        manual_parameters=[
+            openapi.Parameter('If-None-Match', openapi.IN_HEADER, description="ETag из предыдущего ответа", type=openapi.TYPE_STRING),
+        ],
+        responses={
+            200: openapi.Schema(
+                type=openapi.TYPE_OBJECT,
+                properties={
+                    'unread_notifications': openapi.Schema(type=openapi.TYPE_INTEGER),
+                    'unread_messages': openapi.Schema(type=openapi.TYPE_INTEGER),
+                    'pending_applications': openapi.Schema(type=openapi.TYPE_INTEGER),
+                    'version': openapi.Schema(type=openapi.TYPE_INTEGER),
+                }
+            ),
+            304: "Счетчики не изменились",
+            401: "Требуется аутентификация"
+        }
+    )
+    @action(detail=False, methods=['get'], permission_classes=[permissions.AllowAny])
+    def counters(self, request):
+        """Счетчики текущего пользователя с ETag по версии"""
+        cached = self._session_counters(request)
+        if cached is None:
+            if not request.user or not request.user.is_authenticated:
+                raise AuthenticationError('Требуется аутентификация')
+            version, record = get_counters(request.user)
+            cached = request.user.pk, version, record
+        user_id, version, record = cached
+
+        etag = f'"counters-{user_id}-{version}"'
+        if etag_matches(request, etag):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = Response({**record['counters'], 'version': version})
+        response['ETag'] = etag
+        response['Cache-Control'] = 'private, no-cache'
+        return response
+
+class JobViewSet(StreamingExportMixin, BaseModelViewSet):
     """
     API для работы с вакансиями.
     """
     queryset = Job.objects.all()
     serializer_class = JobSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    pagination_class = KeysetPagination
+
+    @property
+    def filterset(self):
+        return JobFilterSet(self.request.query_params)
+
+    @property
+    def cursor_ordering(self):
+        return self.filterset.get_ordering()
+
+    def get_unfaceted_queryset(self):
+        """Вакансии с учетом поиска и фильтров, но без фасетных фильтров (тип, отдел)"""
+        filterset = self.filterset
+        queryset = filterset.filter_queryset(Job.objects.all(), exclude=JobFacets.facet_params)
+        queryset = queryset.order_by(*filterset.get_ordering())
+        query = self.request.query_params.get('q', '').strip()
+        if query:
+            queryset = search_jobs(queryset, query)
+            if self.request.query_params.get(filterset.ordering_param):
+                # Явная сортировка важнее релевантности
+                queryset = queryset.order_by(*filterset.get_ordering())
+        return queryset
 
     def get_queryset(self):
         if getattr(self, 'swagger_fake_view', False):
             return Job.objects.none()
-        return Job.objects.all()
+        return self.filterset.filter_queryset(self.get_unfaceted_queryset(), only=JobFacets.facet_params)
+
+    @property
+    def paginator(self):
+        # Результаты поиска упорядочены по релевантности, а не по ключу курсора,
+        # поэтому для них используется постраничная пагинация
+        if self.request is not None and self.request.query_params.get('q', '').strip():
+            self.pagination_class = PageNumberPagination
+        return super().paginator
+
+    @swagger_auto_schema(
+        operation_description="Получить список вакансий. Параметр q включает полнотекстовый поиск "
+                              "по названию и описанию с сортировкой по релевантности (BM25). "
+                              "Блок facets содержит количество вакансий по типам, отделам и диапазонам зарплат. "
+                              "Фильтры выполняются в SQL, сортировка доступна только по индексированным полям",
+        operation_summary="Список вакансий",
+        manual_parameters=[
+            openapi.Parameter('q', openapi.IN_QUERY, description="Поисковый запрос", type=openapi.TYPE_STRING),
+            openapi.Parameter('export', openapi.IN_QUERY, description="Потоковая выгрузка всех вакансий: ndjson или json", type=openapi.TYPE_STRING),
+        ] + JobFilterSet.openapi_parameters() + SPARSE_FIELDSET_PARAMETERS,
+        responses={
+            400: "Некорректное значение фильтра или недопустимая сортировка"
+        }
+    )
+    def list(self, request, *args, **kwargs):
+        """Получение списка вакансий с фасетными счетчиками"""
+        if request.query_params.get(self.export_query_param):
+            return super().list(request, *args, **kwargs)
+
+        def build_data():
+            data = super(JobViewSet, self).list(request, *args, **kwargs).data
+            selected_facets = JobFacets.selected_from(request.query_params)
+            data['facets'] = JobFacets(self.get_unfaceted_queryset(), selected_facets).get()
+            return data
+
+        # Ссылки пагинации абсолютные, поэтому хост входит в ключ кеша
+        params = request.query_params.copy()
+        params['_base'] = request.build_absolute_uri('/')
+        return Response(get_or_set_jobs_cache('api_jobs', params, build_data))
 
     @swagger_auto_schema(
         operation_description="Создать новую вакансию (доступно только для работодателей)",
@@ -555,6 +919,9 @@ class JobViewSet(BaseModelViewSet):
     @swagger_auto_schema(
         operation_description="Получить список заявок на вакансию (доступно только работодателю)",
         operation_summary="Заявки на вакансию",
+        manual_parameters=[
+            openapi.Parameter('export', openapi.IN_QUERY, description="Потоковая выгрузка заявок: ndjson, json, csv или xlsx", type=openapi.TYPE_STRING),
+        ] + SPARSE_FIELDSET_PARAMETERS,
         responses={
             200: ApplicationSerializer(many=True),
             403: "Только работодатель может просматривать заявки на свою вакансию",
@@ -567,7 +934,73 @@ class JobViewSet(BaseModelViewSet):
         job = self.get_object()
         if request.user != job.employer:
             raise PermissionError('Только работодатель может просматривать заявки на свою вакансию')
-        
-        applications = job.applications.all()
-        serializer = ApplicationSerializer(applications, many=True)
-        return Response(serializer.data) 
\ No newline at end of file
+
+        export_format = request.query_params.get(self.export_query_param)
+        if export_format in TABULAR_EXPORT_FORMATS:
+            return applications_export_response(
+                request, job.applications.all(), export_format, f'job_{job.id}_applications'
+            )
+
+        context = self.get_serializer_context()
+        applications = optimize_queryset(job.applications.all(), ApplicationSerializer(context=context))
+        if export_format:
+            return streaming_export_response(
+                request, applications, ApplicationSerializer(context=context).to_representation, export_format,
+                ALL_EXPORT_FORMATS
+            )
+        serializer = ApplicationSerializer(applications, many=True, context=context)
+        return Response(serializer.data)
+
+    @swagger_auto_schema(
+        operation_description="Получить вакансии, наиболее подходящие пользователю по навыкам. "
+                              "Оценка match_score от 0 до 1 учитывает нехватку уровня по каждому навыку, "
+                              "нехватка обязательных навыков штрафуется сильнее",
+        operation_summary="Рекомендованные вакансии",
+        manual_parameters=[
+            openapi.Parameter('limit', openapi.IN_QUERY, description="Количество вакансий (по умолчанию 10, максимум 50)", type=openapi.TYPE_INTEGER),
+        ],
+        responses={
+            200: JobSerializer(many=True),
+            401: "Требуется аутентификация"
+        }
+    )
+    @action(detail=False, methods=['get'], permission_classes=[permissions.IsAuthenticated])
+    def recommended(self, request):
+        """Рекомендации вакансий по навыкам пользователя"""
+        try:
+            limit = max(1, min(int(request.query_params.get('limit', 10)), 50))
+        except ValueError:
+            raise ValidationError('Параметр limit должен быть числом')
+
+        ranked = recommend_jobs(request.user.id, limit)
+        jobs = optimize_queryset(
+            Job.objects.filter(is_active=True), JobSerializer
+        ).in_bulk([job_id for job_id, _ in ranked])
+
+        results = []
+        for job_id, score in ranked:
+            if job_id in jobs:
+                data = JobSerializer(jobs[job_id], context=self.get_serializer_context()).data
+                data['match_score'] = round(score, 3)
+                results.append(data)
+        return Response(results)
+
+    @swagger_auto_schema(
+        operation_description="Статистика по вакансиям текущего работодателя: количество заявок по статусам, "
+                              "добавлений в избранное и средний рейтинг отзывов. Вся статистика страницы "
+                              "считается одним запросом. Поддерживает те же фильтры, что и список вакансий",
+        operation_summary="Статистика моих вакансий",
+        manual_parameters=JobFilterSet.openapi_parameters(),
+        responses={
+            403: "Только работодатели могут просматривать статистику вакансий"
+        }
+    )
+    @action(detail=False, methods=['get'], url_path='mine/stats', permission_classes=[permissions.IsAuthenticated])
+    def mine_stats(self, request):
+        """Статистика вакансий работодателя"""
+        if request.user.role != 'employer':
+            raise PermissionError('Только работодатели могут просматривать статистику вакансий')
+
+        queryset = with_job_stats(self.filterset.filter_queryset(Job.objects.filter(employer=request.user)))
+        page = self.paginate_queryset(queryset)
+        return self.get_paginated_response([job_stats_to_dict(job) for job in page])
@@ -2,4 +2,7 @@ from django.apps import AppConfig
 
 class MyprojectConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'myproject' 
\ No newline at end of file
+    name = 'myproject'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -65,4 +65,14 @@ class InvalidFileTypeError(ValidationError):
 
 class FileTooLargeError(ValidationError):
     default_detail = 'Файл слишком большой'
-    default_code = 'file_too_large' 
\ No newline at end of file
+    default_code = 'file_too_large'
+
+
+class IdempotencyKeyInProgressError(ConflictError):
+    default_detail = 'Запрос с этим ключом идемпотентности еще выполняется'
+    default_code = 'idempotency_key_in_progress'
+
+class IdempotencyKeyReusedError(APIException):
+    status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+    default_detail = 'Ключ идемпотентности уже использован для другого запроса'
+    default_code = 'idempotency_key_reused'
@@ -0,0 +1,57 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+from myproject.models import User
+from myproject.utils.benchmark import login_cookie, query_latency, run_asgi, run_wsgi
+
+class Command(BaseCommand):
+    help = ('Сравнивает пропускную способность ASGI (асинхронные представления в одном цикле событий) '
+            'и WSGI с пулом потоков при большом числе одновременных запросов')
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='*', default=['/'], help='Пути запросов, по кругу')
+        parser.add_argument('--requests', type=int, default=500, help='Всего запросов в каждом режиме')
+        parser.add_argument('--concurrency', type=int, default=100, help='Одновременных запросов')
+        parser.add_argument('--threads', type=int, default=4, help='Потоков WSGI-воркера')
+        parser.add_argument('--latency', type=float, default=0, help='Задержка каждого SQL-запроса, мс')
+        parser.add_argument('--user', help='Выполнять запросы от имени пользователя (нужно для резюме и --streams)')
+        parser.add_argument('--streams', type=int, default=0,
+                            help='Сколько клиентов держат открытым поток событий (SSE) во время замера')
+        parser.add_argument('--stream-age', type=float, default=5,
+                            help='EVENT_STREAM_MAX_AGE на время замера, с: после него клиент переподключается')
+
+    def handle(self, *args, **options):
+        if options['streams'] and not options['user']:
+            raise CommandError('Поток событий требует входа: укажите --user')
+        cookie, logout = None, None
+        if options['user']:
+            try:
+                user = User.objects.get(username=options['user'])
+            except User.DoesNotExist:
+                raise CommandError(f'Пользователь {options["user"]} не найден')
+            cookie, logout = login_cookie(user)
+
+        try:
+            with query_latency(options['latency'] / 1000), \
+                    override_settings(EVENT_STREAM_MAX_AGE=options['stream_age']):
+                # Прогрев: кеш вакансий, импорт шаблонов и первые соединения
+                run_wsgi(options['paths'], len(options['paths']), 1, 1, cookie)
+                streams = options['streams']
+                results = [
+                    run_wsgi(
+                        options['paths'], options['requests'], options['threads'], options['concurrency'],
+                        cookie, streams
+                    ),
+                    run_asgi(options['paths'], options['requests'], options['concurrency'], cookie, streams),
+                ]
+        finally:
+            if logout:
+                logout()
+
+        self.stdout.write(f'{"режим":<10} {"запросов":>9} {"параллельно":>12} {"запр/с":>9} {"p50, мс":>9} {"p95, мс":>9}  статусы')
+        for result in results:
+            self.stdout.write(
+                f'{result["mode"]:<10} {result["requests"]:>9} {result["concurrency"]:>12} {result["rps"]:>9.1f} '
+                f'{result["p50_ms"]:>9.1f} {result["p95_ms"]:>9.1f}  {result["statuses"]}'
+            )
+        if any(status >= 400 for result in results for status in result['statuses'] if status):
+            self.stdout.write(self.style.WARNING('Есть ответы с ошибками: проверьте пути и --user'))
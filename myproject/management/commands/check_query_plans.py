@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from myproject.utils.query_plans import check_query_plans
+
+class Command(BaseCommand):
+    help = 'Проверяет через EXPLAIN QUERY PLAN, что горячие запросы используют индексы'
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            self.stdout.write(self.style.WARNING('Проверка планов поддерживается только для SQLite'))
+            return
+
+        failed = []
+        for name, details, scans in check_query_plans():
+            style = self.style.ERROR if scans else self.style.SUCCESS
+            self.stdout.write(style(name))
+            for detail in details:
+                self.stdout.write(f'    {detail}')
+            if scans:
+                failed.append(name)
+
+        if failed:
+            raise CommandError(f'Полное сканирование таблицы в запросах: {", ".join(failed)}')
+        self.stdout.write(self.style.SUCCESS('Все горячие запросы используют индексы'))
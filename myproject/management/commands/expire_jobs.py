@@ -0,0 +1,37 @@
+import time
+
+from django.core.management.base import BaseCommand
+from myproject.utils.deadlines import (
+    expire_jobs, send_deadline_reminders, DEFAULT_BATCH_SIZE, DEFAULT_REMIND_HOURS
+)
+
+class Command(BaseCommand):
+    help = (
+        'Снимает с публикации вакансии с истекшим дедлайном и рассылает напоминания '
+        'о скором дедлайне. Идемпотентна, подходит для запуска из cron каждую минуту'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                            help='Размер пачки для UPDATE и bulk_create')
+        parser.add_argument('--remind-hours', type=int, default=DEFAULT_REMIND_HOURS,
+                            help='За сколько часов до дедлайна отправлять напоминание')
+        parser.add_argument('--loop', action='store_true',
+                            help='Работать постоянно, повторяя проход с интервалом --interval')
+        parser.add_argument('--interval', type=int, default=60,
+                            help='Пауза между проходами в режиме --loop (секунды)')
+
+    def sweep(self, options):
+        expired = expire_jobs(batch_size=options['batch_size'])
+        reminded = send_deadline_reminders(hours=options['remind_hours'], batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Снято с публикации вакансий: {expired}, отправлено напоминаний: {reminded}'
+        ))
+
+    def handle(self, *args, **options):
+        if not options['loop']:
+            self.sweep(options)
+            return
+        while True:
+            self.sweep(options)
+            time.sleep(options['interval'])
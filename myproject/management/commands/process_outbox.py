@@ -0,0 +1,49 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from myproject.utils.outbox import drain_outbox, outbox_backlog, DEFAULT_BATCH_SIZE
+
+class Command(BaseCommand):
+    help = (
+        'Обрабатывает события outbox: создает уведомления и системные сообщения пачками. '
+        'Упавшие события повторяются с задержкой. Для продакшена запускается с --loop'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                            help='Количество событий, забираемых за один проход')
+        parser.add_argument('--loop', action='store_true',
+                            help='Работать постоянно, опрашивая outbox с интервалом --interval')
+        parser.add_argument('--interval', type=float, default=1.0,
+                            help='Пауза между опросами в режиме --loop, если событий нет (секунды)')
+        parser.add_argument('--check', action='store_true',
+                            help='Ничего не обрабатывать, а проверить отставание очереди: код выхода 1, '
+                                 'если есть события старше --max-age минут или исчерпавшие попытки')
+        parser.add_argument('--max-age', type=float, default=None,
+                            help='Порог для --check в минутах (по умолчанию OUTBOX_BACKLOG_ALERT_MINUTES)')
+
+    def drain(self, options):
+        processed, failed = drain_outbox(batch_size=options['batch_size'])
+        if processed or failed or not options['loop']:
+            self.stdout.write(self.style.SUCCESS(
+                f'Обработано событий: {processed}, отложено на повтор: {failed}'
+            ))
+
+    def check(self, options):
+        stale, dead = outbox_backlog(minutes=options['max_age'])
+        if stale or dead:
+            raise CommandError(
+                f'Outbox отстает: ждут обработки дольше порога: {stale}, исчерпали попытки: {dead}'
+            )
+        self.stdout.write(self.style.SUCCESS('Outbox в порядке'))
+
+    def handle(self, *args, **options):
+        if options['check']:
+            self.check(options)
+            return
+        if not options['loop']:
+            self.drain(options)
+            return
+        while True:
+            self.drain(options)
+            time.sleep(options['interval'])
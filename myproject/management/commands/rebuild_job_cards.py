@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from myproject.utils.cache import bump_jobs_version
+from myproject.utils.job_cards import rebuild_job_cards
+
+class Command(BaseCommand):
+    help = (
+        'Пересобирает карточки вакансий (JobCard), по которым строятся списки. '
+        'В обычной работе карточки обновляются сигналами; команда нужна для восстановления согласованности'
+    )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            cards = rebuild_job_cards()
+        bump_jobs_version()
+        self.stdout.write(self.style.SUCCESS(f'Карточек вакансий пересобрано: {cards}'))
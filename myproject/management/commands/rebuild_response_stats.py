@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from myproject.utils.application_events import rebuild_response_stats
+
+class Command(BaseCommand):
+    help = (
+        'Пересчитывает медианы времени первого ответа по вакансиям из журнала статусов заявок. '
+        'В обычной работе статистика обновляется при каждом ответе; команда нужна для восстановления'
+    )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            jobs = rebuild_response_stats()
+        self.stdout.write(self.style.SUCCESS(f'Статистика пересчитана для вакансий: {jobs}'))
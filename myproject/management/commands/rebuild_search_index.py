@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+from myproject.models import Job
+from myproject.utils.search import get_search_backend
+
+class Command(BaseCommand):
+    help = 'Перестраивает поисковый индекс вакансий'
+
+    def handle(self, *args, **options):
+        get_search_backend().rebuild()
+        self.stdout.write(self.style.SUCCESS(
+            f'Поисковый индекс перестроен, вакансий в индексе: {Job.objects.count()}'
+        ))
@@ -0,0 +1,31 @@
+from django.db import migrations
+
+
+def create_job_fts(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS myproject_job_fts "
+        "USING fts5(title, description, tokenize='unicode61 remove_diacritics 2')"
+    )
+    schema_editor.execute(
+        "INSERT INTO myproject_job_fts (rowid, title, description) "
+        "SELECT id, title, description FROM myproject_job"
+    )
+
+
+def drop_job_fts(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute("DROP TABLE IF EXISTS myproject_job_fts")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myproject', '0007_remove_job_additional_requirements'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_job_fts, drop_job_fts),
+    ]
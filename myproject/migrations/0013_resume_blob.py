@@ -0,0 +1,76 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:04
+
+import hashlib
+
+import django.db.models.deletion
+from django.core.files.storage import default_storage
+from django.db import migrations, models, transaction
+
+
+def link_existing_resumes(apps, schema_editor):
+    """
+    Для каждого существующего файла резюме заводится ResumeBlob с его хешем.
+    Одинаковые файлы получают общий blob: заявки переводятся на путь первого
+    из них, а остальные копии удаляются после фиксации миграции.
+    Отсутствующие в хранилище файлы пропускаются.
+    """
+    Application = apps.get_model('myproject', 'Application')
+    ResumeBlob = apps.get_model('myproject', 'ResumeBlob')
+    duplicates = set()
+    for application in Application.objects.exclude(resume='').iterator():
+        name = application.resume.name
+        if not default_storage.exists(name):
+            continue
+        hasher = hashlib.sha256()
+        with default_storage.open(name, 'rb') as resume:
+            for chunk in iter(lambda: resume.read(64 * 1024), b''):
+                hasher.update(chunk)
+        blob, _ = ResumeBlob.objects.get_or_create(
+            sha256=hasher.hexdigest(),
+            defaults={'file': name, 'size': default_storage.size(name)}
+        )
+        blob.ref_count += 1
+        blob.save(update_fields=['ref_count'])
+        Application.objects.filter(pk=application.pk).update(resume_blob=blob, resume=blob.file.name)
+        if name != blob.file.name:
+            duplicates.add(name)
+
+    def delete_duplicates():
+        for name in duplicates:
+            default_storage.delete(name)
+
+    # Если миграция откатится, заявки останутся со старыми путями,
+    # поэтому файлы удаляются только после фиксации
+    transaction.on_commit(delete_duplicates, using=schema_editor.connection.alias)
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myproject', '0012_outbox_event'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumeBlob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sha256', models.CharField(max_length=64, unique=True)),
+                ('file', models.FileField(max_length=255, upload_to='resumes/')),
+                ('size', models.PositiveBigIntegerField()),
+                ('content_type', models.CharField(blank=True, default='', max_length=100)),
+                ('ref_count', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AlterField(
+            model_name='application',
+            name='resume',
+            field=models.FileField(max_length=255, upload_to='resumes/'),
+        ),
+        migrations.AddField(
+            model_name='application',
+            name='resume_blob',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='applications', to='myproject.resumeblob'),
+        ),
+        migrations.RunPython(link_existing_resumes, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,123 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:29
+
+import math
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+# Копия констант и гистограммы из utils/application_events.py на момент
+# миграции: миграция не должна зависеть от того, как код изменится потом
+RESPONSE_STATUSES = ('accepted', 'rejected')
+GAMMA = (1 + 0.01) / (1 - 0.01)
+LOG_GAMMA = math.log(GAMMA)
+BATCH_SIZE = 500
+
+
+def sketch_value(bucket):
+    return 2 * GAMMA ** bucket / (GAMMA + 1)
+
+
+def sketch_add(sketch, seconds):
+    key = str(math.ceil(math.log(max(seconds, 1)) / LOG_GAMMA))
+    sketch[key] = sketch.get(key, 0) + 1
+
+
+def sketch_quantile(sketch, quantile=0.5):
+    total = sum(sketch.values())
+    if not total:
+        return None
+    rank = quantile * (total - 1)
+    lower_rank, fraction = int(rank), rank - int(rank)
+    lower = upper = None
+    seen = 0
+    for bucket in sorted(sketch, key=int):
+        seen += sketch[bucket]
+        if lower is None and seen > lower_rank:
+            lower = sketch_value(int(bucket))
+        if seen > lower_rank + 1 or (seen > lower_rank and not fraction):
+            upper = sketch_value(int(bucket))
+            break
+    return lower + (upper - lower) * fraction
+
+
+def backfill_events(apps, schema_editor):
+    """
+    Для существующих заявок журнал восстанавливается приближенно:
+    подача в created_at и, если заявка уже не на рассмотрении,
+    переход в текущий статус в updated_at.
+    """
+    Application = apps.get_model('myproject', 'Application')
+    ApplicationEvent = apps.get_model('myproject', 'ApplicationEvent')
+    JobResponseStats = apps.get_model('myproject', 'JobResponseStats')
+
+    events, sketches = [], {}
+    for application in Application.objects.iterator(chunk_size=BATCH_SIZE):
+        # Журнал пишется пачками, чтобы не держать его целиком в памяти
+        if len(events) >= BATCH_SIZE:
+            ApplicationEvent.objects.bulk_create(events)
+            events = []
+        common = {'application_id': application.pk, 'job_id': application.job_id, 'applicant_id': application.applicant_id}
+        events.append(ApplicationEvent(
+            **common, actor_id=application.applicant_id, from_status='', to_status='pending',
+            created_at=application.created_at
+        ))
+        if application.status == 'pending':
+            continue
+        response_seconds = None
+        if application.status in RESPONSE_STATUSES:
+            response_seconds = max(0, int((application.updated_at - application.created_at).total_seconds()))
+            sketch_add(sketches.setdefault(application.job_id, {}), response_seconds)
+        events.append(ApplicationEvent(
+            **common, from_status='pending', to_status=application.status,
+            is_first_response=response_seconds is not None, response_seconds=response_seconds,
+            created_at=application.updated_at
+        ))
+    ApplicationEvent.objects.bulk_create(events)
+    JobResponseStats.objects.bulk_create([
+        JobResponseStats(
+            job_id=job_id, sketch=sketch, responses=sum(sketch.values()), median_seconds=sketch_quantile(sketch)
+        )
+        for job_id, sketch in sketches.items()
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myproject', '0013_resume_blob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobResponseStats',
+            fields=[
+                ('job', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='response_stats', serialize=False, to='myproject.job')),
+                ('responses', models.PositiveIntegerField(default=0)),
+                ('sketch', models.JSONField(default=dict)),
+                ('median_seconds', models.FloatField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ApplicationEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('from_status', models.CharField(blank=True, choices=[('pending', 'На рассмотрении'), ('accepted', 'Принята'), ('rejected', 'Отклонена'), ('withdrawn', 'Отозвана')], max_length=20)),
+                ('to_status', models.CharField(choices=[('pending', 'На рассмотрении'), ('accepted', 'Принята'), ('rejected', 'Отклонена'), ('withdrawn', 'Отозвана')], max_length=20)),
+                ('is_first_response', models.BooleanField(default=False)),
+                ('response_seconds', models.PositiveIntegerField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('actor', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('applicant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='application_events', to=settings.AUTH_USER_MODEL)),
+                ('application', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='events', to='myproject.application')),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='application_events', to='myproject.job')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['application', 'created_at'], name='application_event_timeline_idx')],
+                'constraints': [models.UniqueConstraint(condition=models.Q(('is_first_response', True)), fields=('application',), name='application_event_first_response_uniq')],
+            },
+        ),
+        migrations.RunPython(backfill_events, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,81 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:38
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Avg, Count
+
+
+def backfill_job_cards(apps, schema_editor):
+    """Карточки для существующих вакансий (то же, что команда rebuild_job_cards)"""
+    Job = apps.get_model('myproject', 'Job')
+    JobCard = apps.get_model('myproject', 'JobCard')
+    JobSkill = apps.get_model('myproject', 'JobSkill')
+    Application = apps.get_model('myproject', 'Application')
+    Favorite = apps.get_model('myproject', 'Favorite')
+    Review = apps.get_model('myproject', 'Review')
+
+    def per_job(model, **aggregate):
+        return {row['job_id']: row for row in model.objects.values('job_id').annotate(**aggregate)}
+
+    applications = per_job(Application, total=Count('id'))
+    favorites = per_job(Favorite, total=Count('id'))
+    reviews = per_job(Review, total=Count('id'), rating=Avg('rating'))
+    skills = {}
+    for job_skill in JobSkill.objects.select_related('skill').order_by('id'):
+        skills.setdefault(job_skill.job_id, []).append(
+            {'name': job_skill.skill.name, 'level': job_skill.level, 'is_required': job_skill.is_required}
+        )
+
+    cards = []
+    for job in Job.objects.select_related('department', 'employer').iterator():
+        employer = job.employer
+        cards.append(JobCard(
+            job_id=job.pk, title=job.title, description=job.description, job_type=job.job_type,
+            salary=job.salary, created_at=job.created_at, deadline=job.deadline, is_active=job.is_active,
+            department_id=job.department_id, department_name=job.department.name,
+            employer_id=job.employer_id,
+            employer_name=f'{employer.first_name} {employer.last_name}'.strip() or employer.username,
+            skills=skills.get(job.pk, []),
+            applications_count=applications.get(job.pk, {}).get('total', 0),
+            favorites_count=favorites.get(job.pk, {}).get('total', 0),
+            reviews_count=reviews.get(job.pk, {}).get('total', 0),
+            avg_rating=reviews.get(job.pk, {}).get('rating'),
+        ))
+    JobCard.objects.bulk_create(cards, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myproject', '0014_application_events'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobCard',
+            fields=[
+                ('job', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='card', serialize=False, to='myproject.job')),
+                ('title', models.CharField(max_length=200)),
+                ('description', models.TextField()),
+                ('job_type', models.CharField(choices=[('internship', 'Стажировка'), ('part_time', 'Частичная занятость'), ('research', 'Исследовательская работа'), ('teaching', 'Преподавательская работа')], max_length=50)),
+                ('salary', models.DecimalField(decimal_places=2, max_digits=10, null=True)),
+                ('created_at', models.DateTimeField()),
+                ('deadline', models.DateTimeField()),
+                ('is_active', models.BooleanField(default=True)),
+                ('department_name', models.CharField(max_length=200)),
+                ('employer_name', models.CharField(max_length=300)),
+                ('skills', models.JSONField(default=list)),
+                ('applications_count', models.PositiveIntegerField(default=0)),
+                ('favorites_count', models.PositiveIntegerField(default=0)),
+                ('reviews_count', models.PositiveIntegerField(default=0)),
+                ('avg_rating', models.FloatField(blank=True, null=True)),
+                ('department', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='myproject.department')),
+                ('employer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(condition=models.Q(('is_active', True)), fields=['job_type', 'department', '-created_at'], name='job_card_active_type_dept_idx'), models.Index(condition=models.Q(('is_active', True)), fields=['-created_at'], name='job_card_active_created_idx'), models.Index(fields=['-created_at', '-job'], name='job_card_created_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_job_cards, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,84 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:48
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_conversations(apps, schema_editor):
+    """Чаты и счетчики непрочитанных по существующим сообщениям"""
+    Message = apps.get_model('myproject', 'Message')
+    Conversation = apps.get_model('myproject', 'Conversation')
+    ConversationParticipant = apps.get_model('myproject', 'ConversationParticipant')
+
+    chats = {}
+    for message in Message.objects.order_by('created_at', 'id').iterator():
+        first, second = sorted((message.sender_id, message.receiver_id))
+        chat = chats.setdefault((message.application_id, first, second), {'unread': {}})
+        chat['last'] = message
+        if not message.is_read:
+            chat['unread'][message.receiver_id] = chat['unread'].get(message.receiver_id, 0) + 1
+
+    for (application_id, first, second), chat in chats.items():
+        last = chat['last']
+        conversation = Conversation.objects.create(
+            application_id=application_id, first_user_id=first, second_user_id=second,
+            last_message=last, last_message_at=last.created_at
+        )
+        ConversationParticipant.objects.bulk_create([
+            ConversationParticipant(
+                conversation=conversation, user_id=user_id, partner_id=partner_id,
+                unread_count=chat['unread'].get(user_id, 0), last_message_at=last.created_at
+            )
+            for user_id, partner_id in {first: second, second: first}.items()
+        ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myproject', '0015_job_cards'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Conversation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('last_message_at', models.DateTimeField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('application', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='conversations', to='myproject.application')),
+                ('first_user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('last_message', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='myproject.message')),
+                ('second_user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ConversationParticipant',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('unread_count', models.PositiveIntegerField(default=0)),
+                ('last_message_at', models.DateTimeField()),
+                ('conversation', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='participants', to='myproject.conversation')),
+                ('partner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='conversations', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='conversation',
+            constraint=models.UniqueConstraint(condition=models.Q(('application__isnull', False)), fields=('application', 'first_user', 'second_user'), name='conversation_application_uniq'),
+        ),
+        migrations.AddConstraint(
+            model_name='conversation',
+            constraint=models.UniqueConstraint(condition=models.Q(('application__isnull', True)), fields=('first_user', 'second_user'), name='conversation_direct_uniq'),
+        ),
+        migrations.AddIndex(
+            model_name='conversationparticipant',
+            index=models.Index(fields=['user', '-last_message_at', '-id'], name='conversation_inbox_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='conversationparticipant',
+            constraint=models.UniqueConstraint(fields=('conversation', 'user'), name='conversation_participant_uniq'),
+        ),
+        migrations.RunPython(backfill_conversations, migrations.RunPython.noop),
+    ]
@@ -1,4 +1,6 @@
 from django.db import models
+from django.db.models import Q
+from django.utils import timezone
 from django.contrib.auth.models import AbstractUser
 from django.db.models.signals import post_save
 from django.dispatch import receiver
@@ -66,6 +68,30 @@ class Job(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     deadline = models.DateTimeField()
     is_active = models.BooleanField(default=True)
+    # Дедлайн, о котором уже отправлено напоминание (см. команду expire_jobs)
+    deadline_reminder_for = models.DateTimeField(null=True, blank=True, editable=False)
+
+    class Meta:
+        indexes = [
+            # Фильтры активных вакансий по типу и отделу + сортировка по дате.
+            # Частичный индекс: Django записывает is_active=True как "WHERE is_active",
+            # поэтому булево поле в составе ключа SQLite не использует
+            models.Index(
+                fields=['job_type', 'department', '-created_at'],
+                condition=Q(is_active=True),
+                name='job_active_type_dept_idx'
+            ),
+            # Ключ курсорной пагинации /api/jobs/ и сортировка job_list_view
+            models.Index(fields=['-created_at', '-id'], name='job_created_id_idx'),
+            # Последние активные вакансии на главной
+            models.Index(fields=['-created_at'], condition=Q(is_active=True), name='job_active_created_idx'),
+            # Поиск истекающих и истекших активных вакансий
+            models.Index(fields=['deadline'], condition=Q(is_active=True), name='job_active_deadline_idx'),
+            # Сортировка /api/jobs/?ordering=deadline с курсором (deadline, id)
+            models.Index(fields=['deadline', 'id'], name='job_deadline_id_idx'),
+            # Фильтры salary_min / salary_max
+            models.Index(fields=['salary'], name='job_salary_idx'),
+        ]
 
     def __str__(self):
         return self.title
@@ -82,6 +108,22 @@ class Favorite(models.Model):
     def __str__(self):
         return f"{self.user.username} - {self.job.title}"
 
+class ResumeBlob(models.Model):
+    """
+    Файл резюме, хранящийся один раз под своим SHA-256.
+    ref_count - количество заявок, ссылающихся на файл; когда он падает
+    до нуля, запись и файл удаляются (см. utils/resumes.py).
+    """
+    sha256 = models.CharField(max_length=64, unique=True)
+    file = models.FileField(upload_to='resumes/', max_length=255)
+    size = models.PositiveBigIntegerField()
+    content_type = models.CharField(max_length=100, blank=True, default='')
+    ref_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.sha256
+
 class Application(models.Model):
     STATUS_CHOICES = [
         ('pending', 'На рассмотрении'),
@@ -94,12 +136,23 @@ class Application(models.Model):
     applicant = models.ForeignKey(User, on_delete=models.CASCADE, related_name='applications')
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
     cover_letter = models.TextField()
-    resume = models.FileField(upload_to='resumes/')
+    resume = models.FileField(upload_to='resumes/', max_length=255)
+    # Общий файл резюме; resume указывает на тот же путь в хранилище
+    resume_blob = models.ForeignKey(
+        ResumeBlob, on_delete=models.PROTECT, null=True, blank=True, editable=False,
+        related_name='applications'
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
         unique_together = ['job', 'applicant']
+        indexes = [
+            # Заявки на вакансии работодателя с фильтром по статусу
+            models.Index(fields=['job', 'status'], name='application_job_status_idx'),
+            # Заявки студента в порядке курсорной пагинации
+            models.Index(fields=['applicant', '-created_at', '-id'], name='application_applicant_idx'),
+        ]
     
     def __str__(self):
         return f"{self.applicant.username} - {self.job.title}"
@@ -114,6 +167,104 @@ class Application(models.Model):
         }
         return colors.get(self.status, 'primary')
 
+class ApplicationEvent(models.Model):
+    """
+    Запись журнала статусов заявки. Записи только добавляются и не меняются.
+    Вакансия и соискатель хранятся в самой записи, поэтому история
+    остается и после удаления заявки (отмена соискателем): application
+    становится NULL. См. utils/application_events.py.
+    """
+    application = models.ForeignKey(
+        Application, on_delete=models.SET_NULL, null=True, blank=True, related_name='events'
+    )
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='application_events')
+    applicant = models.ForeignKey(User, on_delete=models.CASCADE, related_name='application_events')
+    actor = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    # Пустой from_status - подача заявки
+    from_status = models.CharField(max_length=20, choices=Application.STATUS_CHOICES, blank=True)
+    to_status = models.CharField(max_length=20, choices=Application.STATUS_CHOICES)
+    # Первый ответ работодателя (принята/отклонена) и сколько его ждали
+    is_first_response = models.BooleanField(default=False)
+    response_seconds = models.PositiveIntegerField(null=True, blank=True)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            # Хронология одной заявки
+            models.Index(fields=['application', 'created_at'], name='application_event_timeline_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['application'], condition=Q(is_first_response=True),
+                name='application_event_first_response_uniq'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.application_id}: {self.from_status or '-'} -> {self.to_status}"
+
+    def save(self, *args, **kwargs):
+        if self.pk is not None:
+            raise ValueError('Записи журнала статусов заявок не изменяются')
+        super().save(*args, **kwargs)
+
+class JobResponseStats(models.Model):
+    """
+    Время первого ответа работодателя по вакансии. Обновляется при каждом
+    первом ответе: в sketch хранится логарифмическая гистограмма времен,
+    по которой медиана пересчитывается без чтения журнала.
+    """
+    job = models.OneToOneField(Job, on_delete=models.CASCADE, primary_key=True, related_name='response_stats')
+    responses = models.PositiveIntegerField(default=0)
+    sketch = models.JSONField(default=dict)
+    median_seconds = models.FloatField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.job_id}: {self.median_seconds}"
+
+class JobCard(models.Model):
+    """
+    Карточка вакансии для списков: колонки вакансии, по которым списки
+    фильтруются и сортируются, плюс денормализованные название отдела,
+    имя работодателя, навыки и счетчики. Списки читают одну эту таблицу
+    без JOIN и агрегатов. Поддерживается сигналами (см. utils.job_cards),
+    пересобирается командой rebuild_job_cards.
+    """
+    job = models.OneToOneField(Job, on_delete=models.CASCADE, primary_key=True, related_name='card')
+    title = models.CharField(max_length=200)
+    description = models.TextField()
+    job_type = models.CharField(max_length=50, choices=Job.JOB_TYPE_CHOICES)
+    salary = models.DecimalField(max_digits=10, decimal_places=2, null=True)
+    created_at = models.DateTimeField()
+    deadline = models.DateTimeField()
+    is_active = models.BooleanField(default=True)
+    department = models.ForeignKey(Department, on_delete=models.CASCADE, related_name='+')
+    department_name = models.CharField(max_length=200)
+    employer = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')
+    employer_name = models.CharField(max_length=300)
+    # [{"name": ..., "level": ..., "is_required": ...}] в порядке добавления навыков
+    skills = models.JSONField(default=list)
+    applications_count = models.PositiveIntegerField(default=0)
+    favorites_count = models.PositiveIntegerField(default=0)
+    reviews_count = models.PositiveIntegerField(default=0)
+    avg_rating = models.FloatField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # Те же ключи, что и у списков вакансий (см. индексы Job)
+            models.Index(
+                fields=['job_type', 'department', '-created_at'],
+                condition=Q(is_active=True),
+                name='job_card_active_type_dept_idx'
+            ),
+            models.Index(fields=['-created_at'], condition=Q(is_active=True), name='job_card_active_created_idx'),
+            models.Index(fields=['-created_at', '-job'], name='job_card_created_idx'),
+        ]
+
+    def __str__(self):
+        return self.title
+
 class Skill(models.Model):
     name = models.CharField(max_length=100, unique=True)
     category = models.CharField(max_length=50, choices=[
@@ -160,9 +311,77 @@ class Message(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     is_read = models.BooleanField(default=False)
 
+    class Meta:
+        indexes = [
+            # Входящие и исходящие сообщения пользователя по времени
+            models.Index(fields=['sender', '-created_at', '-id'], name='message_sender_created_idx'),
+            models.Index(fields=['receiver', '-created_at', '-id'], name='message_receiver_created_idx'),
+            # Непрочитанные сообщения по чату (заявка + собеседник)
+            models.Index(fields=['receiver', 'application', 'sender'], condition=Q(is_read=False), name='message_unread_idx'),
+            # История чата по заявке
+            models.Index(fields=['application', 'created_at'], name='message_application_idx'),
+        ]
+
     def __str__(self):
         return f"От {self.sender.username} к {self.receiver.username}"
 
+class Conversation(models.Model):
+    """
+    Чат двух пользователей по заявке (или без заявки). Участники хранятся
+    упорядоченными по id (first_user < second_user), поэтому тройка
+    (заявка, участники) однозначно определяет чат. Поддерживается
+    при создании и прочтении сообщений (см. utils/conversations.py).
+    """
+    application = models.ForeignKey(
+        Application, on_delete=models.CASCADE, null=True, blank=True, related_name='conversations'
+    )
+    first_user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')
+    second_user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')
+    last_message = models.ForeignKey(Message, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    last_message_at = models.DateTimeField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            # NULL в уникальном ключе не сравнивается, поэтому чаты без заявки - отдельным ограничением
+            models.UniqueConstraint(
+                fields=['application', 'first_user', 'second_user'],
+                condition=Q(application__isnull=False),
+                name='conversation_application_uniq'
+            ),
+            models.UniqueConstraint(
+                fields=['first_user', 'second_user'],
+                condition=Q(application__isnull=True),
+                name='conversation_direct_uniq'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.application_id or '-'}: {self.first_user_id} / {self.second_user_id}"
+
+class ConversationParticipant(models.Model):
+    """
+    Чат глазами одного участника: собеседник, счетчик непрочитанных и копия
+    времени последнего сообщения, чтобы список чатов пользователя читался
+    одним запросом по индексу (user, -last_message_at, -id).
+    """
+    conversation = models.ForeignKey(Conversation, on_delete=models.CASCADE, related_name='participants')
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='conversations')
+    partner = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')
+    unread_count = models.PositiveIntegerField(default=0)
+    last_message_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['conversation', 'user'], name='conversation_participant_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['user', '-last_message_at', '-id'], name='conversation_inbox_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} -> {self.partner_id}: {self.unread_count}"
+
 class Review(models.Model):
     job = models.ForeignKey(Job, on_delete=models.CASCADE)
     reviewer = models.ForeignKey(User, on_delete=models.CASCADE)
@@ -187,5 +406,45 @@ class Notification(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     is_read = models.BooleanField(default=False)
 
+    class Meta:
+        indexes = [
+            # Список уведомлений пользователя в порядке курсорной пагинации
+            models.Index(fields=['user', '-created_at', '-id'], name='notification_user_created_idx'),
+            # Непрочитанные уведомления пользователя
+            models.Index(fields=['user', '-created_at'], condition=Q(is_read=False), name='notification_unread_idx'),
+        ]
+
+    def __str__(self):
+        return self.title
+
+
+class OutboxEvent(models.Model):
+    """
+    Отложенный побочный эффект (уведомления, системные сообщения), записанный
+    в той же транзакции, что и основное изменение. Обрабатывается командой
+    process_outbox (см. utils/outbox.py).
+    """
+    TOPIC_CHOICES = [
+        ('application_status', 'Изменение статуса заявок'),
+        ('message_sent', 'Новое сообщение в чате'),
+    ]
+
+    topic = models.CharField(max_length=50, choices=TOPIC_CHOICES)
+    payload = models.JSONField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    # Событие берется в обработку не раньше этого момента (повторы с задержкой, аренда)
+    available_at = models.DateTimeField(default=timezone.now)
+    claim_token = models.CharField(max_length=32, blank=True, default='')
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True, default='')
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # Выборка очередной пачки необработанных событий
+            models.Index(fields=['available_at', 'id'], condition=Q(processed_at__isnull=True), name='outbox_pending_idx'),
+            models.Index(fields=['claim_token'], condition=Q(processed_at__isnull=True), name='outbox_claim_idx'),
+        ]
+
     def __str__(self):
-        return self.title 
\ No newline at end of file
+        return f"{self.topic} #{self.pk}"
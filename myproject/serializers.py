@@ -1,7 +1,108 @@
+from datetime import datetime
+from django.core.exceptions import FieldDoesNotExist
+from django.utils import timezone
 from rest_framework import serializers
-from .models import User, Department, Application, Skill, UserSkill, Message, Review, Notification, Job
+from rest_framework.permissions import SAFE_METHODS
+from .models import User, Department, Application, ApplicationEvent, Skill, UserSkill, Message, Review, Notification, Job, JobCard, ConversationParticipant
 
-class UserSerializer(serializers.ModelSerializer):
+FIELDS_PARAM = 'fields'
+EXPAND_PARAM = 'expand'
+
+
+def parse_fieldset(value):
+    """
+    'id,title,department.name' -> {'id': {}, 'title': {}, 'department': {'name': {}}}.
+    Пустое поддерево означает "все поля" вложенного объекта.
+    """
+    if value is None:
+        return None
+    tree = {}
+    for path in value.split(','):
+        node = tree
+        for name in filter(None, (part.strip() for part in path.split('.'))):
+            node = node.setdefault(name, {})
+    return tree
+
+
+class SparseFieldsetSerializer(serializers.ModelSerializer):
+    """
+    Базовый сериализатор с выборочными полями для GET-запросов:
+
+    ?fields=id,title,department.name - в ответе только перечисленные поля,
+        поля вложенных объектов указываются через точку;
+    ?expand=department,employer - какие связи отдавать вложенными объектами,
+        остальные отдаются как id (обратные связи один-к-одному, например
+        card у вакансии, опускаются). Без expand вложены все связи, как раньше.
+
+    Параметры также можно передать в конструктор (fields=..., expand=...)
+    уже разобранными деревьями. optimize_queryset по тем же полям строит
+    select_related и only(), поэтому невыбранные колонки не читаются из БД,
+    а невыбранные связи не присоединяются.
+    """
+
+    def __init__(self, *args, fields=None, expand=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.sparse_fields = fields
+        self.expand_fields = expand
+
+    def _is_root(self):
+        parent = getattr(self, 'parent', None)
+        if isinstance(parent, serializers.ListSerializer):
+            parent = getattr(parent, 'parent', None)
+        return parent is None
+
+    def _read_query_params(self):
+        request = self.context.get('request')
+        if request is None or request.method not in SAFE_METHODS or not self._is_root():
+            return
+        params = getattr(request, 'query_params', request.GET)
+        if self.sparse_fields is None:
+            self.sparse_fields = parse_fieldset(params.get(FIELDS_PARAM)) or None
+        if self.expand_fields is None:
+            self.expand_fields = parse_fieldset(params.get(EXPAND_PARAM))
+
+    @property
+    def is_sparse(self):
+        """Запрошен ли выборочный набор полей (параметры читаются при первом обращении к fields)"""
+        return self.sparse_fields is not None or self.expand_fields is not None
+
+    def _stores_id(self, source):
+        """Хранится ли id связанного объекта в строке модели (прямой FK / OneToOne)"""
+        try:
+            return self.Meta.model._meta.get_field(source).concrete
+        except FieldDoesNotExist:
+            return True
+
+    def get_fields(self):
+        fields = super().get_fields()
+        self._read_query_params()
+        if self.sparse_fields is not None:
+            fields = {name: field for name, field in fields.items() if name in self.sparse_fields}
+
+        for name, field in list(fields.items()):
+            nested = field.child if isinstance(field, serializers.ListSerializer) else field
+            if not isinstance(nested, serializers.BaseSerializer) or field.source == '*':
+                continue
+            if self.expand_fields is not None and name not in self.expand_fields:
+                if not isinstance(field, serializers.ListSerializer) and not self._stores_id(field.source):
+                    # Обратная связь один-к-одному (карточка вакансии): id в строке нет,
+                    # а отдельный запрос ради него не нужен - поле не отдается
+                    del fields[name]
+                    continue
+                # Связь не раскрыта: отдаем id, JOIN не нужен
+                source = {'source': field.source} if field.source not in (None, name) else {}
+                fields[name] = serializers.PrimaryKeyRelatedField(
+                    read_only=True, many=isinstance(field, serializers.ListSerializer), **source
+                )
+            elif isinstance(nested, SparseFieldsetSerializer):
+                if self.sparse_fields is not None:
+                    nested.sparse_fields = self.sparse_fields[name] or None
+                if self.expand_fields is not None:
+                    nested.expand_fields = self.expand_fields[name]
+        return fields
+
+
+class UserSerializer(SparseFieldsetSerializer):
     class Meta:
         model = User
         fields = ('id', 'username', 'email', 'role', 'created_at')
@@ -12,7 +113,7 @@ class UserSerializer(serializers.ModelSerializer):
             'role': {'help_text': 'Роль пользователя (student, employer, admin)'}
         }
 
-class DepartmentSerializer(serializers.ModelSerializer):
+class DepartmentSerializer(SparseFieldsetSerializer):
     class Meta:
         model = Department
         fields = '__all__'
@@ -23,7 +124,7 @@ class DepartmentSerializer(serializers.ModelSerializer):
             'contact_email': {'help_text': 'Контактный email отдела'}
         }
 
-class SkillSerializer(serializers.ModelSerializer):
+class SkillSerializer(SparseFieldsetSerializer):
     class Meta:
         model = Skill
         fields = '__all__'
@@ -32,12 +133,12 @@ class SkillSerializer(serializers.ModelSerializer):
             'category': {'help_text': 'Категория навыка (technical, soft, language, other)'}
         }
 
-class ApplicationSerializer(serializers.ModelSerializer):
+class ApplicationSerializer(SparseFieldsetSerializer):
     applicant = UserSerializer(read_only=True)
     
     class Meta:
         model = Application
-        fields = '__all__'
+        exclude = ('resume_blob',)
         read_only_fields = ('created_at', 'updated_at', 'applicant')
         extra_kwargs = {
             'job': {'help_text': 'ID вакансии'},
@@ -46,7 +147,19 @@ class ApplicationSerializer(serializers.ModelSerializer):
             'resume': {'help_text': 'Файл резюме'}
         }
 
-class UserSkillSerializer(serializers.ModelSerializer):
+class ApplicationEventSerializer(SparseFieldsetSerializer):
+    class Meta:
+        model = ApplicationEvent
+        fields = ('id', 'from_status', 'to_status', 'actor', 'is_first_response', 'response_seconds', 'created_at')
+        read_only_fields = fields
+        extra_kwargs = {
+            'from_status': {'help_text': 'Статус до перехода (пустой для подачи заявки)'},
+            'to_status': {'help_text': 'Статус после перехода'},
+            'actor': {'help_text': 'Кто изменил статус'},
+            'response_seconds': {'help_text': 'Для первого ответа работодателя - сколько секунд прошло с подачи'}
+        }
+
+class UserSkillSerializer(SparseFieldsetSerializer):
     skill = SkillSerializer(read_only=True)
     
     class Meta:
@@ -57,22 +170,55 @@ class UserSkillSerializer(serializers.ModelSerializer):
             'verified': {'help_text': 'Подтвержден ли навык'}
         }
 
-class MessageSerializer(serializers.ModelSerializer):
+class MessageSerializer(SparseFieldsetSerializer):
     sender = UserSerializer(read_only=True)
     receiver = UserSerializer(read_only=True)
+    receiver_id = serializers.PrimaryKeyRelatedField(
+        queryset=User.objects.all(),
+        source='receiver',
+        write_only=True,
+        error_messages={
+            'required': 'Необходимо указать получателя',
+            'does_not_exist': 'Получатель не найден'
+        },
+        help_text='ID получателя сообщения'
+    )
     
     class Meta:
         model = Message
         fields = '__all__'
         read_only_fields = ('created_at', 'sender')
         extra_kwargs = {
-            'receiver': {'help_text': 'ID получателя сообщения'},
             'content': {'help_text': 'Содержание сообщения'},
             'application': {'help_text': 'ID заявки (опционально)'},
             'is_read': {'help_text': 'Прочитано ли сообщение'}
         }
 
-class ReviewSerializer(serializers.ModelSerializer):
+class LastMessageSerializer(SparseFieldsetSerializer):
+    class Meta:
+        model = Message
+        fields = ('id', 'sender', 'content', 'created_at')
+        read_only_fields = fields
+
+class ConversationSerializer(SparseFieldsetSerializer):
+    """Чат в списке входящих текущего пользователя"""
+    application = serializers.IntegerField(
+        source='conversation.application_id', read_only=True, allow_null=True,
+        help_text='ID заявки, к которой относится чат (null для личных сообщений)'
+    )
+    partner = UserSerializer(read_only=True)
+    last_message = LastMessageSerializer(source='conversation.last_message', read_only=True)
+
+    class Meta:
+        model = ConversationParticipant
+        fields = ('id', 'application', 'partner', 'last_message', 'last_message_at', 'unread_count')
+        read_only_fields = fields
+        extra_kwargs = {
+            'last_message_at': {'help_text': 'Время последнего сообщения в чате'},
+            'unread_count': {'help_text': 'Количество непрочитанных сообщений собеседника'}
+        }
+
+class ReviewSerializer(SparseFieldsetSerializer):
     reviewer = UserSerializer(read_only=True)
     
     class Meta:
@@ -86,7 +232,7 @@ class ReviewSerializer(serializers.ModelSerializer):
             'is_anonymous': {'help_text': 'Анонимный ли отзыв'}
         }
 
-class NotificationSerializer(serializers.ModelSerializer):
+class NotificationSerializer(SparseFieldsetSerializer):
     class Meta:
         model = Notification
         fields = '__all__'
@@ -99,8 +245,32 @@ class NotificationSerializer(serializers.ModelSerializer):
             'is_read': {'help_text': 'Прочитано ли уведомление'}
         }
 
-class JobSerializer(serializers.ModelSerializer):
+class DeadlineField(serializers.DateField):
+    """
+    Дата дедлайна: принимает дату, а в ответе отдает дату из DateTimeField модели
+    """
+    def to_representation(self, value):
+        if isinstance(value, datetime):
+            value = timezone.localtime(value).date() if timezone.is_aware(value) else value.date()
+        return super().to_representation(value)
+
+class JobCardSerializer(SparseFieldsetSerializer):
+    """Денормализованные данные карточки вакансии: навыки, счетчики и рейтинг"""
+    class Meta:
+        model = JobCard
+        fields = ('skills', 'applications_count', 'favorites_count', 'reviews_count', 'avg_rating')
+        read_only_fields = fields
+        extra_kwargs = {
+            'skills': {'help_text': 'Навыки вакансии: name, level, is_required'},
+            'applications_count': {'help_text': 'Количество заявок'},
+            'favorites_count': {'help_text': 'Сколько пользователей добавили вакансию в избранное'},
+            'reviews_count': {'help_text': 'Количество отзывов'},
+            'avg_rating': {'help_text': 'Средняя оценка в отзывах'}
+        }
+
+class JobSerializer(SparseFieldsetSerializer):
     employer = UserSerializer(read_only=True)
+    card = JobCardSerializer(read_only=True)
     department_id = serializers.PrimaryKeyRelatedField(
         queryset=Department.objects.all(),
         source='department',
@@ -113,7 +283,7 @@ class JobSerializer(serializers.ModelSerializer):
         help_text='ID отдела (обязательное поле)'
     )
     department = DepartmentSerializer(read_only=True)
-    deadline = serializers.DateField(
+    deadline = DeadlineField(
         required=True,
         error_messages={
             'required': 'Необходимо указать срок подачи заявок',
@@ -124,7 +294,7 @@ class JobSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = Job
-        fields = '__all__'
+        exclude = ('deadline_reminder_for',)
         read_only_fields = ('created_at', 'updated_at', 'employer')
         extra_kwargs = {
             'title': {
@@ -60,6 +60,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'myproject.wsgi.application'
+ASGI_APPLICATION = 'myproject.asgi.application'
 
 DATABASES = {
     'default': {
@@ -97,6 +98,13 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# Отдача резюме (utils/file_delivery.py): direct - поток из Django с Range/ETag,
+# x-accel - через nginx (internal location RESUME_ACCEL_PREFIX -> MEDIA_ROOT),
+# x-sendfile - через Apache, redirect - подписанная ссылка S3-хранилища
+RESUME_DELIVERY = os.environ.get('RESUME_DELIVERY', 'direct')
+RESUME_ACCEL_PREFIX = '/protected-media/'
+RESUME_URL_EXPIRE = 300
+
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # Настройки авторизации
@@ -149,6 +157,48 @@ REST_FRAMEWORK = {
     'AUTHENTICATION_FAILED_HANDLER': 'myproject.utils.error_handler.custom_authentication_failed_handler',
 }
 
+# Полнотекстовый поиск по вакансиям (SQLiteFTSBackend или SimpleSearchBackend)
+SEARCH_BACKEND = 'myproject.utils.search.SQLiteFTSBackend'
+JOBS_PER_PAGE = 10
+# Чатов на странице списка сообщений
+CONVERSATIONS_PER_PAGE = 20
+
+# Кеш. Для нескольких воркеров нужен общий бэкенд (например, Redis),
+# иначе версия кеша вакансий будет своей в каждом процессе
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.environ.get('CACHE_LOCATION', 'job-portal'),
+    }
+}
+# Кеш списков вакансий инвалидируется версией, TTL - только страховка
+JOBS_CACHE_TIMEOUT = 60 * 60
+# Счетчики для бейджей инвалидируются версией пользователя, TTL - только страховка
+COUNTERS_CACHE_TIMEOUT = 60 * 60
+# Поток событий (SSE): без сигнала pub/sub БД опрашивается раз в EVENT_STREAM_POLL_INTERVAL
+# секунд; через EVENT_STREAM_MAX_AGE поток закрывается, клиент переподключается через EVENT_STREAM_RETRY
+EVENT_STREAM_POLL_INTERVAL = 15
+EVENT_STREAM_MAX_AGE = 30 * 60
+EVENT_STREAM_RETRY = 3
+# С общим для всех воркеров кешем (Redis, Memcached) сессии читаются из него,
+# и опрос счетчиков с неизменным ETag не обращается к БД. LocMemCache у каждого
+# процесса свой: удаленная (отозванная) сессия осталась бы в кеше других
+# воркеров, поэтому с ним сессии читаются из БД
+if CACHES['default']['BACKEND'] not in (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+):
+    SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+# process_outbox --check считает outbox отстающим, если в нем есть необработанные
+# события старше стольких минут (обработчик не запущен или не успевает)
+OUTBOX_BACKLOG_ALERT_MINUTES = 10
+# Сколько хранится первый ответ на запрос с заголовком Idempotency-Key
+IDEMPOTENCY_KEY_TTL = 24 * 60 * 60
+# Сколько держится отметка "запрос выполняется", если процесс упал, не сняв ее.
+# Не меньше таймаута запроса воркера (gunicorn --timeout, по умолчанию 30 с),
+# иначе повтор выполнится параллельно еще не завершенному первому запросу
+IDEMPOTENCY_IN_PROGRESS_TIMEOUT = 2 * 60
+
 # Показывать кастомные страницы ошибок даже в режиме отладки
 DEBUG_PROPAGATE_EXCEPTIONS = True
 
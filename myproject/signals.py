@@ -0,0 +1,173 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import Job, Department, JobSkill, UserSkill, Application, Favorite, Review, Skill, User, Message, Notification
+from .utils.search import get_search_backend
+from .utils.cache import bump_jobs_version
+from .utils.recommendations import mark_jobs_changed, invalidate_user_skills
+from .utils.resumes import release_resume
+from .utils.job_cards import refresh_job_cards, refresh_job_card_counters
+from .utils.conversations import record_messages, recount_unread
+from .utils.counters import invalidate_counters, invalidate_application_counters
+from .utils.events import publish_events
+
+# Поля пользователя, из которых складывается имя работодателя в карточке вакансии
+EMPLOYER_NAME_FIELDS = {'username', 'first_name', 'last_name'}
+
+
+@receiver(post_save, sender=Job)
+def index_job(sender, instance, **kwargs):
+    """Синхронизация поискового индекса при сохранении вакансии"""
+    get_search_backend().index(instance)
+
+
+@receiver(post_delete, sender=Job)
+def unindex_job(sender, instance, **kwargs):
+    """Удаление вакансии из поискового индекса"""
+    get_search_backend().remove(instance.pk)
+
+
+@receiver(post_save, sender=Job)
+@receiver(post_delete, sender=Job)
+@receiver(post_save, sender=Department)
+@receiver(post_delete, sender=Department)
+@receiver(post_save, sender=JobSkill)
+@receiver(post_delete, sender=JobSkill)
+def invalidate_jobs_cache(sender, **kwargs):
+    """Любое изменение вакансий, отделов или навыков вакансий сбрасывает кеш списков"""
+    bump_jobs_version()
+
+
+@receiver(post_save, sender=Job)
+@receiver(post_delete, sender=Job)
+@receiver(post_save, sender=JobSkill)
+@receiver(post_delete, sender=JobSkill)
+def refresh_skill_matrix(sender, instance, **kwargs):
+    """Строка вакансии в матрице рекомендаций перечитывается при следующем запросе"""
+    mark_jobs_changed([instance.pk if sender is Job else instance.job_id])
+
+
+@receiver(post_save, sender=UserSkill)
+@receiver(post_delete, sender=UserSkill)
+def refresh_user_skills(sender, instance, **kwargs):
+    """Сброс закешированного вектора навыков пользователя"""
+    invalidate_user_skills(instance.user_id)
+
+
+@receiver(post_delete, sender=Application)
+def release_application_resume(sender, instance, **kwargs):
+    """Освобождение ссылки на общий файл резюме при удалении заявки"""
+    if instance.resume_blob_id:
+        release_resume(instance.resume_blob_id)
+
+
+@receiver(post_save, sender=Job)
+def save_job_card(sender, instance, **kwargs):
+    """Карточка вакансии создается и обновляется вместе с ней"""
+    refresh_job_cards([instance.pk], create=True)
+
+
+@receiver(post_save, sender=JobSkill)
+@receiver(post_delete, sender=JobSkill)
+def refresh_job_card_skills(sender, instance, **kwargs):
+    refresh_job_cards([instance.job_id])
+
+
+@receiver(post_save, sender=Department)
+def refresh_department_job_cards(sender, instance, created, **kwargs):
+    if not created:
+        refresh_job_cards(Job.objects.filter(department=instance).values_list('pk', flat=True))
+
+
+@receiver(post_save, sender=Skill)
+def refresh_skill_job_cards(sender, instance, created, **kwargs):
+    if created:
+        return
+    job_ids = list(JobSkill.objects.filter(skill=instance).values_list('job_id', flat=True))
+    if job_ids:
+        refresh_job_cards(job_ids)
+        bump_jobs_version()
+
+
+@receiver(post_save, sender=User)
+def refresh_employer_job_cards(sender, instance, created, update_fields=None, **kwargs):
+    """Имя работодателя в карточках; вход в систему (update_fields=last_login) пропускается"""
+    if created or (update_fields is not None and not EMPLOYER_NAME_FIELDS & set(update_fields)):
+        return
+    job_ids = list(Job.objects.filter(employer=instance).values_list('pk', flat=True))
+    if job_ids:
+        refresh_job_cards(job_ids)
+        bump_jobs_version()
+
+
+@receiver(post_save, sender=Application)
+@receiver(post_delete, sender=Application)
+@receiver(post_save, sender=Favorite)
+@receiver(post_delete, sender=Favorite)
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def refresh_job_card_stats(sender, instance, created=False, **kwargs):
+    """Счетчики заявок, избранного и рейтинг в карточке вакансии"""
+    if sender is Application and kwargs.get('signal') is post_save and not created:
+        # Смена статуса не меняет количество заявок
+        return
+    if refresh_job_card_counters([instance.job_id]):
+        bump_jobs_version()
+
+
+@receiver(post_save, sender=Message)
+def update_conversation(sender, instance, created, **kwargs):
+    """
+    Новое сообщение попадает в чат (последнее сообщение, счетчик непрочитанных).
+    Сообщения, созданные bulk_create, учитываются вызовом record_messages напрямую
+    """
+    if created:
+        record_messages([instance])
+    else:
+        recount_unread(instance.receiver_id, instance.application_id, instance.sender_id)
+
+
+@receiver(post_delete, sender=Message)
+def update_conversation_unread(sender, instance, **kwargs):
+    if not instance.is_read:
+        recount_unread(instance.receiver_id, instance.application_id, instance.sender_id)
+
+
+@receiver(post_save, sender=Notification)
+def invalidate_notification_counters(sender, instance, **kwargs):
+    """
+    Счетчик непрочитанных уведомлений. На post_delete обработчика нет намеренно:
+    без него массовое удаление - один DELETE; удаления сбрасывают счетчики явно
+    (utils/notifications.py)
+    """
+    invalidate_counters([instance.user_id])
+
+
+@receiver(post_save, sender=Notification)
+def publish_notification(sender, instance, created, **kwargs):
+    """Новое уведомление - сигнал открытому потоку событий пользователя"""
+    if created:
+        publish_events([instance.user_id])
+
+
+@receiver(post_save, sender=Application)
+@receiver(post_delete, sender=Application)
+def invalidate_pending_counters(sender, instance, **kwargs):
+    """Счетчики заявок на рассмотрении у заявителя и работодателя"""
+    invalidate_application_counters([instance])
+
+
+@receiver(post_save, sender=User)
+def invalidate_user_counters(sender, instance, created, update_fields=None, **kwargs):
+    """
+    Смена роли, пароля или блокировка пользователя. Запись счетчиков хранит
+    хеш пароля для проверки сессии, поэтому после смены пароля она не читается
+    """
+    if created or update_fields == frozenset({'last_login'}):
+        return
+    invalidate_counters([instance.pk])
+
+
+@receiver(post_delete, sender=User)
+def invalidate_deleted_user_counters(sender, instance, **kwargs):
+    """Сессии удаленного пользователя не должны получать его закешированные счетчики"""
+    invalidate_counters([instance.pk])
@@ -0,0 +1,115 @@
+import random
+import statistics
+from datetime import timedelta
+from django.core.management import call_command
+from django.test import TestCase, Client
+from django.utils import timezone
+from ..models import User, Job, Department, Application, ApplicationEvent, JobResponseStats
+from ..utils.application_events import record_created, sketch_add, sketch_quantile
+from ..utils.application_status import bulk_update_status
+
+class ApplicationEventTest(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.employer = User.objects.create_user(username='employer', password='testpass123', role='employer')
+        self.job = Job.objects.create(
+            title='Вакансия', description='Описание', department=Department.objects.create(name='Кафедра'),
+            employer=self.employer, job_type='internship',
+            deadline=timezone.now() + timezone.timedelta(days=30)
+        )
+        self.students = [
+            User.objects.create_user(username=f'student{i}', password='testpass123', role='student')
+            for i in range(3)
+        ]
+
+    def apply(self, student, hours_ago):
+        application = Application.objects.create(job=self.job, applicant=student, cover_letter='Письмо')
+        Application.objects.filter(pk=application.pk).update(created_at=timezone.now() - timedelta(hours=hours_ago))
+        return application
+
+    def test_status_changes_are_logged(self):
+        """Каждый переход пишется в журнал, первым ответом считается только первый"""
+        application = self.apply(self.students[0], hours_ago=2)
+        self.client.login(username='employer', password='testpass123')
+        self.client.post(f'/applications/{application.id}/update-status/', {'status': 'accepted'})
+        self.client.post(f'/api/applications/{application.id}/update_status/', {'status': 'rejected'})
+        bulk_update_status(self.employer, [application.id], 'rejected')
+
+        first, second = ApplicationEvent.objects.filter(application=application).order_by('id')
+        self.assertEqual((first.from_status, first.to_status, first.actor), ('pending', 'accepted', self.employer))
+        self.assertTrue(first.is_first_response)
+        self.assertAlmostEqual(first.response_seconds, 7200, delta=5)
+        self.assertEqual((second.from_status, second.to_status), ('accepted', 'rejected'))
+        self.assertFalse(second.is_first_response)
+
+        stats = JobResponseStats.objects.get(job=self.job)
+        self.assertEqual(stats.responses, 1)
+        self.assertAlmostEqual(stats.median_seconds, 7200, delta=7200 * 0.01)
+
+        with self.assertRaises(ValueError):
+            first.save()
+
+    def test_incremental_median(self):
+        """Медиана обновляется при каждом ответе без чтения журнала"""
+        applications = [self.apply(student, hours) for student, hours in zip(self.students, (1, 10, 100))]
+        bulk_update_status(self.employer, [applications[0].id, applications[2].id], 'rejected')
+        stats = JobResponseStats.objects.get(job=self.job)
+        self.assertAlmostEqual(stats.median_seconds, 3600 * 50.5, delta=3600 * 50.5 * 0.02)
+
+        with self.assertNumQueries(9):
+            # SAVEPOINT, SELECT заявок, проверка прежних ответов, журнал,
+            # SELECT FOR UPDATE статистики, ее UPDATE, UPDATE заявок, outbox, RELEASE
+            bulk_update_status(self.employer, [applications[1].id], 'accepted')
+        stats.refresh_from_db()
+        self.assertEqual(stats.responses, 3)
+        self.assertAlmostEqual(stats.median_seconds, 36000, delta=36000 * 0.01)
+
+        JobResponseStats.objects.all().delete()
+        call_command('rebuild_response_stats', stdout=open('/dev/null', 'w'))
+        self.assertAlmostEqual(JobResponseStats.objects.get(job=self.job).median_seconds, stats.median_seconds)
+
+    def test_sketch_accuracy(self):
+        """Квантиль гистограммы отличается от точной медианы не больше чем на 1%"""
+        rng = random.Random(42)
+        values = [rng.lognormvariate(9, 2) for _ in range(1001)]
+        sketch = {}
+        for value in values:
+            sketch_add(sketch, value)
+        exact = statistics.median(values)
+        self.assertAlmostEqual(sketch_quantile(sketch), exact, delta=exact * 0.01)
+        self.assertLess(len(sketch), 1000)
+        p90 = statistics.quantiles(values, n=10, method='inclusive')[-1]
+        self.assertAlmostEqual(sketch_quantile(sketch, 0.9), p90, delta=p90 * 0.01)
+        self.assertIsNone(sketch_quantile({}))
+
+    def test_timeline_and_cancel(self):
+        """Хронология заявки доступна участникам; после отмены журнал сохраняется"""
+        application = Application.objects.create(job=self.job, applicant=self.students[0], cover_letter='Письмо')
+        record_created(application, self.students[0])
+        self.client.login(username='student0', password='testpass123')
+        bulk_update_status(self.employer, [application.id], 'pending')
+
+        response = self.client.get(f'/api/applications/{application.id}/timeline/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([(e['from_status'], e['to_status']) for e in response.json()], [('', 'pending')])
+
+        self.client.login(username='student1', password='testpass123')
+        self.assertEqual(self.client.get(f'/api/applications/{application.id}/timeline/').status_code, 404)
+
+        self.client.login(username='student0', password='testpass123')
+        self.client.post(f'/applications/{application.id}/cancel/')
+        self.assertFalse(Application.objects.exists())
+        self.assertEqual(
+            list(ApplicationEvent.objects.filter(applicant=self.students[0]).values_list('application', 'to_status')),
+            [(None, 'pending'), (None, 'withdrawn')]
+        )
+
+    def test_job_stats_include_median(self):
+        """Медиана времени ответа входит в статистику вакансий работодателя"""
+        application = self.apply(self.students[0], hours_ago=3)
+        bulk_update_status(self.employer, [application.id], 'accepted')
+        self.client.login(username='employer', password='testpass123')
+        response = self.client.get('/api/jobs/mine/stats/')
+        self.assertAlmostEqual(response.json()['results'][0]['median_response_seconds'], 10800, delta=108)
+        response = self.client.get('/profile/dashboard/')
+        self.assertContains(response, '3 ч ')
@@ -0,0 +1,79 @@
+from django.test import TestCase, Client
+from django.utils import timezone
+from ..models import User, Job, Department, Application, Message, Notification
+from ..utils.outbox import drain_outbox
+
+class BulkApplicationStatusTest(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.employer = User.objects.create_user(username='employer', password='testpass123', role='employer')
+        self.other = User.objects.create_user(username='other', password='testpass123', role='employer')
+        department = Department.objects.create(name='Кафедра')
+        self.job = self.create_job(department, self.employer)
+        self.other_job = self.create_job(department, self.other)
+        self.applications = []
+        for i in range(20):
+            student = User.objects.create_user(username=f'student{i}', password='testpass123')
+            self.applications.append(
+                Application.objects.create(job=self.job, applicant=student, cover_letter='Письмо')
+            )
+        self.foreign = Application.objects.create(
+            job=self.other_job, applicant=User.objects.get(username='student0'), cover_letter='Письмо'
+        )
+        self.client.login(username='employer', password='testpass123')
+
+    def create_job(self, department, employer):
+        return Job.objects.create(
+            title='Вакансия', description='Описание', department=department, employer=employer,
+            job_type='internship', deadline=timezone.now() + timezone.timedelta(days=30)
+        )
+
+    def post(self, ids, status):
+        return self.client.post(
+            '/api/applications/bulk-status/',
+            {'application_ids': ids, 'status': status},
+            content_type='application/json'
+        )
+
+    def test_bulk_accept(self):
+        """Число запросов не зависит от количества заявок"""
+        ids = [application.id for application in self.applications]
+        with self.assertNumQueries(14):
+            # сессия, пользователь, транзакция (SAVEPOINT/RELEASE), выборка,
+            # UPDATE, запись события outbox, журнал статусов (проверка прежних
+            # ответов и bulk_create) и статистика вакансии (при первом ответе
+            # на вакансию - создание строки: SELECT, SAVEPOINT, INSERT, RELEASE, UPDATE)
+            response = self.post(ids, 'accepted')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(sorted(response.json()['updated']), sorted(ids))
+        self.assertEqual(Application.objects.filter(status='accepted').count(), 20)
+        self.assertFalse(Notification.objects.exists())
+
+        drain_outbox()
+        self.assertEqual(Notification.objects.filter(type='application_update').count(), 20)
+        self.assertEqual(Message.objects.filter(sender=self.employer).count(), 20)
+
+        # Повторный запрос ничего не меняет и не дублирует уведомления
+        self.assertEqual(self.post(ids, 'accepted').json()['updated'], [])
+        drain_outbox()
+        self.assertEqual(Notification.objects.count(), 20)
+
+    def test_foreign_application_rejects_whole_batch(self):
+        """Чужая заявка в списке отменяет изменение всех заявок"""
+        response = self.post([self.applications[0].id, self.foreign.id], 'rejected')
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(Application.objects.filter(status='rejected').exists())
+        self.assertEqual(drain_outbox(), (0, 0))
+
+    def test_validation(self):
+        """Некорректный статус и список id отклоняются"""
+        self.assertEqual(self.post([self.applications[0].id], 'hired').status_code, 400)
+        self.assertEqual(self.post([], 'rejected').status_code, 400)
+        self.assertEqual(self.post(['abc'], 'rejected').status_code, 400)
+
+    def test_web_bulk_form(self):
+        """Массовое изменение статуса со страницы заявок"""
+        ids = [application.id for application in self.applications[:3]]
+        response = self.client.post('/applications/bulk-status/', {'application_ids': ids, 'status': 'rejected'})
+        self.assertRedirects(response, '/applications/')
+        self.assertEqual(Application.objects.filter(status='rejected').count(), 3)
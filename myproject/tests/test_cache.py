@@ -0,0 +1,66 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from ..models import User, Job, Department
+from ..utils.cache import get_jobs_version
+
+class JobsCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.employer = User.objects.create_user(username='employer', password='testpass123', role='employer')
+        self.department = Department.objects.create(name='Кафедра')
+        self.job = Job.objects.create(
+            title='Первая вакансия',
+            description='Описание',
+            department=self.department,
+            employer=self.employer,
+            job_type='internship',
+            deadline=timezone.now() + timezone.timedelta(days=7)
+        )
+
+    def job_queries(self, url, params=None):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, params or {})
+        self.assertEqual(response.status_code, 200)
+        return response, [q for q in queries.captured_queries if 'myproject_job' in q['sql']]
+
+    def test_version_bumped_by_signals(self):
+        """Версия растет при изменении вакансии и отдела"""
+        version = get_jobs_version()
+        self.job.save()
+        self.assertGreater(get_jobs_version(), version)
+        version = get_jobs_version()
+        self.department.delete()
+        self.assertGreater(get_jobs_version(), version)
+
+    def test_home_served_from_cache(self):
+        """Повторный заход на главную не обращается к таблице вакансий"""
+        self.job_queries(reverse('home'))
+        response, queries = self.job_queries(reverse('home'))
+        self.assertEqual(queries, [])
+        self.assertContains(response, 'Первая вакансия')
+
+    def test_job_list_invalidated_on_change(self):
+        """После изменения вакансии список показывает свежие данные"""
+        self.client.login(username='employer', password='testpass123')
+        self.job_queries(reverse('job_list'))
+        response, queries = self.job_queries(reverse('job_list'))
+        self.assertEqual(queries, [])
+
+        self.job.title = 'Переименованная вакансия'
+        self.job.save()
+        response, queries = self.job_queries(reverse('job_list'))
+        self.assertContains(response, 'Переименованная вакансия')
+        self.assertNotContains(response, 'Первая вакансия')
+
+    def test_api_jobs_cached_per_params(self):
+        """Ответ /api/jobs/ кешируется отдельно для каждого набора параметров"""
+        self.job_queries('/api/jobs/')
+        response, queries = self.job_queries('/api/jobs/')
+        self.assertEqual(queries, [])
+        response, queries = self.job_queries('/api/jobs/', {'job_type': 'research'})
+        self.assertEqual(response.json()['results'], [])
@@ -0,0 +1,103 @@
+from django.test import TestCase, Client
+from django.urls import reverse
+from django.utils import timezone
+from ..models import User, Job, Department, Application, Message, Conversation, ConversationParticipant
+from ..utils.application_status import bulk_update_status
+from ..utils.outbox import process_outbox
+
+class ConversationTest(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.employer = User.objects.create_user(username='employer', password='testpass123', role='employer')
+        self.department = Department.objects.create(name='Кафедра')
+        self.job = Job.objects.create(
+            title='Вакансия', description='Описание', department=self.department,
+            employer=self.employer, job_type='internship',
+            deadline=timezone.now() + timezone.timedelta(days=30)
+        )
+        self.students = [
+            User.objects.create_user(username=f'student{i}', password='testpass123', role='student')
+            for i in range(3)
+        ]
+        self.applications = [
+            Application.objects.create(job=self.job, applicant=student, cover_letter='Письмо', status='accepted')
+            for student in self.students
+        ]
+
+    def send(self, sender, application, receiver, content):
+        self.client.login(username=sender.username, password='testpass123')
+        self.client.post('/send-message/', {
+            'application_id': application.id, 'receiver_id': receiver.id, 'content': content
+        })
+
+    def participant(self, user, application):
+        return ConversationParticipant.objects.get(user=user, conversation__application=application)
+
+    def test_counters_follow_messages(self):
+        """Сообщения обновляют последний ответ и счетчики, прочтение их сбрасывает"""
+        application, student = self.applications[0], self.students[0]
+        self.send(student, application, self.employer, 'Первое')
+        self.send(student, application, self.employer, 'Второе')
+        self.send(self.employer, application, student, 'Ответ')
+
+        conversation = Conversation.objects.get()
+        self.assertEqual(conversation.last_message.content, 'Ответ')
+        self.assertEqual(self.participant(self.employer, application).unread_count, 2)
+        self.assertEqual(self.participant(student, application).unread_count, 1)
+
+        self.client.login(username='employer', password='testpass123')
+        self.client.get(reverse('application_detail', args=[application.id]))
+        self.assertEqual(self.participant(self.employer, application).unread_count, 0)
+        self.assertEqual(Message.objects.filter(receiver=self.employer, is_read=False).count(), 0)
+
+        self.client.login(username='student0', password='testpass123')
+        participant = self.participant(student, application)
+        response = self.client.post(f'/api/conversations/{participant.id}/read/')
+        self.assertEqual(response.json(), {'read': 1})
+        self.assertEqual(self.participant(student, application).unread_count, 0)
+
+        # Правка и удаление отдельного сообщения пересчитывают счетчик
+        message = Message.objects.create(sender=self.employer, receiver=student, application=application, content='Еще')
+        self.assertEqual(self.participant(student, application).unread_count, 1)
+        message.delete()
+        self.assertEqual(self.participant(student, application).unread_count, 0)
+
+    def test_outbox_message_creates_conversation(self):
+        """Системное сообщение о принятии заявки (bulk_create) тоже попадает в чат"""
+        application = Application.objects.create(
+            job=Job.objects.create(
+                title='Другая', description='Описание', department=self.department, employer=self.employer,
+                job_type='research', deadline=timezone.now() + timezone.timedelta(days=30)
+            ),
+            applicant=self.students[0], cover_letter='Письмо'
+        )
+        bulk_update_status(self.employer, [application.id], 'accepted')
+        process_outbox()
+        participant = self.participant(self.students[0], application)
+        self.assertEqual(participant.unread_count, 1)
+        self.assertIn('была принята', participant.conversation.last_message.content)
+
+    def test_inbox_is_paginated_single_query(self):
+        """Список чатов - один запрос независимо от числа чатов, последние активные первыми"""
+        for application, student in zip(self.applications, self.students):
+            self.send(student, application, self.employer, f'Сообщение от {student.username}')
+        self.send(self.students[0], self.applications[0], self.employer, 'Снова первый')
+
+        self.client.login(username='employer', password='testpass123')
+        with self.assertNumQueries(3):
+            # сессия, пользователь и один запрос чатов по индексу conversation_inbox_idx
+            response = self.client.get('/api/conversations/', {'page_size': 2})
+        data = response.json()
+        self.assertEqual([chat['partner']['username'] for chat in data['results']], ['student0', 'student2'])
+        self.assertEqual(data['results'][0]['unread_count'], 2)
+        self.assertEqual(data['results'][0]['last_message']['content'], 'Снова первый')
+        response = self.client.get(data['next'])
+        self.assertEqual([chat['partner']['username'] for chat in response.json()['results']], ['student1'])
+
+        response = self.client.get(reverse('messages_list'))
+        self.assertContains(response, 'Снова первый')
+        self.assertEqual([chat.partner.username for chat in response.context['chats']], ['student0', 'student2', 'student1'])
+
+        self.client.login(username='student1', password='testpass123')
+        other = self.participant(self.employer, self.applications[0])
+        self.assertEqual(self.client.get(f'/api/conversations/{other.id}/').status_code, 404)
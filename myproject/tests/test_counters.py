@@ -0,0 +1,88 @@
+from django.core.cache import cache
+from django.test import TestCase, Client, override_settings
+from django.utils import timezone
+from ..models import User, Job, Department, Application, Message, Notification
+from ..utils.application_status import bulk_update_status
+
+class CountersTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.employer = User.objects.create_user(username='employer', password='testpass123', role='employer')
+        self.student = User.objects.create_user(username='student', password='testpass123', role='student')
+        self.job = Job.objects.create(
+            title='Вакансия', description='Описание', department=Department.objects.create(name='Кафедра'),
+            employer=self.employer, job_type='internship',
+            deadline=timezone.now() + timezone.timedelta(days=30)
+        )
+        self.application = Application.objects.create(job=self.job, applicant=self.student, cover_letter='Письмо')
+
+    def fetch(self, etag=None):
+        headers = {'HTTP_IF_NONE_MATCH': etag} if etag else {}
+        return self.client.get('/api/me/counters/', **headers)
+
+    def test_poll_returns_304_without_loading_user(self):
+        """Повторный опрос с тем же ETag отвечает 304, читая только сессию"""
+        self.client.login(username='employer', password='testpass123')
+        response = self.fetch()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Cache-Control'], 'private, no-cache')
+        data = response.json()
+        self.assertEqual(
+            (data['unread_notifications'], data['unread_messages'], data['pending_applications']), (0, 0, 1)
+        )
+        etag = response['ETag']
+
+        with self.assertNumQueries(1):
+            response = self.fetch(etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+
+    @override_settings(SESSION_ENGINE='django.contrib.sessions.backends.cached_db')
+    def test_poll_without_queries_with_cached_sessions(self):
+        """С сессиями в общем кеше опрос с неизменным ETag не обращается к БД"""
+        self.client = Client()
+        self.client.login(username='employer', password='testpass123')
+        etag = self.fetch()['ETag']
+        with self.assertNumQueries(0):
+            response = self.fetch(etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_changes_invalidate_etag(self):
+        """Новое уведомление, сообщение или смена статуса заявки меняют ETag"""
+        self.client.login(username='student', password='testpass123')
+        etag = self.fetch()['ETag']
+
+        Notification.objects.create(user=self.student, title='Тест', content='Текст', type='system')
+        response = self.fetch(etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['unread_notifications'], 1)
+        etag = response['ETag']
+
+        Message.objects.create(sender=self.employer, receiver=self.student, application=self.application, content='Привет')
+        response = self.fetch(etag)
+        self.assertEqual(response.json()['unread_messages'], 1)
+        etag = response['ETag']
+
+        bulk_update_status(self.employer, [self.application.id], 'rejected')
+        response = self.fetch(etag)
+        self.assertEqual(response.json()['pending_applications'], 0)
+
+    def test_requires_valid_session(self):
+        """Без входа - 401; после смены пароля закешированные счетчики не выдаются по старой сессии"""
+        self.assertEqual(self.fetch().status_code, 401)
+
+        self.client.login(username='student', password='testpass123')
+        etag = self.fetch()['ETag']
+        self.student.set_password('newpass123')
+        self.student.save()
+        self.assertEqual(self.fetch(etag).status_code, 401)
+
+    def test_deleted_user(self):
+        """Сессия удаленного пользователя не получает его закешированные счетчики"""
+        # Без заявок и уведомлений: каскад удаления не затрагивает счетчики
+        user = User.objects.create_user(username='guest', password='testpass123', role='student')
+        self.client.login(username='guest', password='testpass123')
+        etag = self.fetch()['ETag']
+        user.delete()
+        self.assertEqual(self.fetch(etag).status_code, 401)
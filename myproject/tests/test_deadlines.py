@@ -0,0 +1,58 @@
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from io import StringIO
+from ..models import User, Job, Department, Application, Favorite, Notification
+from ..utils.deadlines import expire_jobs, send_deadline_reminders
+
+class DeadlineSweeperTest(TestCase):
+    def setUp(self):
+        self.employer = User.objects.create_user(username='employer', password='testpass123', role='employer')
+        self.student = User.objects.create_user(username='student', password='testpass123')
+        self.fan = User.objects.create_user(username='fan', password='testpass123')
+        self.department = Department.objects.create(name='Кафедра')
+        now = timezone.now()
+        self.expired = self.create_job('Истекшая', now - timezone.timedelta(hours=1))
+        self.soon = self.create_job('Скоро дедлайн', now + timezone.timedelta(hours=5))
+        self.later = self.create_job('Нескоро', now + timezone.timedelta(days=10))
+        Application.objects.create(job=self.soon, applicant=self.student, cover_letter='Письмо')
+        Favorite.objects.create(user=self.fan, job=self.soon)
+        Favorite.objects.create(user=self.student, job=self.soon)
+
+    def create_job(self, title, deadline):
+        return Job.objects.create(
+            title=title, description='Описание', department=self.department,
+            employer=self.employer, job_type='internship', deadline=deadline
+        )
+
+    def test_expire_is_idempotent(self):
+        """Истекшие вакансии снимаются один раз, остальные не трогаются"""
+        self.assertEqual(expire_jobs(batch_size=1), 1)
+        self.assertEqual(expire_jobs(), 0)
+        self.assertEqual(
+            set(Job.objects.filter(is_active=True).values_list('title', flat=True)),
+            {'Скоро дедлайн', 'Нескоро'}
+        )
+
+    def test_reminders_sent_once(self):
+        """Напоминания получают соискатели и подписчики, повторно - не отправляются"""
+        self.assertEqual(send_deadline_reminders(hours=24), 2)
+        self.assertEqual(send_deadline_reminders(hours=24), 0)
+        self.assertEqual(
+            set(Notification.objects.filter(type='deadline').values_list('user__username', flat=True)),
+            {'student', 'fan'}
+        )
+
+    def test_reminder_repeats_after_deadline_change(self):
+        """Перенос дедлайна приводит к новому напоминанию"""
+        send_deadline_reminders(hours=24)
+        self.soon.deadline = timezone.now() + timezone.timedelta(hours=10)
+        self.soon.save()
+        self.assertEqual(send_deadline_reminders(hours=24), 2)
+
+    def test_command(self):
+        """Команда выполняет оба прохода"""
+        out = StringIO()
+        call_command('expire_jobs', stdout=out)
+        self.assertIn('Снято с публикации вакансий: 1', out.getvalue())
+        self.assertIn('отправлено напоминаний: 2', out.getvalue())
@@ -0,0 +1,77 @@
+import asyncio
+import json
+
+from asgiref.sync import sync_to_async
+from django.test import TestCase, AsyncClient, override_settings
+from django.utils import timezone
+from ..models import User, Job, Department, Application, Message, Notification
+from ..utils.events import broker
+
+@override_settings(EVENT_STREAM_POLL_INTERVAL=0.05)
+class EventStreamTest(TestCase):
+    def setUp(self):
+        self.client = AsyncClient()
+        self.employer = User.objects.create_user(username='employer', password='testpass123', role='employer')
+        self.student = User.objects.create_user(username='student', password='testpass123', role='student')
+        self.application = Application.objects.create(
+            job=Job.objects.create(
+                title='Вакансия', description='Описание', department=Department.objects.create(name='Кафедра'),
+                employer=self.employer, job_type='internship',
+                deadline=timezone.now() + timezone.timedelta(days=30)
+            ),
+            applicant=self.student, cover_letter='Письмо'
+        )
+        self.old = Notification.objects.create(user=self.student, title='Старое', content='Текст', type='system')
+
+    async def next_event(self, stream):
+        """Следующее событие потока, пропуская пинги"""
+        while True:
+            chunk = await asyncio.wait_for(anext(stream), 5)
+            chunk = chunk.decode() if isinstance(chunk, bytes) else chunk
+            if chunk.startswith('id:'):
+                fields = dict(line.split(': ', 1) for line in chunk.strip().split('\n'))
+                return fields['id'], fields['event'], json.loads(fields['data'])
+
+    async def test_stream_and_resume(self):
+        """Поток отдает только новые события, а с Last-Event-ID - пропущенные"""
+        await self.client.aforce_login(self.student)
+        response = await self.client.get('/api/events/')
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        stream = aiter(response.streaming_content)
+
+        # Записи внутри тестовой транзакции не публикуются - их находит опрос БД
+        notification = await Notification.objects.acreate(user=self.student, title='Новое', content='Текст', type='system')
+        event_id, kind, data = await self.next_event(stream)
+        self.assertEqual((kind, data['title']), ('notification', 'Новое'))
+
+        await sync_to_async(Message.objects.create)(
+            sender=self.employer, receiver=self.student, application=self.application, content='Привет'
+        )
+        last_id, kind, data = await self.next_event(stream)
+        self.assertEqual((kind, data['content'], data['application']), ('message', 'Привет', self.application.id))
+        self.assertEqual(last_id.split('.')[0], str(notification.id))
+
+        # Переподключение: старое уведомление не повторяется, пропущенное приходит
+        await Notification.objects.acreate(user=self.student, title='Пропущенное', content='Текст', type='system')
+        response = await self.client.get('/api/events/', headers={'Last-Event-ID': event_id})
+        stream = aiter(response.streaming_content)
+        _, kind, data = await self.next_event(stream)
+        self.assertEqual((kind, data['content']), ('message', 'Привет'))
+        _, kind, data = await self.next_event(stream)
+        self.assertEqual(data['title'], 'Пропущенное')
+
+    async def test_requires_login(self):
+        """Без входа - 401"""
+        response = await self.client.get('/api/events/')
+        self.assertEqual(response.status_code, 401)
+
+    async def test_publish_wakes_subscriber(self):
+        """Публикация будит только подписчиков своего пользователя"""
+        own, other = broker.subscribe(self.student.id), broker.subscribe(self.employer.id)
+        try:
+            await sync_to_async(broker.publish)([self.student.id])
+            self.assertTrue(await own.wait(1))
+            self.assertFalse(await other.wait(0.01))
+        finally:
+            own.close()
+            other.close()
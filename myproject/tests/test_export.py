@@ -0,0 +1,168 @@
+import csv
+import io
+import json
+import zipfile
+from xml.etree import ElementTree
+from django.test import TestCase, Client
+from django.utils import timezone
+from ..models import User, Job, Department, Application, Skill, JobSkill, UserSkill
+
+class StreamingExportTest(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.employer = User.objects.create_user(username='employer', password='testpass123', role='employer')
+        self.department = Department.objects.create(name='Кафедра')
+        for i in range(3):
+            job = Job.objects.create(
+                title=f'Вакансия {i}',
+                description='Описание',
+                department=self.department,
+                employer=self.employer,
+                job_type='internship',
+                deadline=timezone.now() + timezone.timedelta(days=7)
+            )
+            student = User.objects.create_user(username=f'student{i}', password='testpass123')
+            Application.objects.create(job=job, applicant=student, cover_letter='Письмо')
+
+    def read(self, response):
+        self.assertTrue(response.streaming)
+        # Под WSGI тело - синхронный итератор, иначе Django собрал бы его целиком
+        self.assertFalse(response.is_async)
+        return b''.join(response.streaming_content).decode()
+
+    async def aread(self, response):
+        self.assertTrue(response.streaming)
+        self.assertTrue(response.is_async)
+        return b''.join([chunk async for chunk in response.streaming_content]).decode()
+
+    async def test_asgi_export_streams_async_iterator(self):
+        """Под ASGI выгрузка отдается асинхронным итератором, порции строк читаются в потоке запроса"""
+        response = await self.async_client.get('/api/jobs/', {'export': 'ndjson'})
+        self.assertEqual(response.status_code, 200)
+        rows = [json.loads(line) for line in (await self.aread(response)).splitlines()]
+        self.assertEqual(len(rows), 3)
+
+        await self.async_client.aforce_login(self.employer)
+        response = await self.async_client.get('/api/applications/', {'export': 'json'})
+        self.assertEqual(len(json.loads(await self.aread(response))), 3)
+
+    def test_jobs_ndjson(self):
+        """Выгрузка вакансий в NDJSON: одна запись на строку"""
+        response = self.client.get('/api/jobs/', {'export': 'ndjson'})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('application/x-ndjson'))
+        rows = [json.loads(line) for line in self.read(response).splitlines()]
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(rows[0]['department']['name'], 'Кафедра')
+
+    def test_applications_json_array(self):
+        """Выгрузка заявок потоковым JSON-массивом"""
+        self.client.login(username='employer', password='testpass123')
+        response = self.client.get('/api/applications/', {'export': 'json'})
+        self.assertEqual(response.status_code, 200)
+        rows = json.loads(self.read(response))
+        self.assertEqual(len(rows), 3)
+        self.assertIn('applicant', rows[0])
+
+    def test_unknown_format(self):
+        """Неизвестный формат выгрузки отклоняется"""
+        response = self.client.get('/api/jobs/', {'export': 'xml'})
+        self.assertEqual(response.status_code, 400)
+
+
+class TabularExportTest(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.employer = User.objects.create_user(username='employer', password='testpass123', role='employer')
+        self.job = Job.objects.create(
+            title='Вакансия', description='Описание', department=Department.objects.create(name='Кафедра'),
+            employer=self.employer, job_type='internship',
+            deadline=timezone.now() + timezone.timedelta(days=7)
+        )
+        python = Skill.objects.create(name='Python')
+        sql = Skill.objects.create(name='SQL')
+        JobSkill.objects.create(job=self.job, skill=python, level='intermediate')
+        JobSkill.objects.create(job=self.job, skill=sql, level='beginner')
+        JobSkill.objects.create(job=self.job, skill=Skill.objects.create(name='Git'), level='beginner', is_required=False)
+
+        strong = User.objects.create_user(username='strong', password='testpass123', first_name='Анна')
+        UserSkill.objects.create(user=strong, skill=python, level='advanced')
+        UserSkill.objects.create(user=strong, skill=sql, level='beginner')
+        weak = User.objects.create_user(username='=HYPERLINK("x")', password='testpass123')
+        UserSkill.objects.create(user=weak, skill=python, level='beginner')
+        Application.objects.create(job=self.job, applicant=strong, cover_letter='Письмо', status='accepted')
+        Application.objects.create(job=self.job, applicant=weak, cover_letter='Письмо')
+        self.client.login(username='employer', password='testpass123')
+
+    def read_csv(self, response):
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        content = b''.join(response.streaming_content).decode('utf-8-sig')
+        return list(csv.reader(io.StringIO(content)))
+
+    async def test_asgi_tabular_export(self):
+        """CSV и XLSX под ASGI отдаются асинхронным итератором"""
+        await self.async_client.aforce_login(self.employer)
+        response = await self.async_client.get('/api/applications/', {'export': 'csv'})
+        self.assertTrue(response.is_async)
+        content = b''.join([chunk async for chunk in response.streaming_content]).decode('utf-8-sig')
+        self.assertEqual(len(list(csv.reader(io.StringIO(content)))), 3)
+
+        response = await self.async_client.get(f'/api/jobs/{self.job.id}/applications/', {'export': 'xlsx'})
+        self.assertTrue(response.is_async)
+        archive = zipfile.ZipFile(io.BytesIO(b''.join([chunk async for chunk in response.streaming_content])))
+        self.assertIsNone(archive.testzip())
+
+    def test_applications_csv(self):
+        """CSV с данными соискателя, статусом и совпадением обязательных навыков"""
+        response = self.client.get('/api/applications/', {'export': 'csv'})
+        self.assertTrue(response['Content-Type'].startswith('text/csv'))
+        self.assertIn('attachment; filename="applications.csv"', response['Content-Disposition'])
+        header, strong, weak = self.read_csv(response)
+        self.assertEqual(header[0], 'ID заявки')
+        self.assertEqual(strong[2:4], ['strong', 'Анна'])
+        self.assertEqual(strong[6], 'Принята')
+        self.assertEqual(strong[9:], ['2', '2', '100'])
+        # Уровня beginner недостаточно для Python (intermediate)
+        self.assertEqual(weak[9:], ['2', '0', '0'])
+        # Значение, похожее на формулу, экранировано
+        self.assertEqual(weak[2], "'=HYPERLINK(\"x\")")
+
+    def test_job_applications_csv(self):
+        """Выгрузка заявок одной вакансии"""
+        response = self.client.get(f'/api/jobs/{self.job.id}/applications/', {'export': 'csv'})
+        self.assertIn(f'job_{self.job.id}_applications.csv', response['Content-Disposition'])
+        self.assertEqual(len(self.read_csv(response)), 3)
+
+    def test_applications_xlsx(self):
+        """XLSX пишется потоком и является корректным zip-архивом книги"""
+        response = self.client.get('/api/applications/', {'export': 'xlsx'})
+        self.assertEqual(response.status_code, 200)
+        archive = zipfile.ZipFile(io.BytesIO(b''.join(response.streaming_content)))
+        self.assertIsNone(archive.testzip())
+        sheet = ElementTree.fromstring(archive.read('xl/worksheets/sheet1.xml'))
+        namespace = {'s': 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'}
+        rows = sheet.findall('s:sheetData/s:row', namespace)
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(rows[1].find('s:c/s:v', namespace).text, str(Application.objects.order_by('id').first().id))
+        self.assertIn('Заявки', archive.read('xl/workbook.xml').decode())
+
+    def test_export_query_count(self):
+        """Выгрузка выполняется одним запросом независимо от числа заявок"""
+        response = self.client.get('/api/applications/', {'export': 'csv'})
+        with self.assertNumQueries(1):
+            b''.join(response.streaming_content)
+
+    def test_tabular_format_not_supported_for_jobs(self):
+        """Для списка вакансий табличные форматы недоступны"""
+        response = self.client.get('/api/jobs/', {'export': 'csv'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('Допустимые значения: ndjson, json', response.content.decode())
+        self.assertNotIn('xlsx', response.content.decode())
+
+    def test_unknown_format_lists_endpoint_formats(self):
+        """Ошибка перечисляет форматы именно этого эндпоинта, включая табличные"""
+        for url in ('/api/applications/', f'/api/jobs/{self.job.id}/applications/'):
+            response = self.client.get(url, {'export': 'xml'})
+            self.assertEqual(response.status_code, 400)
+            self.assertIn('Допустимые значения: ndjson, json, csv, xlsx', response.content.decode())
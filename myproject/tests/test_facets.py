@@ -0,0 +1,66 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, Client
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from ..models import User, Job, Department
+from ..utils.facets import JobFacets
+from ..utils.search import search_jobs
+
+class JobFacetsTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.employer = User.objects.create_user(username='employer', password='testpass123', role='employer')
+        self.cs = Department.objects.create(name='Информатика')
+        self.math = Department.objects.create(name='Математика')
+        deadline = timezone.now() + timezone.timedelta(days=7)
+        for department, job_type, salary in [
+            (self.cs, 'internship', 25000),
+            (self.cs, 'internship', None),
+            (self.cs, 'research', 70000),
+            (self.math, 'teaching', 120000),
+        ]:
+            Job.objects.create(
+                title='Вакансия', description='Описание', department=department,
+                employer=self.employer, job_type=job_type, salary=salary, deadline=deadline
+            )
+
+    def counts(self, facets, name):
+        return {key: value for key, value in JobFacets.counts(facets, name).items() if value}
+
+    def test_single_grouped_query(self):
+        """Все фасеты считаются одним запросом и затем берутся из кеша"""
+        engine = JobFacets(Job.objects.all())
+        with CaptureQueriesContext(connection) as queries:
+            facets = engine.get()
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(self.counts(facets, 'job_type'), {'internship': 2, 'research': 1, 'teaching': 1})
+        self.assertEqual(self.counts(facets, 'salary'), {
+            'lt_30000': 1, 'not_specified': 1, '60000_100000': 1, 'gte_100000': 1
+        })
+        with CaptureQueriesContext(connection) as queries:
+            JobFacets(Job.objects.all()).get()
+        self.assertEqual(len(queries), 0)
+
+    def test_selected_facet_excludes_itself(self):
+        """Фильтр по отделу не сужает счетчики отделов, но сужает остальные"""
+        facets = JobFacets(Job.objects.all(), {'department': self.cs.id}).get()
+        self.assertEqual(self.counts(facets, 'department'), {str(self.cs.id): 3, str(self.math.id): 1})
+        self.assertEqual(self.counts(facets, 'job_type'), {'internship': 2, 'research': 1})
+
+    def test_facets_with_search(self):
+        """Фасеты считаются поверх результатов поиска"""
+        facets = JobFacets(search_jobs(Job.objects.all(), 'несуществующее')).get()
+        self.assertEqual(self.counts(facets, 'job_type'), {})
+
+    def test_api_facets_block(self):
+        """/api/jobs/ возвращает блок facets"""
+        response = self.client.get('/api/jobs/', {'job_type': 'internship'})
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(len(data['results']), 2)
+        self.assertEqual(
+            {item['value']: item['count'] for item in data['facets']['department']},
+            {self.cs.id: 2}
+        )
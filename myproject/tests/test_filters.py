@@ -0,0 +1,64 @@
+from django.core.cache import cache
+from django.test import TestCase, Client
+from django.utils import timezone
+from ..api.filters import JobFilterSet
+from ..models import User, Job, Department, Skill, JobSkill
+
+class JobFilterTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.employer = User.objects.create_user(username='employer', password='testpass123', role='employer')
+        self.other = User.objects.create_user(username='other', password='testpass123', role='employer')
+        self.department = Department.objects.create(name='Кафедра')
+        self.python = Skill.objects.create(name='Python')
+        now = timezone.now()
+        self.cheap = self.create_job('Лаборант', 20000, now + timezone.timedelta(days=3))
+        self.middle = self.create_job('Ассистент', 50000, now + timezone.timedelta(days=1), employer=self.other)
+        self.rich = self.create_job('Исследователь', 120000, now + timezone.timedelta(days=20))
+        self.closed = self.create_job('Закрытая', 50000, now + timezone.timedelta(days=2), is_active=False)
+        JobSkill.objects.create(job=self.rich, skill=self.python, level='advanced', is_required=True)
+        JobSkill.objects.create(job=self.middle, skill=self.python, level='beginner', is_required=False)
+
+    def create_job(self, title, salary, deadline, employer=None, is_active=True):
+        return Job.objects.create(
+            title=title, description='Описание', department=self.department,
+            employer=employer or self.employer, job_type='internship',
+            salary=salary, deadline=deadline, is_active=is_active
+        )
+
+    def titles(self, query):
+        response = self.client.get(f'/api/jobs/?{query}')
+        self.assertEqual(response.status_code, 200, response.content)
+        return [item['title'] for item in response.json()['results']]
+
+    def test_filters(self):
+        """Фильтры комбинируются в одном запросе"""
+        self.assertEqual(self.titles('salary_min=30000&salary_max=100000&is_active=true'), ['Ассистент'])
+        self.assertEqual(self.titles(f'employer={self.other.id}'), ['Ассистент'])
+        self.assertEqual(self.titles(f'skills={self.python.id}'), ['Исследователь'])
+        self.assertEqual(self.titles('is_active=false'), ['Закрытая'])
+        deadline_before = (timezone.now() + timezone.timedelta(days=2, hours=12)).date().isoformat()
+        self.assertEqual(set(self.titles(f'deadline_before={deadline_before}&is_active=1')), {'Ассистент'})
+
+    def test_ordering(self):
+        """Сортировка по индексированному полю с обходом страниц курсором"""
+        self.assertEqual(
+            self.titles('ordering=deadline'),
+            ['Ассистент', 'Закрытая', 'Лаборант', 'Исследователь']
+        )
+        response = self.client.get('/api/jobs/?ordering=-deadline&page_size=2')
+        data = response.json()
+        self.assertEqual([item['title'] for item in data['results']], ['Исследователь', 'Лаборант'])
+        data = self.client.get(data['next']).json()
+        self.assertEqual([item['title'] for item in data['results']], ['Закрытая', 'Ассистент'])
+
+    def test_rejects_invalid_parameters(self):
+        """Неиндексированная сортировка и некорректные значения отклоняются"""
+        for query in ('ordering=title', 'ordering=salary', 'salary_min=abc', 'deadline_after=вчера', 'department=x'):
+            with self.subTest(query=query):
+                self.assertEqual(self.client.get(f'/api/jobs/?{query}').status_code, 400)
+
+    def test_ordering_fields_are_indexed(self):
+        """Все разрешенные сортировки опираются на индекс"""
+        self.assertLessEqual(set(JobFilterSet.ordering_fields), JobFilterSet.indexed_ordering_fields())
@@ -0,0 +1,130 @@
+import shutil
+import tempfile
+from unittest import mock
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, Client, override_settings
+from django.utils import timezone
+from ..models import User, Job, Department, Application, Message, ResumeBlob
+from ..api.idempotency import _cache_key
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class IdempotencyKeyTest(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.employer = User.objects.create_user(username='employer', password='testpass123', role='employer')
+        self.student = User.objects.create_user(username='student', password='testpass123', role='student')
+        self.job = Job.objects.create(
+            title='Вакансия', description='Описание', department=Department.objects.create(name='Кафедра'),
+            employer=self.employer, job_type='internship',
+            deadline=timezone.now() + timezone.timedelta(days=30)
+        )
+        self.client.login(username='student', password='testpass123')
+
+    def send_message(self, key, content='Здравствуйте'):
+        return self.client.post(
+            '/api/messages/', {'receiver_id': self.employer.id, 'content': content},
+            content_type='application/json', HTTP_IDEMPOTENCY_KEY=key
+        )
+
+    def test_retry_replays_first_response(self):
+        """Повтор с тем же ключом не создает второе сообщение"""
+        first = self.send_message('key-1')
+        self.assertEqual(first.status_code, 201)
+        with self.assertNumQueries(2):
+            # Только загрузка сессии и пользователя, запись не выполняется
+            retry = self.send_message('key-1')
+        self.assertEqual(retry.status_code, 201)
+        self.assertEqual(retry.json(), first.json())
+        self.assertEqual(retry['Idempotent-Replayed'], 'true')
+        self.assertEqual(Message.objects.count(), 1)
+
+        self.assertEqual(self.send_message('key-2').status_code, 201)
+        self.assertEqual(Message.objects.count(), 2)
+
+    def test_without_key(self):
+        """Без заголовка поведение прежнее"""
+        self.send_message('')
+        self.send_message('')
+        self.assertEqual(Message.objects.count(), 2)
+
+    def test_key_scoped_to_user(self):
+        """Один и тот же ключ у разных пользователей не пересекается"""
+        self.send_message('shared')
+        self.client.login(username='employer', password='testpass123')
+        response = self.client.post(
+            '/api/messages/', {'receiver_id': self.student.id, 'content': 'Ответ'},
+            content_type='application/json', HTTP_IDEMPOTENCY_KEY='shared'
+        )
+        self.assertNotIn('Idempotent-Replayed', response)
+        self.assertEqual(Message.objects.count(), 2)
+
+    def test_reused_key_and_in_progress(self):
+        """Ключ другого запроса - 422, незавершенный запрос - 409"""
+        self.send_message('key-1')
+        response = self.client.post(
+            '/api/reviews/', {'job': self.job.id, 'rating': 5, 'comment': 'Отлично'},
+            content_type='application/json', HTTP_IDEMPOTENCY_KEY='key-1'
+        )
+        self.assertEqual(response.status_code, 422)
+
+        # Первый запрос с key-2 еще выполняется
+        self.send_message('key-2')
+        stored = cache.get(_cache_key(self.student, 'key-2'))
+        cache.set(_cache_key(self.student, 'key-2'), {'fingerprint': stored['fingerprint'], 'status': None})
+        self.assertEqual(self.send_message('key-2').status_code, 409)
+
+    def test_reused_key_with_other_body(self):
+        """Тот же ключ с другим телом запроса - 422, сообщение не создается"""
+        self.assertEqual(self.send_message('key-1').status_code, 201)
+        response = self.send_message('key-1', content='Другой текст')
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(Message.objects.count(), 1)
+
+    def test_failed_request_can_be_retried(self):
+        """Ошибка валидации не запоминается: исправленный запрос с тем же ключом выполняется"""
+        response = self.client.post(
+            '/api/messages/', {'content': 'Без получателя'},
+            content_type='application/json', HTTP_IDEMPOTENCY_KEY='key-1'
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.send_message('key-1').status_code, 201)
+
+    def test_application_retry_skips_upload(self):
+        """Повтор подачи заявки не сохраняет файл и не проверяет дубликат заново"""
+        def apply():
+            return self.client.post('/api/applications/', {
+                'job': self.job.id,
+                'cover_letter': 'Письмо',
+                'resume': SimpleUploadedFile('cv.pdf', b'%PDF-1.4 resume', content_type='application/pdf'),
+            }, HTTP_IDEMPOTENCY_KEY='apply-1')
+
+        self.assertEqual(apply().status_code, 201)
+        with mock.patch('myproject.api.viewsets.resume_upload') as resume_upload:
+            retry = apply()
+        self.assertEqual(retry.status_code, 201)
+        resume_upload.assert_not_called()
+        self.assertEqual(Application.objects.count(), 1)
+        self.assertEqual(ResumeBlob.objects.get().ref_count, 1)
+
+    def test_application_retry_with_other_resume(self):
+        """Повтор подачи заявки с другим файлом резюме - 422"""
+        def apply(content):
+            return self.client.post('/api/applications/', {
+                'job': self.job.id,
+                'cover_letter': 'Письмо',
+                'resume': SimpleUploadedFile('cv.pdf', content, content_type='application/pdf'),
+            }, HTTP_IDEMPOTENCY_KEY='apply-1')
+
+        self.assertEqual(apply(b'%PDF-1.4 resume').status_code, 201)
+        self.assertEqual(apply(b'%PDF-1.4 resume').status_code, 201)
+        self.assertEqual(apply(b'%PDF-1.4 other').status_code, 422)
+        self.assertEqual(ResumeBlob.objects.get().ref_count, 1)
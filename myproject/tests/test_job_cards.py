@@ -0,0 +1,126 @@
+from unittest import mock
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from ..models import User, Job, JobCard, Department, Skill, JobSkill, Application, Favorite, Review
+from ..utils import job_cards
+from ..utils.deadlines import expire_jobs
+
+class JobCardTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.employer = User.objects.create_user(
+            username='employer', password='testpass123', role='employer', first_name='Иван', last_name='Петров'
+        )
+        self.student = User.objects.create_user(username='student', password='testpass123', role='student')
+        self.department = Department.objects.create(name='Кафедра')
+        self.skill = Skill.objects.create(name='Python', category='technical')
+        self.job = Job.objects.create(
+            title='Вакансия', description='Описание', department=self.department,
+            employer=self.employer, job_type='internship',
+            deadline=timezone.now() + timezone.timedelta(days=7)
+        )
+        JobSkill.objects.create(job=self.job, skill=self.skill, level='advanced')
+
+    def card(self):
+        return JobCard.objects.get(pk=self.job.pk)
+
+    def test_card_follows_changes(self):
+        """Карточка обновляется при изменении вакансии, отдела, работодателя, навыков и счетчиков"""
+        card = self.card()
+        self.assertEqual((card.title, card.department_name, card.employer_name), ('Вакансия', 'Кафедра', 'Иван Петров'))
+        self.assertEqual(card.skills, [{'name': 'Python', 'level': 'advanced', 'is_required': True}])
+
+        self.job.title = 'Новое название'
+        self.job.save()
+        self.department.name = 'Новая кафедра'
+        self.department.save()
+        self.employer.last_name = 'Сидоров'
+        self.employer.save()
+        self.skill.name = 'Python 3'
+        self.skill.save()
+        card = self.card()
+        self.assertEqual((card.title, card.department_name, card.employer_name), ('Новое название', 'Новая кафедра', 'Иван Сидоров'))
+        self.assertEqual(card.skills[0]['name'], 'Python 3')
+
+        application = Application.objects.create(job=self.job, applicant=self.student, cover_letter='Письмо')
+        favorite = Favorite.objects.create(user=self.student, job=self.job)
+        Review.objects.create(job=self.job, reviewer=self.student, rating=5, comment='Отлично')
+        Review.objects.create(job=self.job, reviewer=self.employer, rating=4, comment='Хорошо')
+        card = self.card()
+        self.assertEqual((card.applications_count, card.favorites_count, card.reviews_count), (1, 1, 2))
+        self.assertEqual(card.avg_rating, 4.5)
+
+        application.delete()
+        favorite.delete()
+        JobSkill.objects.all().delete()
+        card = self.card()
+        self.assertEqual((card.applications_count, card.favorites_count, card.skills), (0, 0, []))
+
+        expire_jobs(now=timezone.now() + timezone.timedelta(days=8))
+        self.assertFalse(self.card().is_active)
+
+        self.job.delete()
+        self.assertFalse(JobCard.objects.exists())
+
+    def test_listings_read_only_cards(self):
+        """Списки вакансий читают только таблицу карточек"""
+        Favorite.objects.create(user=self.student, job=self.job)
+        self.client.login(username='student', password='testpass123')
+        for url in (reverse('home'), reverse('job_list'), reverse('favorites')):
+            cache.clear()
+            self.client.login(username='student', password='testpass123')
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url)
+            self.assertContains(response, 'Вакансия')
+            self.assertContains(response, 'Кафедра')
+            for query in queries.captured_queries:
+                if 'myproject_jobcard' in query['sql']:
+                    self.assertNotIn('JOIN', query['sql'], url)
+                else:
+                    self.assertNotIn('"myproject_job"', query['sql'], url)
+
+        response = self.client.get(reverse('job_list'), {'q': 'ваканс'})
+        self.assertContains(response, 'Вакансия')
+        response = self.client.get(reverse('api_favorites'))
+        self.assertEqual([job['department'] for job in response.json()['jobs']], ['Кафедра'])
+        response = self.client.get('/api/jobs/')
+        self.assertEqual(response.json()['results'][0]['card']['skills'][0]['name'], 'Python')
+
+    def test_rebuild_command(self):
+        """Команда восстанавливает испорченные и потерянные карточки"""
+        JobCard.objects.update(title='Испорчено', applications_count=10)
+        Application.objects.create(job=self.job, applicant=self.student, cover_letter='Письмо')
+        call_command('rebuild_job_cards', stdout=open('/dev/null', 'w'))
+        card = self.card()
+        self.assertEqual((card.title, card.applications_count), ('Вакансия', 1))
+
+        JobCard.objects.all().delete()
+        call_command('rebuild_job_cards', stdout=open('/dev/null', 'w'))
+        self.assertEqual(self.card().skills[0]['level'], 'advanced')
+
+    def test_edit_rebuilds_card_once(self):
+        """Сохранение вакансии с заменой всех навыков пересобирает карточку один раз"""
+        skills = [Skill.objects.create(name=name) for name in ('SQL', 'Django', 'Git')]
+        self.client.login(username='employer', password='testpass123')
+        with mock.patch.object(job_cards, 'build_job_cards', wraps=job_cards.build_job_cards) as build:
+            response = self.client.post(reverse('job_edit', args=[self.job.id]), {
+                'title': 'Новое название', 'description': 'Описание', 'job_type': 'internship',
+                'department_id': self.department.id, 'deadline': self.job.deadline.date().isoformat(),
+                'skill_ids[]': [skill.id for skill in skills],
+                'skill_levels[]': ['beginner'] * 3,
+                'skill_required[]': ['true', 'false', 'true'],
+            })
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(build.call_count, 1)
+        card = self.card()
+        self.assertEqual(card.title, 'Новое название')
+        self.assertEqual(
+            sorted((skill['name'], skill['is_required']) for skill in card.skills),
+            [('Django', False), ('Git', True), ('SQL', True)]
+        )
@@ -0,0 +1,60 @@
+from django.test import TestCase, Client
+from django.utils import timezone
+from ..models import User, Job, Department, Application, Favorite, Review
+
+class EmployerDashboardTest(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.employer = User.objects.create_user(username='employer', password='testpass123', role='employer')
+        self.department = Department.objects.create(name='Кафедра')
+        self.jobs = [
+            Job.objects.create(
+                title=f'Вакансия {i}', description='Описание', department=self.department,
+                employer=self.employer, job_type='internship',
+                deadline=timezone.now() + timezone.timedelta(days=30)
+            )
+            for i in range(3)
+        ]
+        job = self.jobs[0]
+        statuses = ['pending', 'pending', 'accepted', 'rejected']
+        for i, status in enumerate(statuses):
+            student = User.objects.create_user(username=f'student{i}', password='testpass123')
+            Application.objects.create(job=job, applicant=student, cover_letter='Письмо', status=status)
+            Favorite.objects.create(user=student, job=job)
+        for rating in (4, 5):
+            Review.objects.create(job=job, reviewer=self.employer, rating=rating, comment='Отзыв')
+        self.client.login(username='employer', password='testpass123')
+
+    def test_stats_in_one_query(self):
+        """Статистика страницы считается одним запросом без размножения строк"""
+        with self.assertNumQueries(3):
+            # сессия, пользователь и запрос статистики
+            response = self.client.get('/api/jobs/mine/stats/')
+        self.assertEqual(response.status_code, 200)
+        stats = {item['id']: item for item in response.json()['results']}
+        first = stats[self.jobs[0].id]
+        self.assertEqual(first['applications'], {'total': 4, 'pending': 2, 'accepted': 1, 'rejected': 1, 'withdrawn': 0})
+        self.assertEqual(first['favorites'], 4)
+        self.assertEqual(first['avg_rating'], 4.5)
+        self.assertEqual(stats[self.jobs[1].id]['applications']['total'], 0)
+        self.assertIsNone(stats[self.jobs[1].id]['avg_rating'])
+
+    def test_students_forbidden(self):
+        """Статистика доступна только работодателям"""
+        self.client.login(username='student0', password='testpass123')
+        self.assertEqual(self.client.get('/api/jobs/mine/stats/').status_code, 403)
+        self.assertEqual(self.client.get('/profile/dashboard/').status_code, 403)
+
+    def test_dashboard_page(self):
+        """Количество запросов страницы не зависит от числа вакансий"""
+        response = self.client.get('/profile/dashboard/')
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Вакансия 0')
+        for i in range(10):
+            Job.objects.create(
+                title=f'Еще {i}', description='Описание', department=self.department,
+                employer=self.employer, job_type='internship', deadline=timezone.now()
+            )
+        with self.assertNumQueries(5):
+            # сессия, пользователь, профиль в шапке, COUNT для пагинации и запрос статистики
+            self.client.get('/profile/dashboard/')
@@ -0,0 +1,67 @@
+from django.test import TestCase, Client
+from django.utils import timezone
+from ..models import User, Notification
+
+class BulkNotificationTest(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create_user(username='student', password='testpass123', role='student')
+        self.other = User.objects.create_user(username='other', password='testpass123', role='student')
+        self.notifications = [
+            Notification.objects.create(user=self.user, title=f'Уведомление {i}', content='Текст', type='system')
+            for i in range(5)
+        ]
+        self.foreign = Notification.objects.create(user=self.other, title='Чужое', content='Текст', type='system')
+        self.client.login(username='student', password='testpass123')
+
+    def unread(self, user=None):
+        return Notification.objects.filter(user=user or self.user, is_read=False).count()
+
+    def post(self, action, data=None):
+        return self.client.post(f'/api/notifications/{action}/', data or {}, content_type='application/json')
+
+    def test_mark_read_by_ids_and_before(self):
+        """Выбранные уведомления помечаются одним UPDATE, чужие id пропускаются"""
+        ids = [self.notifications[0].id, self.notifications[1].id, self.foreign.id]
+        with self.assertNumQueries(3):
+            # сессия, пользователь и UPDATE
+            response = self.post('mark_read', {'ids': ids})
+        self.assertEqual(response.json(), {'updated': 2})
+        self.assertEqual((self.unread(), self.unread(self.other)), (3, 1))
+
+        Notification.objects.filter(pk=self.notifications[4].pk).update(
+            created_at=timezone.now() + timezone.timedelta(hours=1)
+        )
+        response = self.post('mark_read', {'before': timezone.now().isoformat()})
+        self.assertEqual(response.json(), {'updated': 2})
+        self.assertEqual(self.unread(), 1)
+
+        self.assertEqual(self.post('mark_read', {}).status_code, 400)
+        self.assertEqual(self.post('mark_read', {'ids': ['x']}).status_code, 400)
+        self.assertEqual(self.post('mark_read', {'before': 'вчера'}).status_code, 400)
+
+    def test_mark_all_read(self):
+        """Все уведомления пользователя - один UPDATE, уведомления других не меняются"""
+        with self.assertNumQueries(3):
+            response = self.post('mark_all_read')
+        self.assertEqual(response.json(), {'updated': 5})
+        self.assertEqual((self.unread(), self.unread(self.other)), (0, 1))
+        self.assertEqual(self.post('mark_all_read').json(), {'updated': 0})
+
+        # Одиночная отметка сохраняет только is_read
+        notification = Notification.objects.create(user=self.user, title='Новое', content='Текст', type='system')
+        response = self.post(f'{notification.id}/mark_as_read')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.unread(), 0)
+
+    def test_bulk_delete(self):
+        """Удаление - один DELETE без предварительной выборки строк"""
+        ids = [self.notifications[0].id, self.foreign.id]
+        with self.assertNumQueries(3):
+            response = self.post('bulk-delete', {'ids': ids})
+        self.assertEqual(response.json(), {'deleted': 1})
+        self.assertTrue(Notification.objects.filter(pk=self.foreign.pk).exists())
+
+        response = self.post('bulk-delete', {'before': timezone.now().isoformat()})
+        self.assertEqual(response.json(), {'deleted': 4})
+        self.assertFalse(Notification.objects.filter(user=self.user).exists())
@@ -0,0 +1,115 @@
+from unittest import mock
+from django.core.management import call_command, CommandError
+from django.test import TestCase, Client
+from django.utils import timezone
+from io import StringIO
+from ..models import User, Job, Department, Application, Notification, OutboxEvent
+from ..utils import outbox
+from ..utils.outbox import enqueue, process_outbox, drain_outbox, MAX_ATTEMPTS
+
+class OutboxTest(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.employer = User.objects.create_user(username='employer', password='testpass123', role='employer')
+        self.student = User.objects.create_user(username='student', password='testpass123')
+        department = Department.objects.create(name='Кафедра')
+        job = Job.objects.create(
+            title='Вакансия', description='Описание', department=department, employer=self.employer,
+            job_type='internship', deadline=timezone.now() + timezone.timedelta(days=30)
+        )
+        self.application = Application.objects.create(
+            job=job, applicant=self.student, cover_letter='Письмо', status='accepted'
+        )
+
+    def test_send_message_defers_notification(self):
+        """Запрос записывает только сообщение и событие, уведомление создает обработчик"""
+        self.client.login(username='student', password='testpass123')
+        self.client.post('/send-message/', {
+            'application_id': self.application.id, 'receiver_id': self.employer.id, 'content': 'Здравствуйте'
+        })
+        self.assertFalse(Notification.objects.exists())
+        self.assertEqual(OutboxEvent.objects.filter(topic='message_sent').count(), 1)
+
+        out = StringIO()
+        call_command('process_outbox', stdout=out)
+        self.assertIn('Обработано событий: 1', out.getvalue())
+        notification = Notification.objects.get()
+        self.assertEqual(notification.user, self.employer)
+        self.assertIn('student', notification.content)
+        self.assertIsNotNone(OutboxEvent.objects.get().processed_at)
+
+    def test_batch_is_processed_with_bulk_create(self):
+        """Пачка событий одной темы обрабатывается фиксированным числом запросов"""
+        for _ in range(30):
+            enqueue('application_status', {
+                'application_ids': [self.application.id], 'status': 'rejected', 'employer_id': self.employer.id
+            })
+        with self.assertNumQueries(8):
+            # выборка и захват пачки, чтение событий, транзакция с чтением заявок,
+            # вставкой уведомлений и отметкой об обработке
+            self.assertEqual(process_outbox(), (30, 0))
+        self.assertEqual(Notification.objects.count(), 30)
+
+    def test_failed_event_is_retried(self):
+        """Ошибочное событие не мешает остальным и повторяется с задержкой"""
+        enqueue('message_sent', {'message_id': 1})
+        enqueue('message_sent', {})
+        with self.assertLogs('myproject.utils.outbox', 'WARNING'):
+            self.assertEqual(process_outbox(), (1, 1))
+
+        broken = OutboxEvent.objects.get(processed_at__isnull=True)
+        self.assertEqual(broken.attempts, 1)
+        self.assertIn('KeyError', broken.last_error)
+        self.assertGreater(broken.available_at, timezone.now())
+        self.assertEqual(process_outbox(), (0, 0))
+
+        # После исчерпания попыток событие больше не выбирается
+        with self.assertLogs('myproject.utils.outbox', 'WARNING'):
+            for attempt in range(MAX_ATTEMPTS - 1):
+                process_outbox(now=timezone.now() + timezone.timedelta(days=attempt + 1))
+        self.assertEqual(OutboxEvent.objects.get(pk=broken.pk).attempts, MAX_ATTEMPTS)
+        self.assertEqual(process_outbox(now=timezone.now() + timezone.timedelta(days=30)), (0, 0))
+
+    def test_side_effects_roll_back_together(self):
+        """Ошибка обработчика не оставляет частично созданных уведомлений"""
+        enqueue('application_status', {
+            'application_ids': [self.application.id], 'status': 'accepted', 'employer_id': self.employer.id
+        })
+        with mock.patch.object(outbox.Message.objects, 'bulk_create', side_effect=RuntimeError('сбой')), \
+                self.assertLogs('myproject.utils.outbox', 'WARNING'):
+            self.assertEqual(drain_outbox(), (0, 1))
+        self.assertFalse(Notification.objects.exists())
+
+    def test_expired_lease_is_not_marked_processed(self):
+        """Если пачку забрал другой обработчик, отметка и побочные эффекты откатываются"""
+        enqueue('application_status', {
+            'application_ids': [self.application.id], 'status': 'rejected', 'employer_id': self.employer.id
+        })
+        handle = outbox.HANDLERS['application_status']
+
+        def reclaimed(events):
+            # аренда истекла во время обработки, событие захватил другой процесс
+            handle(events)
+            OutboxEvent.objects.update(claim_token='другой')
+
+        with mock.patch.dict(outbox.HANDLERS, {'application_status': reclaimed}), \
+                self.assertLogs('myproject.utils.outbox', 'WARNING'):
+            self.assertEqual(process_outbox(), (0, 0))
+        event = OutboxEvent.objects.get()
+        self.assertIsNone(event.processed_at)
+        self.assertEqual(event.attempts, 0)
+        self.assertFalse(Notification.objects.exists())
+
+    def test_backlog_check(self):
+        """--check падает, если события долго ждут обработки или исчерпали попытки"""
+        call_command('process_outbox', '--check', stdout=StringIO())
+
+        event = enqueue('message_sent', {'message_id': 1})
+        OutboxEvent.objects.filter(pk=event.pk).update(created_at=timezone.now() - timezone.timedelta(minutes=30))
+        with self.assertRaisesMessage(CommandError, 'дольше порога: 1, исчерпали попытки: 0'):
+            call_command('process_outbox', '--check', stdout=StringIO())
+        call_command('process_outbox', '--check', '--max-age', '60', stdout=StringIO())
+
+        OutboxEvent.objects.filter(pk=event.pk).update(attempts=MAX_ATTEMPTS)
+        with self.assertRaisesMessage(CommandError, 'дольше порога: 0, исчерпали попытки: 1'):
+            call_command('process_outbox', '--check', '--max-age', '60', stdout=StringIO())
@@ -0,0 +1,67 @@
+from django.test import TestCase, Client
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from ..models import User, Notification
+
+class KeysetPaginationTest(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create_user(username='student', password='testpass123')
+        self.client.login(username='student', password='testpass123')
+        now = timezone.now()
+        for i in range(25):
+            notification = Notification.objects.create(
+                user=self.user, title=f'Уведомление {i}', content='Текст', type='system'
+            )
+            # Часть записей получает одинаковое время, чтобы проверить разбор по id
+            Notification.objects.filter(pk=notification.pk).update(
+                created_at=now - timezone.timedelta(minutes=i // 3)
+            )
+
+    def collect(self, url):
+        ids = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            data = response.json()
+            ids.extend(item['id'] for item in data['results'])
+            url = data['next']
+        return ids
+
+    def test_walks_all_pages_in_stable_order(self):
+        """Обход по курсорам возвращает каждую запись ровно один раз"""
+        expected = list(
+            Notification.objects.order_by('-created_at', '-id').values_list('id', flat=True)
+        )
+        self.assertEqual(self.collect('/api/notifications/'), expected)
+
+    def test_insert_between_pages_does_not_shift(self):
+        """Новые записи не сдвигают уже выданные страницы"""
+        first = self.client.get('/api/notifications/').json()
+        Notification.objects.create(user=self.user, title='Новое', content='Текст', type='system')
+        second = self.client.get(first['next']).json()
+        first_ids = {item['id'] for item in first['results']}
+        self.assertFalse(first_ids & {item['id'] for item in second['results']})
+        self.assertEqual(len(second['results']), 10)
+
+    def test_previous_link(self):
+        """Ссылка previous возвращает предыдущую страницу"""
+        first = self.client.get('/api/notifications/').json()
+        second = self.client.get(first['next']).json()
+        back = self.client.get(second['previous']).json()
+        self.assertEqual(back['results'], first['results'])
+
+    def test_count_only_on_request(self):
+        """COUNT выполняется только при ?count=true"""
+        with CaptureQueriesContext(connection) as queries:
+            data = self.client.get('/api/notifications/').json()
+        self.assertNotIn('count', data)
+        self.assertFalse(any('COUNT(' in q['sql'] for q in queries.captured_queries))
+        data = self.client.get('/api/notifications/', {'count': 'true'}).json()
+        self.assertEqual(data['count'], 25)
+
+    def test_invalid_cursor(self):
+        """Поврежденный курсор приводит к ошибке валидации"""
+        response = self.client.get('/api/notifications/', {'cursor': 'garbage'})
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,66 @@
+from django.core.cache import cache
+from django.test import TestCase, Client
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from ..models import User, Job, Department, Application, Message
+from ..serializers import ApplicationSerializer, JobSerializer, MessageSerializer
+from ..api.optimization import get_related_lookups
+
+class QueryShapeTest(TestCase):
+    def test_lookups_follow_nested_serializers(self):
+        """Пути связей выводятся из вложенных сериализаторов"""
+        self.assertEqual(
+            get_related_lookups(JobSerializer(), Job),
+            (['employer', 'card', 'department'], [])
+        )
+        self.assertEqual(
+            get_related_lookups(MessageSerializer(), Message),
+            (['sender', 'receiver'], [])
+        )
+        self.assertEqual(
+            get_related_lookups(ApplicationSerializer(), Application),
+            (['applicant'], [])
+        )
+
+class ListQueryCountTest(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.employer = User.objects.create_user(username='employer', password='testpass123', role='employer')
+        self.department = Department.objects.create(name='Кафедра')
+        self.job = Job.objects.create(
+            title='Вакансия',
+            description='Описание',
+            department=self.department,
+            employer=self.employer,
+            job_type='internship',
+            deadline=timezone.now() + timezone.timedelta(days=7)
+        )
+        self.client.login(username='employer', password='testpass123')
+
+    def add_applications(self, count, offset=0):
+        for i in range(offset, offset + count):
+            student = User.objects.create_user(username=f'student{i}', password='testpass123')
+            Application.objects.create(job=self.job, applicant=student, cover_letter='Письмо')
+            Message.objects.create(sender=student, receiver=self.employer, content='Привет')
+
+    def count_queries(self, url):
+        cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_constant_queries_per_page(self):
+        """Число запросов на страницу не зависит от количества записей"""
+        urls = [
+            '/api/messages/',
+            '/api/applications/',
+            '/api/jobs/',
+            f'/api/jobs/{self.job.id}/applications/',
+        ]
+        self.add_applications(2)
+        baseline = {url: self.count_queries(url) for url in urls}
+        self.add_applications(8, offset=2)
+        for url in urls:
+            self.assertEqual(self.count_queries(url), baseline[url], url)
@@ -0,0 +1,9 @@
+from django.test import TestCase
+from ..utils.query_plans import check_query_plans
+
+class QueryPlanTest(TestCase):
+    def test_hot_queries_use_indexes(self):
+        """Ни один горячий запрос не сводится к полному сканированию таблицы"""
+        for name, details, scans in check_query_plans():
+            with self.subTest(query=name):
+                self.assertEqual(scans, [], '\n'.join(details))
@@ -0,0 +1,89 @@
+from django.core.cache import cache
+from django.test import TestCase, Client
+from django.utils import timezone
+from ..models import User, Job, Department, Skill, JobSkill, UserSkill
+from ..utils.deadlines import expire_jobs
+from ..utils.recommendations import SkillMatrix, recommend_jobs
+
+class RecommendationsTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.employer = User.objects.create_user(username='employer', password='testpass123', role='employer')
+        self.student = User.objects.create_user(username='student', password='testpass123')
+        self.department = Department.objects.create(name='Кафедра')
+        self.python = Skill.objects.create(name='Python')
+        self.sql = Skill.objects.create(name='SQL')
+        self.django = Skill.objects.create(name='Django')
+
+        self.perfect = self.create_job('Python-разработчик', [(self.python, 'intermediate', True)])
+        self.missing_required = self.create_job('DBA', [(self.sql, 'advanced', True), (self.python, 'beginner', False)])
+        self.missing_optional = self.create_job('Бэкенд', [(self.python, 'beginner', True), (self.django, 'advanced', False)])
+        self.without_skills = self.create_job('Без навыков', [])
+
+        UserSkill.objects.create(user=self.student, skill=self.python, level='advanced')
+
+    def create_job(self, title, skills):
+        job = Job.objects.create(
+            title=title, description='Описание', department=self.department, employer=self.employer,
+            job_type='internship', deadline=timezone.now() + timezone.timedelta(days=30)
+        )
+        for skill, level, is_required in skills:
+            JobSkill.objects.create(job=job, skill=skill, level=level, is_required=is_required)
+        return job
+
+    def test_ranking(self):
+        """Нехватка обязательного навыка снижает оценку сильнее, чем желательного"""
+        ranked = recommend_jobs(self.student.id)
+        self.assertEqual(
+            [job_id for job_id, _ in ranked],
+            [self.perfect.id, self.missing_optional.id, self.missing_required.id]
+        )
+        scores = dict(ranked)
+        self.assertEqual(scores[self.perfect.id], 1.0)
+        self.assertAlmostEqual(scores[self.missing_required.id], 1 / 10)
+        self.assertAlmostEqual(scores[self.missing_optional.id], 3 / 6)
+
+    def test_incremental_refresh(self):
+        """Изменения навыков вакансий и пользователя подхватываются без полной перестройки"""
+        matrix = SkillMatrix()
+        matrix.recommend(self.student.id)
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            UserSkill.objects.create(user=self.student, skill=self.sql, level='advanced')
+            JobSkill.objects.filter(job=self.missing_optional).delete()
+            # до фиксации транзакции процессы продолжают работать со старой версией
+            with self.assertNumQueries(0):
+                matrix.recommend(self.student.id)
+        self.assertTrue(callbacks)
+        with self.assertNumQueries(3):
+            # две выборки для измененной вакансии и одна для навыков пользователя
+            ranked = dict(matrix.recommend(self.student.id))
+        self.assertEqual(ranked[self.missing_required.id], 1.0)
+        self.assertNotIn(self.missing_optional.id, ranked)
+
+        with self.assertNumQueries(0):
+            matrix.recommend(self.student.id)
+
+    def test_expired_jobs_excluded(self):
+        """Снятые с публикации вакансии не рекомендуются"""
+        recommend_jobs(self.student.id)
+        Job.objects.filter(id=self.perfect.id).update(deadline=timezone.now() - timezone.timedelta(days=1))
+        with self.captureOnCommitCallbacks(execute=True):
+            expire_jobs()
+        self.assertNotIn(self.perfect.id, dict(recommend_jobs(self.student.id)))
+
+    def test_endpoint(self):
+        """Эндпоинт возвращает вакансии с оценкой и требует аутентификации"""
+        response = self.client.get('/api/jobs/recommended/')
+        self.assertIn(response.status_code, (401, 403))
+
+        self.client.login(username='student', password='testpass123')
+        response = self.client.get('/api/jobs/recommended/?limit=2')
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual([item['title'] for item in data], ['Python-разработчик', 'Бэкенд'])
+        self.assertEqual(data[0]['match_score'], 1.0)
+
+        response = self.client.get('/api/jobs/recommended/?limit=abc')
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,117 @@
+import hashlib
+import shutil
+import tempfile
+from unittest import mock
+from asgiref.sync import sync_to_async
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, Client, override_settings
+from django.utils import timezone
+from ..models import User, Job, Department, Application
+
+MEDIA_ROOT = tempfile.mkdtemp()
+CONTENT = b'%PDF-1.4 ' + bytes(range(256)) * 40
+
+def read_body(response):
+    """Тело ответа под WSGI (тестовый Client): итератор синхронный"""
+    return b''.join(response.streaming_content)
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, RESUME_DELIVERY='direct')
+class ResumeDeliveryTest(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        self.client = Client()
+        User.objects.create_user(username='employer', password='testpass123', role='employer')
+        User.objects.create_user(username='student', password='testpass123', role='student')
+        User.objects.create_user(username='stranger', password='testpass123', role='student')
+        job = Job.objects.create(
+            title='Вакансия', description='Описание', department=Department.objects.create(name='Кафедра'),
+            employer=User.objects.get(username='employer'), job_type='internship',
+            deadline=timezone.now() + timezone.timedelta(days=30)
+        )
+        self.client.login(username='student', password='testpass123')
+        self.client.post(f'/jobs/{job.id}/apply/', {
+            'cover_letter': 'Письмо',
+            'resume': SimpleUploadedFile('cv.pdf', CONTENT, content_type='application/pdf'),
+        })
+        self.application = Application.objects.get()
+        self.url = f'/applications/{self.application.id}/resume/download/'
+        self.client.login(username='employer', password='testpass123')
+        self.etag = f'"{hashlib.sha256(CONTENT).hexdigest()}"'
+
+    def test_full_download_and_conditional_request(self):
+        """Полная отдача с ETag, повторный запрос с If-None-Match получает 304"""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(read_body(response), CONTENT)
+        self.assertEqual(response['ETag'], self.etag)
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertIn('resume_student.pdf', response['Content-Disposition'])
+        self.assertIn('private', response['Cache-Control'])
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=self.etag)
+        self.assertEqual(response.status_code, 304)
+
+    async def test_iterator_matches_handler(self):
+        """Под WSGI файл читается синхронным итератором, под ASGI - асинхронным: иначе Django буферизует тело"""
+        response = await sync_to_async(self.client.get)(self.url, HTTP_RANGE='bytes=10-19')
+        self.assertFalse(response.is_async)
+        self.assertEqual(b''.join(response.streaming_content), CONTENT[10:20])
+
+        await self.async_client.aforce_login(await User.objects.aget(username='employer'))
+        response = await self.async_client.get(self.url, headers={'Range': 'bytes=10-19'})
+        self.assertEqual(response.status_code, 206)
+        self.assertTrue(response.is_async)
+        self.assertEqual(b''.join([chunk async for chunk in response.streaming_content]), CONTENT[10:20])
+
+    def test_ranges(self):
+        """Частичная отдача по Range, невыполнимый диапазон и If-Range"""
+        response = self.client.get(self.url, HTTP_RANGE='bytes=10-19')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(read_body(response), CONTENT[10:20])
+        self.assertEqual(response['Content-Range'], f'bytes 10-19/{len(CONTENT)}')
+
+        response = self.client.get(self.url, HTTP_RANGE='bytes=-5')
+        self.assertEqual(read_body(response), CONTENT[-5:])
+
+        response = self.client.get(self.url, HTTP_RANGE=f'bytes={len(CONTENT)}-')
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], f'bytes */{len(CONTENT)}')
+
+        response = self.client.get(self.url, HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE='"other"')
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(RESUME_DELIVERY='x-accel', RESUME_ACCEL_PREFIX='/protected-media/')
+    def test_x_accel_redirect(self):
+        """В режиме x-accel байты отдает прокси"""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['X-Accel-Redirect'], '/protected-media/' + self.application.resume.name)
+        self.assertEqual(response.content, b'')
+
+    @override_settings(RESUME_DELIVERY='redirect', RESUME_URL_EXPIRE=60)
+    def test_presigned_redirect(self):
+        """В режиме redirect выдается подписанная ссылка хранилища"""
+        def presigned_url(name, parameters=None, expire=None):
+            return f'https://minio.local/bucket/{name}?X-Amz-Expires={expire}'
+
+        with mock.patch.object(default_storage, 'url', side_effect=presigned_url):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 302)
+        self.assertTrue(response['Location'].endswith('?X-Amz-Expires=60'))
+
+        # Локальное хранилище ссылки не подписывает - файл отдается напрямую
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+
+    def test_permissions(self):
+        """Посторонний пользователь не может скачать резюме"""
+        self.client.login(username='stranger', password='testpass123')
+        with self.assertLogs('myproject.middleware', level='ERROR'):
+            response = self.client.get(self.url)
+        self.assertNotEqual(response.status_code, 200)
+        self.assertFalse(response.has_header('Content-Disposition'))
@@ -0,0 +1,192 @@
+import hashlib
+import importlib
+import os
+import shutil
+import tempfile
+from unittest import mock
+from django.apps import apps
+from django.conf import settings
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import TestCase, Client, override_settings
+from django.test.client import MULTIPART_CONTENT, BOUNDARY, encode_multipart
+from django.utils import timezone
+from ..models import User, Job, Department, Application, ResumeBlob
+from ..utils.resumes import HashingFileUploadHandler
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class ResumeStorageTest(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        self.client = Client()
+        employer = User.objects.create_user(username='employer', password='testpass123', role='employer')
+        self.student = User.objects.create_user(username='student', password='testpass123', role='student')
+        department = Department.objects.create(name='Кафедра')
+        self.jobs = [
+            Job.objects.create(
+                title=f'Вакансия {i}', description='Описание', department=department, employer=employer,
+                job_type='internship', deadline=timezone.now() + timezone.timedelta(days=30)
+            )
+            for i in range(3)
+        ]
+        self.client.login(username='student', password='testpass123')
+
+    def tearDown(self):
+        for path in self.stored_files():
+            os.remove(path)
+
+    def apply(self, job, content):
+        return self.client.post(f'/jobs/{job.id}/apply/', {
+            'cover_letter': 'Письмо',
+            'resume': SimpleUploadedFile('cv.pdf', content, content_type='application/pdf'),
+        })
+
+    def stored_files(self):
+        files = []
+        for root, _, names in os.walk(MEDIA_ROOT):
+            files.extend(os.path.join(root, name) for name in names)
+        return files
+
+    def test_same_resume_stored_once(self):
+        """Повторная загрузка того же файла не создает новой копии"""
+        content = b'%PDF-1.4 resume' * 1000
+        self.apply(self.jobs[0], content)
+        self.apply(self.jobs[1], content)
+        self.apply(self.jobs[2], b'%PDF-1.4 another resume')
+
+        self.assertEqual(Application.objects.count(), 3)
+        blob = ResumeBlob.objects.get(sha256=hashlib.sha256(content).hexdigest())
+        self.assertEqual(blob.ref_count, 2)
+        self.assertEqual(blob.size, len(content))
+        self.assertEqual(len(self.stored_files()), 2)
+        first, second = Application.objects.filter(resume_blob=blob)
+        self.assertEqual(first.resume.name, second.resume.name)
+        with first.resume.open('rb') as resume:
+            self.assertEqual(resume.read(), content)
+
+    def test_file_deleted_with_last_reference(self):
+        """Файл удаляется только после удаления последней ссылающейся заявки"""
+        content = b'%PDF-1.4 resume'
+        self.apply(self.jobs[0], content)
+        self.apply(self.jobs[1], content)
+        first, second = Application.objects.all()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(f'/applications/{first.id}/cancel/')
+        self.assertEqual(ResumeBlob.objects.get().ref_count, 1)
+        self.assertEqual(len(self.stored_files()), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(f'/applications/{second.id}/cancel/')
+        self.assertFalse(ResumeBlob.objects.exists())
+        self.assertEqual(self.stored_files(), [])
+
+    def test_upload_handler_hashes_chunks(self):
+        """Обработчик загрузки считает хеш по фрагментам без повторного чтения файла"""
+        handler = HashingFileUploadHandler()
+        handler.new_file('resume', 'cv.pdf', 'application/pdf', None)
+        chunks = [b'a' * 1000, b'b' * 10, b'c']
+        start = 0
+        for chunk in chunks:
+            handler.receive_data_chunk(chunk, start)
+            start += len(chunk)
+        uploaded = handler.file_complete(start)
+        self.assertEqual(uploaded.sha256, hashlib.sha256(b''.join(chunks)).hexdigest())
+        uploaded.close()
+
+    def test_handler_installed_only_for_resume_uploads(self):
+        """Обработчик с хешированием ставится на загрузку резюме, настройки по умолчанию не меняются"""
+        self.assertNotIn('myproject.utils.resumes.HashingFileUploadHandler', settings.FILE_UPLOAD_HANDLERS)
+        client = Client(enforce_csrf_checks=True)
+        client.login(username='student', password='testpass123')
+        client.get(f'/jobs/{self.jobs[0].id}/apply/')
+        file_complete = HashingFileUploadHandler.file_complete
+        with mock.patch.object(
+            HashingFileUploadHandler, 'file_complete', autospec=True, side_effect=file_complete
+        ) as complete:
+            response = client.post(f'/jobs/{self.jobs[0].id}/apply/', {
+                'csrfmiddlewaretoken': client.cookies['csrftoken'].value,
+                'cover_letter': 'Письмо',
+                'resume': SimpleUploadedFile('cv.pdf', b'%PDF-1.4 resume', content_type='application/pdf'),
+            })
+        self.assertEqual(response.status_code, 302)
+        complete.assert_called_once()
+        self.assertTrue(Application.objects.exists())
+
+        # Проверка CSRF сохраняется
+        response = client.post(f'/jobs/{self.jobs[1].id}/apply/', {'cover_letter': 'Письмо'})
+        self.assertEqual(response.status_code, 403)
+
+    def test_rollback_deletes_new_file(self):
+        """Если заявка не сохранилась, записанный файл не остается в хранилище"""
+        self.client.raise_request_exception = False
+        with mock.patch('myproject.views.record_created', side_effect=RuntimeError('сбой')):
+            self.apply(self.jobs[0], b'%PDF-1.4 resume')
+        self.assertFalse(Application.objects.exists())
+        self.assertFalse(ResumeBlob.objects.exists())
+        self.assertEqual(self.stored_files(), [])
+
+    def test_replacing_resume_releases_previous_blob(self):
+        """Замена резюме в заявке уменьшает счетчик ссылок прежнего файла"""
+        old, new = b'%PDF-1.4 old', b'%PDF-1.4 new'
+        self.apply(self.jobs[0], old)
+        self.apply(self.jobs[1], old)
+        first, second = Application.objects.order_by('id')
+
+        def replace(application):
+            return self.client.patch(
+                f'/api/applications/{application.id}/',
+                encode_multipart(BOUNDARY, {'resume': SimpleUploadedFile('cv.pdf', new)}),
+                content_type=MULTIPART_CONTENT
+            )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(replace(first).status_code, 200)
+        old_blob = ResumeBlob.objects.get(sha256=hashlib.sha256(old).hexdigest())
+        new_blob = ResumeBlob.objects.get(sha256=hashlib.sha256(new).hexdigest())
+        self.assertEqual((old_blob.ref_count, new_blob.ref_count), (1, 1))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(replace(second).status_code, 200)
+        self.assertEqual(list(ResumeBlob.objects.values_list('pk', 'ref_count')), [(new_blob.pk, 2)])
+        self.assertEqual(len(self.stored_files()), 1)
+        first.refresh_from_db()
+        self.assertEqual(first.resume.name, new_blob.file.name)
+
+    def test_migration_merges_identical_legacy_files(self):
+        """Миграция 0013 сводит одинаковые старые файлы к одному blob и удаляет копии"""
+        migration = importlib.import_module('myproject.migrations.0013_resume_blob')
+        os.makedirs(os.path.join(MEDIA_ROOT, 'resumes'), exist_ok=True)
+        legacy = {
+            'resumes/obrazec.pdf': b'%PDF-1.4 legacy',
+            'resumes/obrazec_CqTAiq2.pdf': b'%PDF-1.4 legacy',
+            'resumes/other.pdf': b'%PDF-1.4 other',
+        }
+        for name, content in legacy.items():
+            with open(os.path.join(MEDIA_ROOT, name), 'wb') as file:
+                file.write(content)
+        applications = [
+            Application.objects.create(job=job, applicant=self.student, cover_letter='Письмо', resume=name)
+            for job, name in zip(self.jobs, legacy)
+        ]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            migration.link_existing_resumes(apps, connection.schema_editor())
+
+        self.assertEqual(ResumeBlob.objects.count(), 2)
+        shared = ResumeBlob.objects.get(sha256=hashlib.sha256(b'%PDF-1.4 legacy').hexdigest())
+        self.assertEqual((shared.file.name, shared.ref_count), ('resumes/obrazec.pdf', 2))
+        for application in applications[:2]:
+            application.refresh_from_db()
+            self.assertEqual(application.resume_blob, shared)
+            self.assertEqual(application.resume.name, 'resumes/obrazec.pdf')
+        self.assertEqual(
+            sorted(os.path.relpath(path, MEDIA_ROOT) for path in self.stored_files()),
+            ['resumes/obrazec.pdf', 'resumes/other.pdf']
+        )
@@ -0,0 +1,98 @@
+from django.db import connection
+from django.test import TestCase, Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from ..models import User, Job, Department
+from ..utils.search import search_jobs, get_search_backend, SimpleSearchBackend
+
+class JobSearchTest(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.employer = User.objects.create_user(
+            username='employer',
+            password='testpass123',
+            role='employer'
+        )
+        self.department = Department.objects.create(name='Кафедра информатики')
+        deadline = timezone.now() + timezone.timedelta(days=7)
+        self.python_job = Job.objects.create(
+            title='Разработчик Python',
+            description='Backend на Django',
+            department=self.department,
+            employer=self.employer,
+            job_type='internship',
+            deadline=deadline
+        )
+        self.teacher_job = Job.objects.create(
+            title='Ассистент кафедры',
+            description='Проведение практики по Python для первокурсников',
+            department=self.department,
+            employer=self.employer,
+            job_type='teaching',
+            deadline=deadline
+        )
+        Job.objects.create(
+            title='Лаборант',
+            description='Работа в химической лаборатории',
+            department=self.department,
+            employer=self.employer,
+            job_type='research',
+            deadline=deadline
+        )
+
+    def test_ranking_prefers_title_match(self):
+        """Совпадение в названии ранжируется выше совпадения в описании"""
+        results = list(search_jobs(Job.objects.all(), 'python'))
+        self.assertEqual(results, [self.python_job, self.teacher_job])
+
+    def test_match_runs_once(self):
+        """MATCH выполняется в запросе один раз, ранг без коррелированного подзапроса"""
+        with CaptureQueriesContext(connection) as queries:
+            list(search_jobs(Job.objects.all(), 'python'))
+        sql = queries.captured_queries[0]['sql']
+        self.assertEqual(sql.count('MATCH'), 1)
+        self.assertNotIn('(SELECT', sql)
+
+    def test_backend_follows_settings(self):
+        """override_settings(SEARCH_BACKEND=...) меняет бэкенд"""
+        with override_settings(SEARCH_BACKEND='myproject.utils.search.SimpleSearchBackend'):
+            self.assertIsInstance(get_search_backend(), SimpleSearchBackend)
+        self.assertNotIsInstance(get_search_backend(), SimpleSearchBackend)
+
+    def test_prefix_match(self):
+        """Последнее слово запроса ищется по префиксу"""
+        results = list(search_jobs(Job.objects.all(), 'лаборат'))
+        self.assertEqual(len(results), 1)
+
+    def test_index_follows_save_and_delete(self):
+        """Индекс обновляется сигналами сохранения и удаления вакансии"""
+        self.python_job.title = 'Разработчик Go'
+        self.python_job.description = 'Микросервисы'
+        self.python_job.save()
+        self.assertEqual(list(search_jobs(Job.objects.all(), 'python')), [self.teacher_job])
+        self.teacher_job.delete()
+        self.assertEqual(list(search_jobs(Job.objects.all(), 'python')), [])
+
+    def test_special_characters_are_ignored(self):
+        """Операторы FTS5 во вводе пользователя не ломают запрос"""
+        results = list(search_jobs(Job.objects.all(), 'python" OR (NEAR'))
+        self.assertEqual(results, [])
+
+    def test_api_search(self):
+        """Параметр q в /api/jobs/ возвращает ранжированные результаты постранично"""
+        response = self.client.get('/api/jobs/', {'q': 'python'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['count'], 2)
+        ids = [job['id'] for job in response.json()['results']]
+        self.assertEqual(ids, [self.python_job.id, self.teacher_job.id])
+
+    def test_html_search(self):
+        """Поиск на странице списка вакансий"""
+        self.client.login(username='employer', password='testpass123')
+        response = self.client.get(reverse('job_list'), {'q': 'python'})
+        self.assertEqual(response.status_code, 200)
+        content = response.content.decode()
+        self.assertIn('Разработчик Python', content)
+        self.assertIn('Ассистент кафедры', content)
+        self.assertNotIn('Лаборант', content)
@@ -0,0 +1,103 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, Client
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from ..models import User, Job, Department, Application
+from ..serializers import parse_fieldset
+
+class SparseFieldsetTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.employer = User.objects.create_user(username='employer', password='testpass123', role='employer')
+        self.department = Department.objects.create(name='Кафедра', description='Длинное описание кафедры')
+        self.job = Job.objects.create(
+            title='Вакансия', description='Очень длинное описание вакансии', department=self.department,
+            employer=self.employer, job_type='internship',
+            deadline=timezone.now() + timezone.timedelta(days=7)
+        )
+        student = User.objects.create_user(username='student', password='testpass123')
+        Application.objects.create(job=self.job, applicant=student, cover_letter='Письмо')
+
+    def get_jobs(self, params):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/jobs/', params)
+        self.assertEqual(response.status_code, 200)
+        sql = [query['sql'] for query in queries if 'FROM "myproject_job"' in query['sql']
+               and 'COUNT' not in query['sql'] and 'ORDER BY' in query['sql']]
+        return response.json()['results'], sql[0]
+
+    def test_parse_fieldset(self):
+        """Разбор списка полей во вложенное дерево"""
+        self.assertEqual(
+            parse_fieldset('id, title,department.name,department.id'),
+            {'id': {}, 'title': {}, 'department': {'name': {}, 'id': {}}}
+        )
+        self.assertIsNone(parse_fieldset(None))
+
+    def test_default_response_unchanged(self):
+        """Без параметров ответ прежний: все поля и вложенные объекты"""
+        results, sql = self.get_jobs({})
+        self.assertEqual(results[0]['department']['name'], 'Кафедра')
+        self.assertEqual(results[0]['employer']['username'], 'employer')
+        self.assertIn('"myproject_job"."description"', sql)
+
+    def test_fields(self):
+        """Только запрошенные поля; ненужные колонки и связи не читаются"""
+        results, sql = self.get_jobs({'fields': 'id,title'})
+        self.assertEqual(results, [{'id': self.job.id, 'title': 'Вакансия'}])
+        self.assertNotIn('"myproject_job"."description"', sql)
+        self.assertNotIn('JOIN', sql)
+
+    def test_nested_fields(self):
+        """Поля вложенного объекта через точку"""
+        results, sql = self.get_jobs({'fields': 'title,department.name'})
+        self.assertEqual(results, [{'title': 'Вакансия', 'department': {'name': 'Кафедра'}}])
+        self.assertIn('JOIN "myproject_department"', sql)
+        self.assertNotIn('"myproject_department"."description"', sql)
+        self.assertNotIn('myproject_user', sql)
+
+    def test_expand(self):
+        """Нераскрытые связи отдаются как id без JOIN"""
+        results, sql = self.get_jobs({'expand': 'department', 'fields': 'id,department,employer'})
+        self.assertEqual(results[0]['employer'], self.employer.id)
+        self.assertEqual(results[0]['department']['name'], 'Кафедра')
+        self.assertNotIn('myproject_user', sql)
+
+        results, sql = self.get_jobs({'expand': ''})
+        self.assertEqual(results[0]['department'], self.department.id)
+        self.assertNotIn('JOIN', sql)
+
+    def test_cursor_pagination_with_sparse_fields(self):
+        """Ключ курсора читается, даже если его нет среди запрошенных полей"""
+        for index in range(3):
+            Job.objects.create(
+                title=f'Вакансия {index}', description='Описание', department=self.department,
+                employer=self.employer, job_type='internship',
+                deadline=timezone.now() + timezone.timedelta(days=7)
+            )
+        response = self.client.get('/api/jobs/', {'fields': 'id', 'page_size': 2})
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(response.json()['next'])
+        self.assertEqual(len(response.json()['results']), 2)
+        # Отложенные поля не догружаются отдельными запросами
+        self.assertFalse([query for query in queries if '"myproject_job"."id" = ' in query['sql']])
+
+    def test_retrieve_and_nested_list(self):
+        """Параметры работают для деталей объекта и для заявок вакансии"""
+        response = self.client.get(f'/api/jobs/{self.job.id}/', {'fields': 'title'})
+        self.assertEqual(response.json(), {'title': 'Вакансия'})
+
+        self.client.login(username='employer', password='testpass123')
+        response = self.client.get(f'/api/jobs/{self.job.id}/applications/', {'fields': 'status,applicant.username'})
+        self.assertEqual(response.json(), [{'status': 'pending', 'applicant': {'username': 'student'}}])
+
+    def test_write_ignores_fields(self):
+        """При изменении данных параметры не сокращают валидацию"""
+        self.client.login(username='employer', password='testpass123')
+        response = self.client.patch(
+            f'/api/jobs/{self.job.id}/?fields=title', {'title': 'Новое название'}, content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('description', response.json())
@@ -9,8 +9,8 @@ from rest_framework.routers import DefaultRouter
 from . import views
 from .api.viewsets import (
     UserViewSet, DepartmentViewSet, ApplicationViewSet,
-    SkillViewSet, UserSkillViewSet, MessageViewSet, ReviewViewSet,
-    NotificationViewSet, JobViewSet
+    SkillViewSet, UserSkillViewSet, MessageViewSet, ConversationViewSet, ReviewViewSet,
+    NotificationViewSet, MeViewSet, JobViewSet
 )
 
 router = DefaultRouter()
@@ -20,8 +20,10 @@ router.register(r'applications', ApplicationViewSet, basename='application')
 router.register(r'skills', SkillViewSet)
 router.register(r'user-skills', UserSkillViewSet, basename='user-skill')
 router.register(r'messages', MessageViewSet, basename='message')
+router.register(r'conversations', ConversationViewSet, basename='conversation')
 router.register(r'reviews', ReviewViewSet, basename='review')
 router.register(r'notifications', NotificationViewSet, basename='notification')
+router.register(r'me', MeViewSet, basename='me')
 router.register(r'jobs', JobViewSet)
 
 schema_view = get_schema_view(
@@ -45,6 +47,7 @@ urlpatterns = [
     # API URLs
     path('api/', include(router.urls)),
     path('api/favorites/', views.api_favorites, name='api_favorites'),
+    path('api/events/', views.api_events, name='api_events'),
     path('api/applications/', views.api_applications, name='api_applications'),
     
     # Swagger URLs
@@ -63,6 +66,7 @@ urlpatterns = [
     path('jobs/<int:job_id>/review/', views.add_review, name='add_review'),
     path('favorites/', views.favorites, name='favorites'),
     path('applications/', views.applications, name='applications'),
+    path('applications/bulk-status/', views.bulk_update_application_status, name='bulk_update_application_status'),
     path('applications/<int:application_id>/', views.application_detail, name='application_detail'),
     path('applications/<int:application_id>/update-status/', views.update_application_status, name='update_application_status'),
     path('applications/<int:application_id>/cancel/', views.cancel_application, name='cancel_application'),
@@ -76,6 +80,7 @@ urlpatterns = [
     # Профиль пользователя
     path('profile/', views.profile_view, name='profile'),
     path('profile/edit/', views.edit_profile, name='edit_profile'),
+    path('profile/dashboard/', views.employer_dashboard, name='employer_dashboard'),
     path('profile/skills/', views.profile_skills, name='profile_skills'),
     path('profile/skills/<int:skill_id>/delete/', views.delete_profile_skill, name='delete_profile_skill'),
     path('profile/<str:username>/', views.profile_view, name='user_profile'),
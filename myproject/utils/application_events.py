@@ -0,0 +1,125 @@
+import math
+
+from django.utils import timezone
+
+from ..models import ApplicationEvent, JobResponseStats
+
+# Статусы, которые считаются ответом работодателя на заявку
+RESPONSE_STATUSES = ('accepted', 'rejected')
+
+# Гистограмма времен ответа с логарифмическими корзинами (как в DDSketch):
+# значение из корзины i восстанавливается с относительной ошибкой не больше 1%,
+# а корзин на диапазон от секунды до года - несколько сотен
+RELATIVE_ACCURACY = 0.01
+GAMMA = (1 + RELATIVE_ACCURACY) / (1 - RELATIVE_ACCURACY)
+LOG_GAMMA = math.log(GAMMA)
+
+
+def sketch_bucket(seconds):
+    return math.ceil(math.log(max(seconds, 1)) / LOG_GAMMA)
+
+
+def sketch_value(bucket):
+    """Оценка значений корзины: середина интервала (gamma^(i-1), gamma^i]"""
+    return 2 * GAMMA ** bucket / (GAMMA + 1)
+
+
+def sketch_add(sketch, seconds):
+    """Добавляет значение в гистограмму (словарь "номер корзины" -> количество)"""
+    key = str(sketch_bucket(seconds))
+    sketch[key] = sketch.get(key, 0) + 1
+
+
+def sketch_quantile(sketch, quantile=0.5):
+    """
+    Квантиль по гистограмме за O(число корзин). Между соседними
+    по рангу значениями интерполирует, как statistics.median.
+    """
+    total = sum(sketch.values())
+    if not total:
+        return None
+    rank = quantile * (total - 1)
+    lower_rank, fraction = int(rank), rank - int(rank)
+    lower = upper = None
+    seen = 0
+    for bucket in sorted(sketch, key=int):
+        seen += sketch[bucket]
+        if lower is None and seen > lower_rank:
+            lower = sketch_value(int(bucket))
+        if seen > lower_rank + 1 or (seen > lower_rank and not fraction):
+            upper = sketch_value(int(bucket))
+            break
+    return lower + (upper - lower) * fraction
+
+
+def add_response_times(samples):
+    """
+    Добавляет времена первых ответов в статистику вакансий.
+    samples - словарь job_id -> список секунд. Строка статистики
+    блокируется на время обновления, медиана пересчитывается по гистограмме.
+    """
+    for job_id, seconds in samples.items():
+        stats, _ = JobResponseStats.objects.select_for_update().get_or_create(job_id=job_id)
+        for value in seconds:
+            sketch_add(stats.sketch, value)
+        stats.responses += len(seconds)
+        stats.median_seconds = sketch_quantile(stats.sketch)
+        stats.save()
+
+
+def record_created(application, actor=None):
+    """Событие подачи заявки"""
+    ApplicationEvent.objects.create(
+        application=application, job_id=application.job_id, applicant_id=application.applicant_id,
+        actor=actor, from_status='', to_status=application.status, created_at=application.created_at
+    )
+
+
+def record_status_change(applications, to_status, actor, now=None):
+    """
+    Записывает в журнал переход заявок в статус to_status (одним bulk_create)
+    и обновляет медиану времени ответа их вакансий.
+
+    applications - заявки с еще не измененным status и загруженными
+    job_id, applicant_id, created_at. Вызывать в транзакции перехода,
+    с заявками, заблокированными select_for_update.
+    """
+    now = now or timezone.now()
+    applications = [application for application in applications if application.status != to_status]
+    if not applications:
+        return []
+
+    answered = set()
+    if to_status in RESPONSE_STATUSES:
+        answered = set(
+            ApplicationEvent.objects.filter(
+                application_id__in=[application.id for application in applications], is_first_response=True
+            ).values_list('application_id', flat=True)
+        )
+
+    events, samples = [], {}
+    for application in applications:
+        first_response = to_status in RESPONSE_STATUSES and application.id not in answered
+        response_seconds = None
+        if first_response:
+            response_seconds = max(0, int((now - application.created_at).total_seconds()))
+            samples.setdefault(application.job_id, []).append(response_seconds)
+        events.append(ApplicationEvent(
+            application_id=application.id, job_id=application.job_id, applicant_id=application.applicant_id,
+            actor=actor, from_status=application.status, to_status=to_status,
+            is_first_response=first_response, response_seconds=response_seconds, created_at=now
+        ))
+    ApplicationEvent.objects.bulk_create(events)
+    add_response_times(samples)
+    return events
+
+
+def rebuild_response_stats():
+    """Пересчитывает статистику всех вакансий по журналу (восстановление после сбоев)"""
+    samples = {}
+    first_responses = ApplicationEvent.objects.filter(is_first_response=True).values_list('job_id', 'response_seconds')
+    for job_id, seconds in first_responses.iterator():
+        samples.setdefault(job_id, []).append(seconds)
+    JobResponseStats.objects.all().delete()
+    add_response_times(samples)
+    return len(samples)
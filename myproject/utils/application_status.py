@@ -0,0 +1,71 @@
+from django.db import transaction
+from django.utils import timezone
+
+from ..exceptions import InvalidApplicationStatusError, PermissionError, ValidationError
+from ..models import Application
+from .outbox import enqueue
+from .application_events import record_status_change
+from .counters import invalidate_counters
+
+MAX_BULK_APPLICATIONS = 500
+
+
+def parse_application_ids(raw_ids):
+    """Проверяет список id заявок из запроса и убирает повторы"""
+    if not isinstance(raw_ids, list) or not raw_ids:
+        raise ValidationError('Передайте непустой список application_ids')
+    if len(raw_ids) > MAX_BULK_APPLICATIONS:
+        raise ValidationError(f'За один запрос можно изменить не больше {MAX_BULK_APPLICATIONS} заявок')
+    try:
+        return list(dict.fromkeys(int(application_id) for application_id in raw_ids))
+    except (TypeError, ValueError):
+        raise ValidationError('application_ids должен содержать числовые id заявок')
+
+
+def bulk_update_status(employer, application_ids, new_status):
+    """
+    Меняет статус набора заявок работодателя в одной транзакции:
+    один SELECT с проверкой владельца, один UPDATE, записи журнала статусов
+    и одно событие outbox, по которому обработчик создаст уведомления
+    и сообщения о принятии.
+
+    Если хотя бы одна заявка не найдена или относится к чужой вакансии,
+    ничего не меняется. Заявки, уже находящиеся в new_status, пропускаются.
+    Возвращает список измененных заявок.
+    """
+    if new_status not in dict(Application.STATUS_CHOICES):
+        raise InvalidApplicationStatusError()
+
+    with transaction.atomic():
+        applications = list(
+            Application.objects.select_for_update()
+            .filter(id__in=application_ids, job__employer=employer)
+            .select_related('job')
+            .only('id', 'status', 'applicant_id', 'created_at', 'job__id', 'job__title')
+        )
+        foreign = set(application_ids) - {application.id for application in applications}
+        if foreign:
+            raise PermissionError(
+                'Нет прав для изменения заявок: ' + ', '.join(str(pk) for pk in sorted(foreign))
+            )
+
+        changed = [application for application in applications if application.status != new_status]
+        if not changed:
+            return []
+
+        now = timezone.now()
+        record_status_change(changed, new_status, employer, now)
+        Application.objects.filter(id__in=[application.id for application in changed]).update(
+            status=new_status, updated_at=now
+        )
+        enqueue('application_status', {
+            'application_ids': [application.id for application in changed],
+            'status': new_status,
+            'employer_id': employer.id,
+        })
+        # UPDATE не вызывает сигналы: счетчики заявок на рассмотрении сбрасываются явно
+        invalidate_counters({employer.id, *(application.applicant_id for application in changed)})
+
+    for application in changed:
+        application.status = new_status
+    return changed
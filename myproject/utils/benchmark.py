@@ -0,0 +1,226 @@
+import asyncio
+import contextlib
+import io
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from importlib import import_module
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+# Поток событий (SSE), который держат открытым клиенты с --streams
+STREAM_PATH = '/api/events/'
+
+
+def benchmark_host():
+    hosts = [host for host in settings.ALLOWED_HOSTS if host != '*' and not host.startswith('.')]
+    return hosts[0] if hosts else 'localhost'
+
+
+def login_cookie(user):
+    """Сессия пользователя для запросов бенчмарка: (cookie, функция удаления)"""
+    session = import_module(settings.SESSION_ENGINE).SessionStore()
+    session[SESSION_KEY] = str(user.pk)
+    session[BACKEND_SESSION_KEY] = settings.AUTHENTICATION_BACKENDS[0]
+    session[HASH_SESSION_KEY] = user.get_session_auth_hash()
+    session.create()
+    return f'{settings.SESSION_COOKIE_NAME}={session.session_key}', session.delete
+
+
+@contextmanager
+def query_latency(seconds):
+    """
+    Добавляет задержку к каждому SQL-запросу во всех потоках - имитация
+    сетевой БД. Локальный SQLite отвечает за микросекунды, и разница между
+    моделями исполнения иначе не видна.
+    """
+    if not seconds:
+        yield
+        return
+
+    def delay(execute, sql, params, many, context):
+        time.sleep(seconds)
+        return execute(sql, params, many, context)
+
+    def install(sender, connection, **kwargs):
+        # Соединение потока переоткрывается после каждого запроса
+        if delay not in connection.execute_wrappers:
+            connection.execute_wrappers.append(delay)
+
+    connection_created.connect(install)
+    for connection in connections.all(initialized_only=True):
+        install(None, connection)
+    try:
+        yield
+    finally:
+        connection_created.disconnect(install)
+        for connection in connections.all(initialized_only=True):
+            if delay in connection.execute_wrappers:
+                connection.execute_wrappers.remove(delay)
+
+
+def summarize(mode, latencies, statuses, elapsed, concurrency):
+    latencies = sorted(latencies)
+    counts = {}
+    for status in statuses:
+        counts[status] = counts.get(status, 0) + 1
+    return {
+        'mode': mode,
+        'requests': len(latencies),
+        'concurrency': concurrency,
+        'seconds': elapsed,
+        'rps': len(latencies) / elapsed if elapsed else 0,
+        'p50_ms': statistics.median(latencies) * 1000,
+        'p95_ms': latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000,
+        'statuses': counts,
+    }
+
+
+async def _asgi_request(application, host, path, cookie):
+    url = urlsplit(path)
+    headers = [(b'host', host.encode())]
+    if cookie:
+        headers.append((b'cookie', cookie.encode()))
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': 'GET',
+        'scheme': 'http',
+        'path': url.path,
+        'raw_path': url.path.encode(),
+        'query_string': url.query.encode(),
+        'root_path': '',
+        'headers': headers,
+        'client': ('127.0.0.1', 0),
+        'server': (host, 80),
+    }
+    body_sent = False
+    response = {}
+
+    async def receive():
+        nonlocal body_sent
+        if not body_sent:
+            body_sent = True
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+        # Клиент не отключается: Django отменит ожидание после ответа
+        await asyncio.Event().wait()
+
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            response['status'] = message['status']
+
+    started = time.perf_counter()
+    await application(scope, receive, send)
+    return time.perf_counter() - started, response.get('status')
+
+
+async def _asgi_round(application, host, paths, requests, concurrency, cookie, streams=0):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(index):
+        async with semaphore:
+            return await _asgi_request(application, host, paths[index % len(paths)], cookie)
+
+    async def stream():
+        # Клиент EventSource переподключается, когда сервер закрывает поток
+        while True:
+            await _asgi_request(application, host, STREAM_PATH, cookie)
+
+    holders = [asyncio.create_task(stream()) for _ in range(streams)]
+    try:
+        return await asyncio.gather(*(one(index) for index in range(requests)))
+    finally:
+        for holder in holders:
+            holder.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await asyncio.gather(*holders)
+
+
+def run_asgi(paths, requests, concurrency, cookie=None, streams=0):
+    """
+    Все запросы в одном цикле событий одного процесса, как в ASGI-воркере:
+    одновременно обрабатывается до concurrency запросов. streams - сколько
+    клиентов все это время держат открытым поток событий
+    """
+    from myproject.asgi import application
+    host = benchmark_host()
+    started = time.perf_counter()
+    results = asyncio.run(_asgi_round(application, host, paths, requests, concurrency, cookie, streams))
+    elapsed = time.perf_counter() - started
+    return summarize('asgi', [r[0] for r in results], [r[1] for r in results], elapsed, concurrency)
+
+
+def _wsgi_request(application, host, path, cookie):
+    url = urlsplit(path)
+    environ = {
+        'REQUEST_METHOD': 'GET',
+        'SCRIPT_NAME': '',
+        'PATH_INFO': url.path,
+        'QUERY_STRING': url.query,
+        'SERVER_NAME': host,
+        'SERVER_PORT': '80',
+        'SERVER_PROTOCOL': 'HTTP/1.1',
+        'HTTP_HOST': host,
+        'REMOTE_ADDR': '127.0.0.1',
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': 'http',
+        'wsgi.input': io.BytesIO(),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': False,
+        'wsgi.run_once': False,
+    }
+    if cookie:
+        environ['HTTP_COOKIE'] = cookie
+    response = {}
+
+    def start_response(status, headers, exc_info=None):
+        response['status'] = int(status.split()[0])
+
+    started = time.perf_counter()
+    result = application(environ, start_response)
+    try:
+        for _ in result:
+            pass
+    finally:
+        if hasattr(result, 'close'):
+            result.close()
+    return time.perf_counter() - started, response.get('status')
+
+
+def run_wsgi(paths, requests, threads, concurrency, cookie=None, streams=0):
+    """
+    Синхронный путь: WSGI-воркер с пулом из threads потоков (как gunicorn
+    --threads). Запросы сверх числа потоков ждут в очереди. Открытый поток
+    событий занимает поток воркера до EVENT_STREAM_MAX_AGE, после чего
+    клиент переподключается и снова встает в очередь
+    """
+    from myproject.wsgi import application
+    host = benchmark_host()
+    stopped = threading.Event()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        def stream():
+            _wsgi_request(application, host, STREAM_PATH, cookie)
+            if not stopped.is_set():
+                pool.submit(stream)
+
+        for _ in range(streams):
+            pool.submit(stream)
+        try:
+            results = list(pool.map(
+                lambda index: _wsgi_request(application, host, paths[index % len(paths)], cookie),
+                range(requests)
+            ))
+            elapsed = time.perf_counter() - started
+        finally:
+            stopped.set()
+    return summarize(f'wsgi x{threads}', [r[0] for r in results], [r[1] for r in results], elapsed, concurrency)
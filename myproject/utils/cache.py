@@ -0,0 +1,75 @@
+import hashlib
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+
+JOBS_VERSION_KEY = 'jobs:version'
+
+
+def get_jobs_version():
+    """
+    Текущая версия данных доски вакансий. Входит во все ключи кеша
+    списков, поэтому после ее увеличения старые записи просто не читаются.
+    """
+    version = cache.get(JOBS_VERSION_KEY)
+    if version is None:
+        cache.add(JOBS_VERSION_KEY, 1, None)
+        version = cache.get(JOBS_VERSION_KEY, 1)
+    return version
+
+
+def bump_jobs_version():
+    """Инвалидирует все закешированные списки вакансий"""
+    try:
+        return cache.incr(JOBS_VERSION_KEY)
+    except ValueError:
+        # Ключ вытеснен или еще не создан
+        cache.add(JOBS_VERSION_KEY, 1, None)
+        return cache.incr(JOBS_VERSION_KEY)
+
+
+async def aget_jobs_version():
+    """Асинхронный вариант get_jobs_version"""
+    version = await cache.aget(JOBS_VERSION_KEY)
+    if version is None:
+        await cache.aadd(JOBS_VERSION_KEY, 1, None)
+        version = await cache.aget(JOBS_VERSION_KEY, 1)
+    return version
+
+
+def jobs_cache_key(namespace, params=None, version=None):
+    """
+    Ключ кеша для списка вакансий: пространство имен, версия и параметры фильтра
+    """
+    if params is not None and hasattr(params, 'lists'):
+        items = sorted((key, value) for key, values in params.lists() for value in values)
+    else:
+        items = sorted((params or {}).items())
+    digest = hashlib.md5(urlencode(items).encode()).hexdigest()
+    if version is None:
+        version = get_jobs_version()
+    return f'jobs:{namespace}:v{version}:{digest}'
+
+
+def get_or_set_jobs_cache(namespace, params, compute):
+    """
+    Возвращает значение из кеша или вычисляет и сохраняет его.
+    Время жизни большое: актуальность обеспечивает версия в ключе.
+    """
+    key = jobs_cache_key(namespace, params)
+    value = cache.get(key)
+    if value is None:
+        value = compute()
+        cache.set(key, value, getattr(settings, 'JOBS_CACHE_TIMEOUT', 3600))
+    return value
+
+
+async def aget_or_set_jobs_cache(namespace, params, compute):
+    """Асинхронный вариант get_or_set_jobs_cache; compute - корутинная функция"""
+    key = jobs_cache_key(namespace, params, await aget_jobs_version())
+    value = await cache.aget(key)
+    if value is None:
+        value = await compute()
+        await cache.aset(key, value, getattr(settings, 'JOBS_CACHE_TIMEOUT', 3600))
+    return value
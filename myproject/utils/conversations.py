@@ -0,0 +1,110 @@
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, Value, When
+from django.db.models.functions import Greatest
+
+from ..models import Conversation, ConversationParticipant, Message
+from .counters import invalidate_counters
+from .events import publish_events
+
+
+def conversation_key(application_id, user_id, partner_id):
+    """Ключ чата: заявка и участники в порядке возрастания id"""
+    first, second = sorted((user_id, partner_id))
+    return application_id, first, second
+
+
+def record_messages(messages):
+    """
+    Учитывает новые (уже сохраненные) сообщения в чатах: создает чат
+    при первом сообщении, обновляет last_message и увеличивает счетчики
+    непрочитанных получателей. Счетчики меняются UPDATE ... SET
+    unread_count = unread_count + n, поэтому параллельные отправки не
+    теряют приращений.
+    """
+    groups = {}
+    for message in messages:
+        groups.setdefault(
+            conversation_key(message.application_id, message.sender_id, message.receiver_id), []
+        ).append(message)
+    if not groups:
+        return
+
+    with transaction.atomic():
+        for (application_id, first, second), group in groups.items():
+            last = max(group, key=lambda message: (message.created_at, message.pk))
+            unread = Counter(message.receiver_id for message in group)
+            conversation, created = Conversation.objects.get_or_create(
+                application_id=application_id, first_user_id=first, second_user_id=second,
+                defaults={'last_message': last, 'last_message_at': last.created_at},
+            )
+            if created:
+                # Для сообщения самому себе first == second, и участник один
+                members = {first: second, second: first}
+                ConversationParticipant.objects.bulk_create([
+                    ConversationParticipant(
+                        conversation=conversation, user_id=user_id, partner_id=partner_id,
+                        unread_count=unread[user_id], last_message_at=last.created_at,
+                    )
+                    for user_id, partner_id in members.items()
+                ])
+                continue
+
+            Conversation.objects.filter(pk=conversation.pk, last_message_at__lte=last.created_at).update(
+                last_message=last, last_message_at=last.created_at
+            )
+            ConversationParticipant.objects.filter(conversation=conversation).update(
+                last_message_at=Greatest(F('last_message_at'), Value(last.created_at)),
+                unread_count=F('unread_count') + Case(
+                    *[When(user_id=user_id, then=Value(count)) for user_id, count in unread.items()],
+                    default=Value(0),
+                    output_field=IntegerField(),
+                ),
+            )
+    receivers = {message.receiver_id for group in groups.values() for message in group}
+    invalidate_counters(receivers)
+    publish_events(receivers)
+
+
+def _participant(user_id, application_id, partner_id):
+    application_id, first, second = conversation_key(application_id, user_id, partner_id)
+    return ConversationParticipant.objects.filter(
+        user_id=user_id,
+        conversation__application_id=application_id,
+        conversation__first_user_id=first,
+        conversation__second_user_id=second,
+    )
+
+
+def mark_conversation_read(user, application_id, partner_id):
+    """
+    Помечает прочитанными сообщения собеседника в чате и уменьшает
+    счетчик непрочитанных пользователя на их количество.
+    Возвращает количество прочитанных сообщений.
+    """
+    with transaction.atomic():
+        read = Message.objects.filter(
+            application_id=application_id, sender_id=partner_id, receiver=user, is_read=False
+        ).update(is_read=True)
+        if read:
+            _participant(user.pk, application_id, partner_id).update(
+                unread_count=Greatest(F('unread_count') - read, Value(0))
+            )
+            invalidate_counters([user.pk])
+    return read
+
+
+def recount_unread(user_id, application_id, partner_id):
+    """
+    Пересчитывает счетчик непрочитанных по сообщениям. Для редких путей
+    (правка или удаление отдельного сообщения), где приращение неизвестно.
+    """
+    participant = _participant(user_id, application_id, partner_id).values_list('pk', flat=True).first()
+    if participant is None:
+        return
+    unread = Message.objects.filter(
+        application_id=application_id, sender_id=partner_id, receiver_id=user_id, is_read=False
+    ).count()
+    ConversationParticipant.objects.filter(pk=participant).update(unread_count=unread)
+    invalidate_counters([user_id])
@@ -0,0 +1,105 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Sum
+
+from ..models import Application, ConversationParticipant, Job, Notification
+
+
+def counters_version_key(user_id):
+    return f'counters:{user_id}:version'
+
+
+def counters_key(user_id, version):
+    return f'counters:{user_id}:v{version}'
+
+
+def get_counters_version(user_id):
+    """
+    Версия счетчиков пользователя. Если ключ вытеснен, новая версия
+    берется от текущего времени, чтобы не совпасть с уже выданным ETag.
+    """
+    key = counters_version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns() // 1000, None)
+        version = cache.get(key)
+    return version
+
+
+def _bump(user_ids):
+    for user_id in user_ids:
+        try:
+            cache.incr(counters_version_key(user_id))
+        except ValueError:
+            # Ключа нет - следующее чтение создаст новую версию само
+            pass
+
+
+def invalidate_counters(user_ids):
+    """
+    Сбрасывает счетчики пользователей. Версия увеличивается сразу и еще раз
+    после коммита: запрос, успевший между ними закешировать старые данные
+    под новой версией, не оставит их надолго.
+    """
+    user_ids = {user_id for user_id in user_ids if user_id is not None}
+    if not user_ids:
+        return
+    _bump(user_ids)
+    transaction.on_commit(lambda: _bump(user_ids))
+
+
+def invalidate_application_counters(applications):
+    """Счетчики заявителей и работодателей при создании, удалении и смене статуса заявок"""
+    user_ids, job_ids = set(), set()
+    for application in applications:
+        user_ids.add(application.applicant_id)
+        if Application.job.is_cached(application):
+            user_ids.add(application.job.employer_id)
+        else:
+            job_ids.add(application.job_id)
+    if job_ids:
+        user_ids.update(Job.objects.filter(pk__in=job_ids).values_list('employer_id', flat=True))
+    invalidate_counters(user_ids)
+
+
+def compute_counters(user):
+    """Счетчики для бейджей: непрочитанные уведомления и сообщения, заявки на рассмотрении"""
+    if user.role == 'employer':
+        pending = Application.objects.filter(job__employer=user, status='pending')
+    else:
+        pending = Application.objects.filter(applicant=user, status='pending')
+    return {
+        'unread_notifications': Notification.objects.filter(user=user, is_read=False).count(),
+        'unread_messages': ConversationParticipant.objects.filter(user=user).aggregate(
+            total=Sum('unread_count')
+        )['total'] or 0,
+        'pending_applications': pending.count(),
+    }
+
+
+def get_cached_counters(user_id):
+    """
+    Запись счетчиков текущей версии без обращения к БД: (версия, запись).
+    Запись равна None, если ее еще нет в кеше.
+    """
+    version = get_counters_version(user_id)
+    return version, cache.get(counters_key(user_id, version))
+
+
+def get_counters(user):
+    """
+    Счетчики пользователя из кеша; при промахе считаются и сохраняются
+    под текущей версией. Вместе с ними хранится хеш сессии, по которому
+    повторный запрос проверяется без загрузки пользователя.
+    """
+    version, record = get_cached_counters(user.pk)
+    if record is None:
+        record = {
+            'counters': compute_counters(user),
+            'auth_hash': user.get_session_auth_hash(),
+        }
+        cache.set(counters_key(user.pk, version), record, getattr(settings, 'COUNTERS_CACHE_TIMEOUT', 3600))
+    return version, record
@@ -0,0 +1,104 @@
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from ..models import Job, JobCard, Application, Favorite, Notification
+from .cache import bump_jobs_version
+from .recommendations import mark_jobs_changed
+from .counters import invalidate_counters
+from .events import publish_events
+
+DEFAULT_BATCH_SIZE = 500
+DEFAULT_REMIND_HOURS = 24
+
+
+def expire_jobs(now=None, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Снимает с публикации вакансии с истекшим дедлайном.
+    Работает пачками: выбирает id по частичному индексу и выполняет
+    один UPDATE на пачку. Повторный запуск ничего не меняет.
+    Возвращает количество снятых вакансий.
+    """
+    now = now or timezone.now()
+    expired = 0
+    while True:
+        ids = list(
+            Job.objects.filter(is_active=True, deadline__lt=now)
+            .order_by('deadline')
+            .values_list('id', flat=True)[:batch_size]
+        )
+        if not ids:
+            break
+        expired += Job.objects.filter(id__in=ids, is_active=True).update(is_active=False)
+        JobCard.objects.filter(pk__in=ids).update(is_active=False)
+        mark_jobs_changed(ids)
+    if expired:
+        # UPDATE не вызывает сигналы, поэтому кеши сбрасываем вручную
+        bump_jobs_version()
+    return expired
+
+
+def _needs_reminder():
+    return Q(deadline_reminder_for__isnull=True) | ~Q(deadline_reminder_for=F('deadline'))
+
+
+def send_deadline_reminders(now=None, hours=DEFAULT_REMIND_HOURS, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Создает уведомления о скором дедлайне для соискателей с заявками
+    на рассмотрении и пользователей, добавивших вакансию в избранное.
+
+    Каждая вакансия сначала "захватывается" условным UPDATE поля
+    deadline_reminder_for, поэтому параллельные или повторные запуски
+    не создают дубликатов. Если работодатель перенесет дедлайн,
+    напоминание будет отправлено снова уже для нового срока.
+    Возвращает количество созданных уведомлений.
+    """
+    now = now or timezone.now()
+    horizon = now + timedelta(hours=hours)
+    created = 0
+    while True:
+        candidates = list(
+            Job.objects.filter(is_active=True, deadline__gte=now, deadline__lte=horizon)
+            .filter(_needs_reminder())
+            .order_by('deadline')
+            .values_list('id', 'title', 'deadline')[:batch_size]
+        )
+        if not candidates:
+            break
+
+        with transaction.atomic():
+            jobs = {}
+            for job_id, title, deadline in candidates:
+                claimed = Job.objects.filter(id=job_id, deadline=deadline).filter(_needs_reminder()).update(
+                    deadline_reminder_for=F('deadline')
+                )
+                if claimed:
+                    jobs[job_id] = (title, deadline)
+            if not jobs:
+                continue
+
+            recipients = set(
+                Application.objects.filter(job_id__in=jobs, status='pending')
+                .values_list('job_id', 'applicant_id')
+            )
+            recipients.update(
+                Favorite.objects.filter(job_id__in=jobs).values_list('job_id', 'user_id')
+            )
+            notifications = []
+            for job_id, user_id in sorted(recipients):
+                title, deadline = jobs[job_id]
+                notifications.append(Notification(
+                    user_id=user_id,
+                    title='Скоро дедлайн',
+                    content=f'Прием заявок на вакансию "{title}" закончится '
+                            f'{timezone.localtime(deadline).strftime("%d.%m.%Y %H:%M")}',
+                    type='deadline'
+                ))
+            Notification.objects.bulk_create(notifications, batch_size=batch_size)
+            users = {user_id for _, user_id in recipients}
+            invalidate_counters(users)
+            publish_events(users)
+            created += len(notifications)
+    return created
@@ -0,0 +1,176 @@
+import asyncio
+import json
+import threading
+import time
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max
+
+from ..models import Message, Notification
+from ..serializers import LastMessageSerializer, NotificationSerializer
+
+# Событий каждого типа за один запрос к БД
+EVENT_BATCH_SIZE = 100
+
+
+class EventBroker:
+    """
+    Pub/sub внутри процесса: подписчик - открытый поток событий пользователя.
+    Публикация только будит подписчиков, сами события читаются из БД по курсору,
+    поэтому пропущенный или лишний сигнал ничего не ломает. События, записанные
+    другим процессом, поток подхватит при очередном опросе БД.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = {}
+
+    def subscribe(self, user_id):
+        subscription = Subscription(self, user_id)
+        with self._lock:
+            self._subscribers.setdefault(user_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.user_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.user_id]
+
+    def publish(self, user_ids):
+        """Будит потоки пользователей. Можно вызывать из любого потока"""
+        with self._lock:
+            subscriptions = [
+                subscription
+                for user_id in set(user_ids)
+                for subscription in self._subscribers.get(user_id, ())
+            ]
+        for subscription in subscriptions:
+            subscription.notify()
+
+
+class Subscription:
+    def __init__(self, broker, user_id):
+        self.broker = broker
+        self.user_id = user_id
+        self._loop = asyncio.get_running_loop()
+        self._event = asyncio.Event()
+
+    def notify(self):
+        self._loop.call_soon_threadsafe(self._event.set)
+
+    async def wait(self, timeout):
+        """Ждет сигнала не дольше timeout секунд. Возвращает False по таймауту"""
+        try:
+            await asyncio.wait_for(self._event.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        self._event.clear()
+        return True
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+broker = EventBroker()
+
+
+def publish_events(user_ids):
+    """Сигнал потокам событий пользователей после коммита текущей транзакции"""
+    user_ids = {user_id for user_id in user_ids if user_id is not None}
+    if user_ids:
+        transaction.on_commit(lambda: broker.publish(user_ids))
+
+
+def parse_event_id(value):
+    """
+    Курсор из Last-Event-ID: "<id уведомления>.<id сообщения>" последнего
+    отправленного события каждого типа. Для неверного значения - None
+    """
+    try:
+        notification_id, message_id = (int(part) for part in value.split('.'))
+    except (AttributeError, ValueError):
+        return None
+    if notification_id < 0 or message_id < 0:
+        return None
+    return notification_id, message_id
+
+
+def format_event_id(cursor):
+    return '%d.%d' % cursor
+
+
+async def current_cursor(user_id):
+    """Курсор на последние существующие события: поток начнется с новых"""
+    notifications = await Notification.objects.filter(user_id=user_id).aaggregate(last=Max('id'))
+    chat_messages = await Message.objects.filter(receiver_id=user_id).aaggregate(last=Max('id'))
+    return notifications['last'] or 0, chat_messages['last'] or 0
+
+
+async def fetch_events(user_id, cursor):
+    """
+    События после курсора в порядке создания: список (тип, объект) и признак,
+    что выбрана не вся очередь. Курсор по id, а не по времени, чтобы не терять
+    события с одинаковым created_at
+    """
+    notification_id, message_id = cursor
+    notifications = [
+        notification async for notification in
+        Notification.objects.filter(user_id=user_id, id__gt=notification_id).order_by('id')[:EVENT_BATCH_SIZE]
+    ]
+    chat_messages = [
+        message async for message in
+        Message.objects.filter(receiver_id=user_id, id__gt=message_id).order_by('id')[:EVENT_BATCH_SIZE]
+    ]
+    events = [('notification', notification) for notification in notifications]
+    events += [('message', message) for message in chat_messages]
+    events.sort(key=lambda event: (event[1].created_at, event[0], event[1].id))
+    more = EVENT_BATCH_SIZE in (len(notifications), len(chat_messages))
+    return events, more
+
+
+def event_data(kind, obj):
+    if kind == 'notification':
+        return NotificationSerializer(obj).data
+    return {**LastMessageSerializer(obj).data, 'application': obj.application_id}
+
+
+def format_event(kind, data, event_id):
+    payload = json.dumps(data, ensure_ascii=False, default=str)
+    return f'id: {event_id}\nevent: {kind}\ndata: {payload}\n\n'
+
+
+async def stream_events(user_id, cursor):
+    """
+    Поток Server-Sent Events пользователя: новые уведомления и сообщения чатов.
+    Между выборками поток ждет сигнала брокера; если его нет дольше
+    EVENT_STREAM_POLL_INTERVAL, БД опрашивается сама, а клиенту уходит
+    комментарий-пинг, чтобы прокси не закрыли соединение. Через
+    EVENT_STREAM_MAX_AGE поток закрывается, и браузер переподключается
+    с Last-Event-ID.
+    """
+    poll_interval = getattr(settings, 'EVENT_STREAM_POLL_INTERVAL', 15)
+    deadline = time.monotonic() + getattr(settings, 'EVENT_STREAM_MAX_AGE', 30 * 60)
+    subscription = broker.subscribe(user_id)
+    try:
+        yield 'retry: %d\n\n' % (getattr(settings, 'EVENT_STREAM_RETRY', 3) * 1000)
+        while True:
+            events, more = await fetch_events(user_id, cursor)
+            for kind, obj in events:
+                if kind == 'notification':
+                    cursor = obj.id, cursor[1]
+                else:
+                    cursor = cursor[0], obj.id
+                yield format_event(kind, event_data(kind, obj), format_event_id(cursor))
+            if more:
+                continue
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            if not await subscription.wait(min(poll_interval, remaining)):
+                yield ': ping\n\n'
+    finally:
+        subscription.close()
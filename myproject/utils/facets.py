@@ -0,0 +1,131 @@
+import hashlib
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Case, CharField, Count, F, Q, Value, When
+
+from ..models import Job, JobCard
+from .cache import get_jobs_version
+
+# (ключ, подпись, нижняя граница включительно, верхняя граница не включительно)
+SALARY_BUCKETS = (
+    ('lt_30000', 'до 30 000 ₽', None, 30000),
+    ('30000_60000', '30 000 – 60 000 ₽', 30000, 60000),
+    ('60000_100000', '60 000 – 100 000 ₽', 60000, 100000),
+    ('gte_100000', 'от 100 000 ₽', 100000, None),
+)
+SALARY_NOT_SPECIFIED = ('not_specified', 'Не указана')
+
+
+def salary_bucket_expression():
+    """SQL-выражение CASE, относящее вакансию к диапазону зарплат"""
+    whens = []
+    for key, label, low, high in SALARY_BUCKETS:
+        condition = Q()
+        if low is not None:
+            condition &= Q(salary__gte=low)
+        if high is not None:
+            condition &= Q(salary__lt=high)
+        whens.append(When(condition, then=Value(key)))
+    return Case(*whens, default=Value(SALARY_NOT_SPECIFIED[0]), output_field=CharField())
+
+
+class JobFacets:
+    """
+    Фасетные счетчики для списка вакансий: по типу, отделу и диапазону зарплат.
+
+    Все счетчики считаются одним GROUP BY по (job_type, department, salary_bucket)
+    поверх базового queryset (без фасетных фильтров). Счетчик каждого фасета
+    учитывает выбранные значения остальных фасетов, но не свое собственное,
+    чтобы пользователь видел, сколько вакансий даст смена значения фильтра.
+    Результат кешируется по сигнатуре SQL базового запроса, выбранным значениям
+    и версии данных вакансий (см. utils.cache).
+    """
+    facet_params = ('job_type', 'department')
+    cache_prefix = 'job_facets'
+
+    def __init__(self, queryset, selected=None):
+        self.queryset = queryset
+        self.selected = {
+            name: str(value) for name, value in (selected or {}).items() if value
+        }
+
+    @classmethod
+    def selected_from(cls, params):
+        """Выбранные значения фасетов из параметров запроса"""
+        return {name: params.get(name) for name in cls.facet_params if params.get(name)}
+
+    @classmethod
+    def apply(cls, queryset, selected):
+        """Применяет выбранные значения фасетов как фильтры"""
+        if selected.get('job_type'):
+            queryset = queryset.filter(job_type=selected['job_type'])
+        if selected.get('department'):
+            queryset = queryset.filter(department_id=selected['department'])
+        return queryset
+
+    def cache_key(self):
+        sql, params = self.queryset.order_by().query.sql_with_params()
+        signature = repr((sql, params, sorted(self.selected.items())))
+        digest = hashlib.md5(signature.encode()).hexdigest()
+        return f'{self.cache_prefix}:v{get_jobs_version()}:{digest}'
+
+    def rows(self):
+        # В карточках вакансий (JobCard) название отдела уже денормализовано
+        is_card = self.queryset.model is JobCard
+        return (
+            self.queryset.order_by()
+            .annotate(
+                salary_bucket=salary_bucket_expression(),
+                department_label=F('department_name') if is_card else F('department__name'),
+            )
+            .values('job_type', 'department_id', 'department_label', 'salary_bucket')
+            .annotate(total=Count('pk'))
+        )
+
+    def compute(self):
+        job_type_counts, department_counts, salary_counts = Counter(), Counter(), Counter()
+        department_names = {}
+        selected_type = self.selected.get('job_type')
+        selected_department = self.selected.get('department')
+
+        for row in self.rows():
+            department_names[row['department_id']] = row['department_label']
+            type_matches = not selected_type or row['job_type'] == selected_type
+            department_matches = not selected_department or str(row['department_id']) == selected_department
+            if department_matches:
+                job_type_counts[row['job_type']] += row['total']
+            if type_matches:
+                department_counts[row['department_id']] += row['total']
+            if type_matches and department_matches:
+                salary_counts[row['salary_bucket']] += row['total']
+
+        salary_choices = [(key, label) for key, label, _, _ in SALARY_BUCKETS] + [SALARY_NOT_SPECIFIED]
+        return {
+            'job_type': [
+                {'value': value, 'label': label, 'count': job_type_counts[value]}
+                for value, label in Job.JOB_TYPE_CHOICES
+            ],
+            'department': [
+                {'value': department_id, 'label': department_names[department_id], 'count': count}
+                for department_id, count in sorted(department_counts.items(), key=lambda item: department_names[item[0]])
+            ],
+            'salary': [
+                {'value': value, 'label': label, 'count': salary_counts[value]}
+                for value, label in salary_choices
+            ],
+        }
+
+    def get(self):
+        key = self.cache_key()
+        facets = cache.get(key)
+        if facets is None:
+            facets = self.compute()
+            cache.set(key, facets, getattr(settings, 'JOBS_CACHE_TIMEOUT', 3600))
+        return facets
+
+    @staticmethod
+    def counts(facets, name):
+        """Словарь значение -> количество для одного фасета (для шаблонов)"""
+        return {str(item['value']): item['count'] for item in facets[name]}
@@ -0,0 +1,204 @@
+import mimetypes
+import re
+from urllib.parse import quote
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.http import Http404, HttpResponse, HttpResponseNotModified, HttpResponseRedirect, StreamingHttpResponse
+from django.utils.http import content_disposition_header, parse_etags, quote_etag
+
+from .streaming import is_asgi_request
+
+DELIVERY_MODES = ('direct', 'x-accel', 'x-sendfile', 'redirect')
+STREAM_CHUNK_SIZE = 64 * 1024
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+def get_delivery_mode():
+    mode = getattr(settings, 'RESUME_DELIVERY', 'direct')
+    if mode not in DELIVERY_MODES:
+        raise ValueError(f'Неизвестный режим отдачи файлов: {mode}')
+    return mode
+
+
+def etag_matches(request, etag):
+    """Проверка If-None-Match (слабое сравнение, как требует RFC 9110)"""
+    header = request.META.get('HTTP_IF_NONE_MATCH')
+    if not header or not etag:
+        return False
+    tags = parse_etags(header)
+    return '*' in tags or etag.removeprefix('W/') in [tag.removeprefix('W/') for tag in tags]
+
+
+def parse_range(header, size):
+    """
+    Разбирает заголовок Range с одним диапазоном.
+    Возвращает (начало, конец включительно), None если диапазон не задан
+    или не поддерживается (тогда отдается весь файл) и False,
+    если диапазон невыполним (416).
+    """
+    match = RANGE_RE.match(header.replace(' ', '')) if header else None
+    if match is None:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # bytes=-500: последние 500 байт
+        length = int(last)
+        if length == 0:
+            return False
+        return max(0, size - length), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        return False
+    return start, end
+
+
+def iter_file_range(storage, name, start, length):
+    with storage.open(name, 'rb') as stored:
+        stored.seek(start)
+        remaining = length
+        while remaining > 0:
+            chunk = stored.read(min(STREAM_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+async def aiter_file_range(storage, name, start, length):
+    """
+    Асинхронный вариант iter_file_range. У хранилищ Django нет async API,
+    поэтому каждое чтение уходит в пул потоков, а цикл событий тем временем
+    обслуживает другие запросы. Синхронный итератор под ASGI Django сначала
+    читает в память целиком, асинхронный под WSGI - тоже.
+    """
+    stored = await sync_to_async(storage.open, thread_sensitive=False)(name, 'rb')
+    try:
+        await sync_to_async(stored.seek, thread_sensitive=False)(start)
+        remaining = length
+        while remaining > 0:
+            chunk = await sync_to_async(stored.read, thread_sensitive=False)(min(STREAM_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+    finally:
+        await sync_to_async(stored.close, thread_sensitive=False)()
+
+
+def file_etag(storage, name):
+    """ETag для файла без известного хеша: по времени изменения и размеру"""
+    try:
+        modified = storage.get_modified_time(name).timestamp()
+        size = storage.size(name)
+    except (NotImplementedError, OSError):
+        return None
+    return quote_etag(f'{int(modified):x}-{size:x}')
+
+
+def direct_response(request, storage, name, etag, content_type, file_iterator=iter_file_range):
+    """Отдача файла самим Django с поддержкой Range / If-Range"""
+    try:
+        size = storage.size(name)
+    except (FileNotFoundError, OSError):
+        raise Http404('Файл не найден на сервере.')
+
+    byte_range = None
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if not if_range or (etag and if_range == etag):
+        byte_range = parse_range(request.META.get('HTTP_RANGE'), size)
+    if byte_range is False:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+        return response
+
+    start, end = byte_range or (0, size - 1)
+    length = max(0, end - start + 1)
+    response = StreamingHttpResponse(
+        file_iterator(storage, name, start, length),
+        status=206 if byte_range else 200,
+        content_type=content_type
+    )
+    response['Content-Length'] = str(length)
+    if byte_range:
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    return response
+
+
+def deliver_file(request, name, filename, etag=None, content_type=None, storage=None, file_iterator=iter_file_range):
+    """
+    Отдает файл из хранилища после того, как права уже проверены.
+
+    Режим задается settings.RESUME_DELIVERY:
+    - direct: поток из Django с Range, ETag и If-None-Match;
+    - x-accel: пустой ответ с X-Accel-Redirect, байты отдает nginx
+      из internal-location settings.RESUME_ACCEL_PREFIX;
+    - x-sendfile: то же для Apache/lighttpd по абсолютному пути;
+    - redirect: 302 на короткоживущую подписанную ссылку хранилища
+      (S3/MinIO), срок жизни settings.RESUME_URL_EXPIRE секунд.
+    Если хранилище не поддерживает выбранный режим, используется direct.
+    """
+    storage = storage or default_storage
+    mode = get_delivery_mode()
+    etag = quote_etag(etag) if etag else file_etag(storage, name)
+    content_type = content_type or mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+
+    if etag_matches(request, etag):
+        response = HttpResponseNotModified()
+        response['ETag'] = etag
+        return response
+
+    disposition = content_disposition_header(True, filename)
+    if mode == 'redirect':
+        try:
+            url = storage.url(
+                name,
+                parameters={'ResponseContentDisposition': disposition},
+                expire=getattr(settings, 'RESUME_URL_EXPIRE', 300)
+            )
+        except TypeError:
+            # Хранилище не умеет подписывать ссылки (локальная файловая система)
+            url = None
+        if url:
+            return HttpResponseRedirect(url)
+
+    response = None
+    if mode == 'x-accel':
+        response = HttpResponse(content_type=content_type)
+        response['X-Accel-Redirect'] = getattr(settings, 'RESUME_ACCEL_PREFIX', '/protected-media/') + quote(name)
+    elif mode == 'x-sendfile':
+        try:
+            path = storage.path(name)
+        except NotImplementedError:
+            path = None
+        if path:
+            response = HttpResponse(content_type=content_type)
+            response['X-Sendfile'] = path
+
+    if response is None:
+        response = direct_response(request, storage, name, etag, content_type, file_iterator)
+        response['Accept-Ranges'] = 'bytes'
+    if etag:
+        response['ETag'] = etag
+    response['Content-Disposition'] = disposition
+    # Резюме - персональные данные: общим кешам хранить их нельзя
+    response['Cache-Control'] = 'private, max-age=0, must-revalidate'
+    return response
+
+
+async def adeliver_file(request, name, filename, etag=None, content_type=None, storage=None):
+    """
+    deliver_file для асинхронных представлений: обращения к хранилищу
+    (размер, время изменения, подпись ссылки) выполняются в пуле потоков.
+    Тело в режиме direct под ASGI читается асинхронным итератором, под WSGI
+    (wsgi.py, runserver) - синхронным: иначе Django собрал бы его в память
+    """
+    file_iterator = aiter_file_range if is_asgi_request(request) else iter_file_range
+    return await sync_to_async(deliver_file, thread_sensitive=False)(
+        request, name, filename, etag=etag, content_type=content_type, storage=storage,
+        file_iterator=file_iterator,
+    )
@@ -0,0 +1,149 @@
+import threading
+from contextlib import contextmanager
+
+from django.db.models import Avg, Count, FloatField, IntegerField, OuterRef, Prefetch, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from ..models import Application, Favorite, Job, JobCard, JobSkill, Review
+
+# Поля, которые копируются из вакансии как есть
+JOB_FIELDS = ('title', 'description', 'job_type', 'salary', 'created_at', 'deadline', 'is_active', 'department_id', 'employer_id')
+COUNTER_FIELDS = ('applications_count', 'favorites_count', 'reviews_count', 'avg_rating')
+CARD_FIELDS = JOB_FIELDS + ('department_name', 'employer_name', 'skills') + COUNTER_FIELDS
+BATCH_SIZE = 500
+
+# Вакансии, пересборка карточек которых отложена (deferred_job_card_refresh)
+_deferred = threading.local()
+
+
+def _per_job(queryset, aggregate, output_field):
+    """Коррелированный подзапрос с агрегатом по строкам одной вакансии"""
+    return Subquery(
+        queryset.filter(job_id=OuterRef('pk')).order_by().values('job_id')
+        .annotate(value=aggregate).values('value'),
+        output_field=output_field,
+    )
+
+
+def card_counters():
+    """
+    Выражения счетчиков карточки для annotate() по вакансиям
+    или update() по карточкам: в обоих случаях pk - id вакансии
+    """
+    def count(model):
+        return Coalesce(_per_job(model.objects.all(), Count('id'), IntegerField()), Value(0))
+    return {
+        'applications_count': count(Application),
+        'favorites_count': count(Favorite),
+        'reviews_count': count(Review),
+        'avg_rating': _per_job(Review.objects.all(), Avg('rating'), FloatField()),
+    }
+
+
+def employer_display_name(user):
+    return user.get_full_name() or user.username
+
+
+def build_job_cards(jobs):
+    """
+    Несохраненные карточки для queryset вакансий: один SELECT
+    с подзапросами счетчиков и один запрос навыков на пачку
+    """
+    jobs = (
+        jobs.select_related('department', 'employer')
+        .prefetch_related(Prefetch('required_skills', JobSkill.objects.select_related('skill').order_by('id')))
+        .annotate(**{f'card_{name}': expression for name, expression in card_counters().items()})
+        .order_by('pk')
+    )
+    for job in jobs.iterator(chunk_size=BATCH_SIZE):
+        yield JobCard(
+            job_id=job.pk,
+            **{name: getattr(job, name) for name in JOB_FIELDS},
+            department_name=job.department.name,
+            employer_name=employer_display_name(job.employer),
+            skills=[
+                {'name': job_skill.skill.name, 'level': job_skill.level, 'is_required': job_skill.is_required}
+                for job_skill in job.required_skills.all()
+            ],
+            **{name: getattr(job, f'card_{name}') for name in COUNTER_FIELDS},
+        )
+
+
+def _batches(cards):
+    batch = []
+    for card in cards:
+        batch.append(card)
+        if len(batch) == BATCH_SIZE:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def refresh_job_cards(job_ids, create=False):
+    """
+    Пересобирает карточки вакансий job_ids.
+
+    create=True - вставляет недостающие карточки (сохранение вакансии,
+    пересборка). Без него обновляются только существующие строки: так
+    сигналы удаляемых каскадом навыков и заявок не воссоздают карточку
+    вакансии, которая удаляется в той же транзакции.
+    """
+    pending = getattr(_deferred, 'pending', None)
+    if pending is not None:
+        for job_id in job_ids:
+            pending[job_id] = pending.get(job_id, False) or create
+        return
+    cards = build_job_cards(Job.objects.filter(pk__in=list(job_ids)))
+    for batch in _batches(cards):
+        if create:
+            JobCard.objects.bulk_create(
+                batch, update_conflicts=True, unique_fields=['job'], update_fields=CARD_FIELDS
+            )
+        else:
+            JobCard.objects.bulk_update(batch, CARD_FIELDS)
+
+
+@contextmanager
+def deferred_job_card_refresh():
+    """
+    Внутри блока refresh_job_cards только запоминает вакансии, а при выходе
+    каждая карточка пересобирается один раз. Для пакетных правок: при
+    замене всех навыков вакансии сигналы иначе пересобирали бы карточку
+    после каждой удаленной и созданной строки. Если блок завершился
+    ошибкой, пересборки нет - вызывать внутри transaction.atomic().
+    """
+    if getattr(_deferred, 'pending', None) is not None:
+        # Вложенный блок: карточки пересоберет внешний
+        yield
+        return
+    _deferred.pending = pending = {}
+    try:
+        yield
+    finally:
+        _deferred.pending = None
+    created = [job_id for job_id, create in pending.items() if create]
+    updated = [job_id for job_id, create in pending.items() if not create]
+    if created:
+        refresh_job_cards(created, create=True)
+    if updated:
+        refresh_job_cards(updated)
+
+
+def refresh_job_card_counters(job_ids):
+    """Пересчет счетчиков карточек одним UPDATE с подзапросами"""
+    return JobCard.objects.filter(pk__in=list(job_ids)).update(**card_counters())
+
+
+def rebuild_job_cards():
+    """Пересобирает карточки всех вакансий (восстановление согласованности)"""
+    cards = 0
+    for batch in _batches(build_job_cards(Job.objects.all())):
+        JobCard.objects.bulk_create(
+            batch, update_conflicts=True, unique_fields=['job'], update_fields=CARD_FIELDS
+        )
+        cards += len(batch)
+    # Карточки без вакансии остаться не могут (каскад), но после сбоев
+    # или ручных правок в БД лишние строки удаляются
+    JobCard.objects.exclude(job__in=Job.objects.values('pk')).delete()
+    return cards
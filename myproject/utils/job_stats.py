@@ -0,0 +1,86 @@
+from django.db.models import Avg, Count, F, IntegerField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from ..models import Application, Favorite, Review
+
+STATUS_FIELD = 'applications_{}'
+
+
+def _per_job(model, aggregate):
+    """Коррелированный подзапрос с агрегатом по строкам model одной вакансии"""
+    return Subquery(
+        model.objects.filter(job=OuterRef('pk'))
+        .order_by()
+        .values('job')
+        .annotate(value=aggregate)
+        .values('value')
+    )
+
+
+def with_job_stats(queryset):
+    """
+    Добавляет к вакансиям статистику одним SQL-запросом:
+    applications_total, applications_<статус> для каждого статуса заявки,
+    favorites_total, avg_rating и median_response_seconds - медиана времени
+    первого ответа из JobResponseStats (один к одному, строки не размножает).
+
+    Заявки считаются условными Count(filter=Q) в GROUP BY по одному JOIN.
+    Избранное и отзывы считаются коррелированными подзапросами в том же
+    SELECT: второй и третий JOIN размножили бы строки заявок (a * f * r
+    строк на вакансию) и исказили бы счетчики.
+    """
+    by_status = {
+        STATUS_FIELD.format(status): Count('applications', filter=Q(applications__status=status))
+        for status, _ in Application.STATUS_CHOICES
+    }
+    return queryset.annotate(
+        applications_total=Count('applications'),
+        **by_status,
+        favorites_total=Coalesce(
+            _per_job(Favorite, Count('id')), Value(0), output_field=IntegerField()
+        ),
+        avg_rating=_per_job(Review, Avg('rating')),
+        median_response_seconds=F('response_stats__median_seconds'),
+    )
+
+
+def status_counts(job):
+    """Список (статус, подпись, количество заявок) для вакансии из with_job_stats()"""
+    return [
+        (status, label, getattr(job, STATUS_FIELD.format(status)))
+        for status, label in Application.STATUS_CHOICES
+    ]
+
+
+def job_stats_to_dict(job):
+    """Статистика одной вакансии из with_job_stats() для JSON-ответа"""
+    applications = {'total': job.applications_total}
+    for status, _, count in status_counts(job):
+        applications[status] = count
+    return {
+        'id': job.id,
+        'title': job.title,
+        'is_active': job.is_active,
+        'created_at': job.created_at,
+        'deadline': job.deadline,
+        'applications': applications,
+        'favorites': job.favorites_total,
+        'avg_rating': round(job.avg_rating, 2) if job.avg_rating is not None else None,
+        'median_response_seconds': (
+            round(job.median_response_seconds) if job.median_response_seconds is not None else None
+        ),
+    }
+
+
+def format_duration(seconds):
+    """'3 дн 4 ч', '2 ч 15 мин', '5 мин' - для таблиц статистики"""
+    if seconds is None:
+        return None
+    minutes = round(seconds / 60)
+    days, minutes = divmod(minutes, 24 * 60)
+    hours, minutes = divmod(minutes, 60)
+    if days:
+        return f'{days} дн {hours} ч'
+    if hours:
+        return f'{hours} ч {minutes} мин'
+    return f'{minutes} мин'
@@ -0,0 +1,61 @@
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from ..exceptions import ValidationError
+from ..models import Notification
+from .counters import invalidate_counters
+
+MAX_BULK_NOTIFICATIONS = 500
+
+
+def parse_notification_selection(data):
+    """
+    Выбор уведомлений из тела запроса: список ids и/или метка времени before
+    (уведомления, созданные не позже нее). Возвращает условия для filter()
+    """
+    ids, before = data.get('ids'), data.get('before')
+    if ids is None and before is None:
+        raise ValidationError('Передайте список ids или метку времени before')
+
+    conditions = {}
+    if ids is not None:
+        if not isinstance(ids, list) or not ids:
+            raise ValidationError('ids должен быть непустым списком')
+        if len(ids) > MAX_BULK_NOTIFICATIONS:
+            raise ValidationError(f'За один запрос можно изменить не больше {MAX_BULK_NOTIFICATIONS} уведомлений')
+        try:
+            conditions['id__in'] = list(dict.fromkeys(int(notification_id) for notification_id in ids))
+        except (TypeError, ValueError):
+            raise ValidationError('ids должен содержать числовые id уведомлений')
+    if before is not None:
+        moment = parse_datetime(before) if isinstance(before, str) else None
+        if moment is None:
+            raise ValidationError('before должен быть датой и временем в формате ISO 8601')
+        if timezone.is_naive(moment):
+            moment = timezone.make_aware(moment)
+        conditions['created_at__lte'] = moment
+    return conditions
+
+
+def mark_notifications_read(user, **conditions):
+    """
+    Помечает прочитанными непрочитанные уведомления пользователя одним UPDATE.
+    Возвращает количество измененных уведомлений
+    """
+    updated = Notification.objects.filter(user=user, is_read=False, **conditions).update(is_read=True)
+    if updated:
+        # UPDATE не вызывает сигналы
+        invalidate_counters([user.pk])
+    return updated
+
+
+def delete_notifications(user, **conditions):
+    """
+    Удаляет уведомления пользователя одним DELETE: у Notification нет
+    обработчиков post_delete и зависимых таблиц, поэтому Django не выбирает
+    строки перед удалением. Возвращает количество удаленных уведомлений
+    """
+    deleted, _ = Notification.objects.filter(user=user, **conditions).delete()
+    if deleted:
+        invalidate_counters([user.pk])
+    return deleted
@@ -0,0 +1,247 @@
+import logging
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from ..models import Application, Message, Notification, OutboxEvent
+from .conversations import record_messages
+from .counters import invalidate_counters
+from .events import publish_events
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 200
+MAX_ATTEMPTS = 5
+# Время, на которое обработчик "арендует" пачку; если процесс упадет,
+# события снова станут доступны другим обработчикам
+LEASE_SECONDS = 300
+
+HANDLERS = {}
+
+
+class LeaseLostError(Exception):
+    """Аренда пачки истекла, и события захватил другой обработчик"""
+
+
+def handler(topic):
+    """Регистрирует обработчик пачки событий одной темы"""
+    def register(func):
+        HANDLERS[topic] = func
+        return func
+    return register
+
+
+def enqueue(topic, payload):
+    """
+    Записывает событие в outbox. Вызывается в транзакции основного изменения,
+    чтобы событие появилось тогда и только тогда, когда изменение сохранено.
+    """
+    return OutboxEvent.objects.create(topic=topic, payload=payload)
+
+
+def retry_delay(attempts):
+    """Экспоненциальная задержка перед повтором: 30 с, 1 мин, 2 мин, ..."""
+    return timedelta(seconds=30 * 2 ** (attempts - 1))
+
+
+def status_notification(application, status):
+    """Уведомление соискателю о смене статуса (без сохранения)"""
+    label = dict(Application.STATUS_CHOICES)[status]
+    return Notification(
+        user_id=application.applicant_id,
+        title='Статус заявки изменен',
+        content=f'Статус вашей заявки на вакансию "{application.job.title}" изменен на "{label}"',
+        type='application_update'
+    )
+
+
+def accepted_message(application, employer_id):
+    """Системное сообщение в чате о принятии заявки (без сохранения)"""
+    return Message(
+        sender_id=employer_id,
+        receiver_id=application.applicant_id,
+        application=application,
+        content=f'Ваша заявка на вакансию "{application.job.title}" была принята. '
+                f'Теперь вы можете общаться с работодателем.'
+    )
+
+
+@handler('application_status')
+def handle_application_status(events):
+    """
+    Уведомления соискателям и системные сообщения о принятии заявки.
+    payload: {"application_ids": [...], "status": "...", "employer_id": ...}
+    """
+    application_ids = {pk for event in events for pk in event.payload['application_ids']}
+    applications = Application.objects.filter(id__in=application_ids).select_related('job').only(
+        'id', 'applicant_id', 'job__id', 'job__title'
+    ).in_bulk()
+
+    notifications, chat_messages = [], []
+    for event in events:
+        status = event.payload['status']
+        for application_id in event.payload['application_ids']:
+            application = applications.get(application_id)
+            if application is None:
+                # Заявку успели удалить - уведомлять не о чем
+                continue
+            notifications.append(status_notification(application, status))
+            if status == 'accepted':
+                chat_messages.append(accepted_message(application, event.payload['employer_id']))
+    Notification.objects.bulk_create(notifications)
+    # bulk_create не вызывает сигналы - чаты и счетчики обновляются явно
+    recipients = {notification.user_id for notification in notifications}
+    invalidate_counters(recipients)
+    publish_events(recipients)
+    record_messages(Message.objects.bulk_create(chat_messages))
+
+
+@handler('message_sent')
+def handle_message_sent(events):
+    """
+    Уведомления получателям новых сообщений.
+    payload: {"message_id": ...}
+    """
+    chat_messages = Message.objects.filter(
+        id__in=[event.payload['message_id'] for event in events]
+    ).select_related('sender', 'application__job').only(
+        'id', 'receiver_id', 'sender__username', 'application__id', 'application__job__title'
+    )
+    notifications = Notification.objects.bulk_create([
+        Notification(
+            user_id=message.receiver_id,
+            title='Новое сообщение',
+            content=f'У вас новое сообщение от {message.sender.username} '
+                    f'по заявке на вакансию "{message.application.job.title}"',
+            type='new_message'
+        )
+        for message in chat_messages
+    ])
+    recipients = {notification.user_id for notification in notifications}
+    invalidate_counters(recipients)
+    publish_events(recipients)
+
+
+def claim_batch(batch_size, now):
+    """
+    Захватывает пачку доступных событий условным UPDATE и возвращает
+    (токен захвата, события). Параллельные обработчики получают
+    непересекающиеся пачки.
+    """
+    ids = list(
+        OutboxEvent.objects.filter(processed_at__isnull=True, available_at__lte=now, attempts__lt=MAX_ATTEMPTS)
+        .order_by('available_at', 'id')
+        .values_list('id', flat=True)[:batch_size]
+    )
+    if not ids:
+        return None, []
+    token = uuid.uuid4().hex
+    OutboxEvent.objects.filter(id__in=ids, processed_at__isnull=True, available_at__lte=now).update(
+        claim_token=token, available_at=now + timedelta(seconds=LEASE_SECONDS)
+    )
+    return token, list(OutboxEvent.objects.filter(claim_token=token, processed_at__isnull=True).order_by('id'))
+
+
+def _run(topic, events, token):
+    """
+    Обработчик и отметка об обработке в одной транзакции. Отмечаются только
+    события, которые все еще захвачены этим обработчиком: если аренда
+    истекла и пачку забрал другой процесс, транзакция откатывается.
+    """
+    with transaction.atomic():
+        HANDLERS[topic](events)
+        updated = OutboxEvent.objects.filter(
+            id__in=[event.id for event in events], claim_token=token, processed_at__isnull=True
+        ).update(processed_at=timezone.now(), last_error='')
+        if updated != len(events):
+            raise LeaseLostError(f'Аренда истекла: отмечено {updated} из {len(events)} событий {topic}')
+
+
+def _fail(event, error, now, token):
+    event.attempts += 1
+    OutboxEvent.objects.filter(id=event.id, claim_token=token).update(
+        attempts=event.attempts,
+        last_error=repr(error),
+        available_at=now + retry_delay(event.attempts),
+        claim_token=''
+    )
+    logger.warning('Ошибка обработки события outbox %s (попытка %s): %r', event, event.attempts, error)
+
+
+def process_outbox(batch_size=DEFAULT_BATCH_SIZE, now=None):
+    """
+    Обрабатывает одну пачку событий: события группируются по теме,
+    и каждая группа обрабатывается одним вызовом обработчика (bulk_create).
+    Если группа падает, ее события обрабатываются по одному, чтобы одно
+    "ядовитое" событие не блокировало остальные; упавшие события
+    повторяются с экспоненциальной задержкой до MAX_ATTEMPTS раз.
+    Возвращает (обработано, отложено на повтор).
+    """
+    now = now or timezone.now()
+    by_topic = {}
+    token, events = claim_batch(batch_size, now)
+    for event in events:
+        by_topic.setdefault(event.topic, []).append(event)
+
+    processed = failed = 0
+    for topic, events in by_topic.items():
+        if topic not in HANDLERS:
+            for event in events:
+                _fail(event, LookupError(f'Нет обработчика для темы {topic}'), now, token)
+            failed += len(events)
+            continue
+        try:
+            _run(topic, events, token)
+            processed += len(events)
+            continue
+        except LeaseLostError as error:
+            logger.warning('%s', error)
+            if len(events) == 1:
+                continue
+        except Exception as error:
+            if len(events) == 1:
+                _fail(events[0], error, now, token)
+                failed += 1
+                continue
+        # Пачка упала: ищем виновное событие, обрабатывая по одному.
+        # События, которые забрал другой обработчик, пропускаются
+        for event in events:
+            try:
+                _run(topic, [event], token)
+                processed += 1
+            except LeaseLostError as error:
+                logger.warning('%s', error)
+            except Exception as error:
+                _fail(event, error, now, token)
+                failed += 1
+    return processed, failed
+
+
+def drain_outbox(batch_size=DEFAULT_BATCH_SIZE):
+    """Обрабатывает пачки, пока есть доступные события. Возвращает (обработано, отложено)"""
+    total_processed = total_failed = 0
+    while True:
+        processed, failed = process_outbox(batch_size)
+        total_processed += processed
+        total_failed += failed
+        if not processed and not failed:
+            return total_processed, total_failed
+
+
+def outbox_backlog(now=None, minutes=None):
+    """
+    Состояние очереди для проверки здоровья обработчика. Возвращает
+    (число событий, ждущих дольше minutes минут, число событий,
+    исчерпавших попытки). Ненулевые значения означают, что обработчик
+    не запущен, не успевает или события падают.
+    """
+    now = now or timezone.now()
+    if minutes is None:
+        minutes = settings.OUTBOX_BACKLOG_ALERT_MINUTES
+    pending = OutboxEvent.objects.filter(processed_at__isnull=True)
+    stale = pending.filter(attempts__lt=MAX_ATTEMPTS, created_at__lt=now - timedelta(minutes=minutes)).count()
+    dead = pending.filter(attempts__gte=MAX_ATTEMPTS).count()
+    return stale, dead
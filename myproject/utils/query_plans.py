@@ -0,0 +1,81 @@
+import re
+
+from django.db import connection
+from django.db.models import Q
+from django.utils import timezone
+
+from ..models import Job, JobCard, Message, Notification, Application, OutboxEvent, ConversationParticipant
+
+# Полный проход по таблице без индекса: "SCAN myproject_job"
+FULL_SCAN_RE = re.compile(r'^SCAN (\S+)$')
+
+# Идентификаторы-заглушки: план запроса не зависит от наличия строк
+SAMPLE_ID = 1
+
+
+def hot_queries():
+    """
+    Горячие запросы из views.py и api/viewsets.py в виде (название, queryset).
+    При добавлении новых списков и фильтров их стоит добавить сюда.
+    """
+    return [
+        ('home: последние активные вакансии',
+         JobCard.objects.filter(is_active=True).order_by('-created_at')[:5]),
+        ('job_list: тип и отдел',
+         JobCard.objects.filter(is_active=True, job_type='internship', department_id=SAMPLE_ID).order_by('-created_at')),
+        ('job_list: тип',
+         JobCard.objects.filter(is_active=True, job_type='internship').order_by('-created_at')),
+        ('expire_jobs: истекшие активные вакансии',
+         Job.objects.filter(is_active=True, deadline__lt=timezone.now()).order_by('deadline')[:500]),
+        ('JobViewSet: курсорная страница',
+         Job.objects.order_by('-created_at', '-id')[:11]),
+        ('JobViewSet: сортировка по дедлайну',
+         Job.objects.order_by('deadline', 'id')[:11]),
+        ('JobViewSet: фильтр по зарплате',
+         Job.objects.filter(salary__gte=30000, salary__lte=60000)),
+        ('MessageViewSet: сообщения пользователя',
+         Message.objects.filter(Q(sender_id=SAMPLE_ID) | Q(receiver_id=SAMPLE_ID)).order_by('-created_at', '-id')[:11]),
+        ('messages_list: чаты пользователя',
+         ConversationParticipant.objects.filter(user_id=SAMPLE_ID).order_by('-last_message_at', '-id')[:21]),
+        ('mark_conversation_read: непрочитанные в чате',
+         Message.objects.filter(application_id=SAMPLE_ID, sender_id=SAMPLE_ID, receiver_id=SAMPLE_ID, is_read=False)),
+        ('application_detail: история чата',
+         Message.objects.filter(application_id=SAMPLE_ID).order_by('created_at')),
+        ('NotificationViewSet: уведомления пользователя',
+         Notification.objects.filter(user_id=SAMPLE_ID).order_by('-created_at', '-id')[:11]),
+        ('Notification: непрочитанные',
+         Notification.objects.filter(user_id=SAMPLE_ID, is_read=False)),
+        ('ApplicationViewSet: заявки работодателя по статусу',
+         Application.objects.filter(job__employer_id=SAMPLE_ID, status='pending')),
+        ('ApplicationViewSet: заявки студента',
+         Application.objects.filter(applicant_id=SAMPLE_ID).order_by('-created_at', '-id')[:11]),
+        ('process_outbox: очередная пачка событий',
+         OutboxEvent.objects.filter(processed_at__isnull=True, available_at__lte=timezone.now(), attempts__lt=5)
+         .order_by('available_at', 'id')[:200]),
+    ]
+
+
+def plan_details(queryset):
+    """Строки EXPLAIN QUERY PLAN без служебных колонок (id, parent, notused)"""
+    details = []
+    for line in queryset.explain().splitlines():
+        parts = line.strip().split(None, 3)
+        if len(parts) == 4:
+            details.append(parts[3])
+    return details
+
+
+def check_query_plans():
+    """
+    Проверяет планы горячих запросов. Возвращает список
+    (название, план, строки с полным сканированием таблицы).
+    Работает только на SQLite.
+    """
+    if connection.vendor != 'sqlite':
+        return []
+    results = []
+    for name, queryset in hot_queries():
+        details = plan_details(queryset)
+        scans = [detail for detail in details if FULL_SCAN_RE.match(detail)]
+        results.append((name, details, scans))
+    return results
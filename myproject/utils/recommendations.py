@@ -0,0 +1,216 @@
+import threading
+import time
+
+import numpy as np
+from django.core.cache import cache
+from django.db import transaction
+
+from ..models import Job, JobSkill, UserSkill
+
+LEVELS = {'beginner': 1.0, 'intermediate': 2.0, 'advanced': 3.0}
+# Нехватка обязательного навыка штрафуется сильнее, чем желательного
+REQUIRED_WEIGHT = 3.0
+OPTIONAL_WEIGHT = 1.0
+
+VERSION_KEY = 'skill_matrix:version'
+DIRTY_KEY = 'skill_matrix:dirty:{}'
+USER_KEY = 'skill_matrix:user:{}'
+DIRTY_TIMEOUT = 60 * 60
+USER_TIMEOUT = 60 * 60
+# При большом отставании дешевле перестроить матрицу целиком
+MAX_INCREMENTAL_STEPS = 500
+
+
+def _init_version():
+    """
+    Начальная версия берется из времени, чтобы после очистки кеша она
+    не совпала с версией, уже загруженной каким-либо процессом
+    """
+    cache.add(VERSION_KEY, int(time.time() * 1000), None)
+
+
+def _bump_version():
+    try:
+        return cache.incr(VERSION_KEY)
+    except ValueError:
+        _init_version()
+        return cache.incr(VERSION_KEY)
+
+
+def mark_jobs_changed(job_ids):
+    """
+    Отмечает строки матрицы вакансий как устаревшие для всех процессов.
+    Каждый процесс при следующем запросе перечитает только эти строки.
+
+    Версия увеличивается после фиксации транзакции: иначе другой процесс
+    может перечитать строки до COMMIT и закрепить старые данные за новой
+    версией.
+    """
+    job_ids = list(job_ids)
+    if job_ids:
+        def bump():
+            version = _bump_version()
+            cache.set(DIRTY_KEY.format(version), job_ids, DIRTY_TIMEOUT)
+        transaction.on_commit(bump)
+
+
+def invalidate_user_skills(user_id):
+    """Сбрасывает закешированный вектор навыков пользователя после фиксации транзакции"""
+    transaction.on_commit(lambda: cache.delete(USER_KEY.format(user_id)))
+
+
+class SkillMatrix:
+    """
+    Матрицы уровней навыков "вакансия x навык" (обязательные и желательные)
+    для векторизованного подбора вакансий.
+
+    Матрица живет в памяти процесса и обновляется инкрементально: сигналы
+    JobSkill/Job увеличивают версию в общем кеше и записывают id измененных
+    вакансий, а процесс при следующем запросе перечитывает только эти строки.
+    Векторы навыков пользователей хранятся в общем кеше и сбрасываются
+    сигналами UserSkill.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.version = None
+        self.reset()
+
+    def reset(self):
+        self.job_index = {}
+        self.skill_index = {}
+        self.job_ids = np.zeros(0, dtype=np.int64)
+        self.required = np.zeros((0, 0), dtype=np.float32)
+        self.optional = np.zeros((0, 0), dtype=np.float32)
+        self.active = np.zeros(0, dtype=bool)
+
+    def _ensure_shape(self, rows, columns):
+        # Емкость растет геометрически, чтобы добавление строк и столбцов
+        # не копировало матрицу каждый раз
+        capacity_rows, capacity_columns = self.required.shape
+        if rows <= capacity_rows and columns <= capacity_columns:
+            return
+        grow_rows = max(rows, 2 * capacity_rows) - capacity_rows if rows > capacity_rows else 0
+        grow_columns = max(columns, 2 * capacity_columns) - capacity_columns if columns > capacity_columns else 0
+        padding = ((0, grow_rows), (0, grow_columns))
+        self.required = np.pad(self.required, padding)
+        self.optional = np.pad(self.optional, padding)
+        self.job_ids = np.pad(self.job_ids, (0, grow_rows))
+        self.active = np.pad(self.active, (0, grow_rows))
+
+    def _row(self, job_id):
+        if job_id not in self.job_index:
+            self.job_index[job_id] = len(self.job_index)
+            self._ensure_shape(len(self.job_index), len(self.skill_index))
+            self.job_ids[self.job_index[job_id]] = job_id
+        return self.job_index[job_id]
+
+    def _column(self, skill_id):
+        if skill_id not in self.skill_index:
+            self.skill_index[skill_id] = len(self.skill_index)
+            self._ensure_shape(len(self.job_index), len(self.skill_index))
+        return self.skill_index[skill_id]
+
+    def _load(self, jobs, job_skills):
+        # Индексы вычисляются до обращения к массивам: _row/_column могут их заменить
+        for job_id, is_active in jobs:
+            row = self._row(job_id)
+            self.active[row] = is_active
+        for job_id, skill_id, level, is_required in job_skills:
+            row, column = self._row(job_id), self._column(skill_id)
+            target = self.required if is_required else self.optional
+            target[row, column] = max(target[row, column], LEVELS.get(level, 0.0))
+
+    def rebuild(self):
+        """Полная перестройка матрицы (два запроса)"""
+        self.reset()
+        self._load(
+            Job.objects.values_list('id', 'is_active'),
+            JobSkill.objects.values_list('job_id', 'skill_id', 'level', 'is_required')
+        )
+
+    def refresh_jobs(self, job_ids):
+        """Перечитывает строки указанных вакансий (два запроса)"""
+        job_ids = set(job_ids)
+        for job_id in job_ids & set(self.job_index):
+            row = self.job_index[job_id]
+            self.required[row, :] = 0
+            self.optional[row, :] = 0
+            self.active[row] = False
+        self._load(
+            Job.objects.filter(id__in=job_ids).values_list('id', 'is_active'),
+            JobSkill.objects.filter(job_id__in=job_ids).values_list('job_id', 'skill_id', 'level', 'is_required')
+        )
+
+    def sync(self):
+        """Приводит матрицу процесса к актуальной версии"""
+        current = cache.get(VERSION_KEY)
+        if current is None:
+            _init_version()
+            current = cache.get(VERSION_KEY)
+        with self.lock:
+            if current is None:
+                # Кеш не хранит значения (DummyCache): версионирование невозможно
+                self.rebuild()
+                return
+            if self.version == current:
+                return
+            if self.version is None or current < self.version or current - self.version > MAX_INCREMENTAL_STEPS:
+                self.rebuild()
+            else:
+                keys = [DIRTY_KEY.format(version) for version in range(self.version + 1, current + 1)]
+                dirty = cache.get_many(keys)
+                if len(dirty) < len(keys):
+                    # Часть изменений вытеснена из кеша - надежнее перестроить
+                    self.rebuild()
+                else:
+                    self.refresh_jobs(job_id for job_ids in dirty.values() for job_id in job_ids)
+            self.version = current
+
+    def user_vector(self, user_id):
+        key = USER_KEY.format(user_id)
+        levels = cache.get(key)
+        if levels is None:
+            levels = {
+                skill_id: LEVELS.get(level, 0.0)
+                for skill_id, level in UserSkill.objects.filter(user_id=user_id).values_list('skill_id', 'level')
+            }
+            cache.set(key, levels, USER_TIMEOUT)
+        vector = np.zeros(self.required.shape[1], dtype=np.float32)
+        for skill_id, level in levels.items():
+            column = self.skill_index.get(skill_id)
+            if column is not None:
+                vector[column] = max(vector[column], level)
+        return vector
+
+    def scores(self, user_vector):
+        """
+        Оценка соответствия всех вакансий за один проход:
+        1 - (взвешенная нехватка уровней) / (взвешенная сумма требований).
+        Вакансии без навыков получают NaN.
+        """
+        required_gap = np.clip(self.required - user_vector, 0, None).sum(axis=1)
+        optional_gap = np.clip(self.optional - user_vector, 0, None).sum(axis=1)
+        total = REQUIRED_WEIGHT * self.required.sum(axis=1) + OPTIONAL_WEIGHT * self.optional.sum(axis=1)
+        gap = REQUIRED_WEIGHT * required_gap + OPTIONAL_WEIGHT * optional_gap
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(total > 0, 1.0 - gap / total, np.nan)
+
+    def recommend(self, user_id, limit=10):
+        """Список (id вакансии, оценка) по убыванию оценки среди активных вакансий"""
+        self.sync()
+        with self.lock:
+            if not self.job_index:
+                return []
+            scores = self.scores(self.user_vector(user_id))
+            candidates = np.flatnonzero(self.active & ~np.isnan(scores))
+            order = candidates[np.argsort(-scores[candidates], kind='stable')][:limit]
+            return [(int(self.job_ids[row]), float(scores[row])) for row in order]
+
+
+skill_matrix = SkillMatrix()
+
+
+def recommend_jobs(user_id, limit=10):
+    """Рекомендованные вакансии пользователю по его навыкам"""
+    return skill_matrix.recommend(user_id, limit)
@@ -0,0 +1,142 @@
+import hashlib
+import os
+import re
+from contextlib import contextmanager
+
+from django.core.files.storage import default_storage
+from django.core.files.uploadhandler import TemporaryFileUploadHandler
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+from ..models import ResumeBlob
+
+HASH_CHUNK_SIZE = 64 * 1024
+EXTENSION_RE = re.compile(r'^\.[a-z0-9]{1,10}$')
+
+
+class HashingFileUploadHandler(TemporaryFileUploadHandler):
+    """
+    Пишет загружаемый файл во временный файл на диске и по пути считает
+    SHA-256 каждого пришедшего фрагмента. Файл целиком в памяти не держится,
+    а повторно читать его для хеширования не нужно: хеш доступен
+    в атрибуте sha256 загруженного файла.
+    """
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.hasher = hashlib.sha256()
+
+    def receive_data_chunk(self, raw_data, start):
+        self.hasher.update(raw_data)
+        return super().receive_data_chunk(raw_data, start)
+
+    def file_complete(self, file_size):
+        uploaded = super().file_complete(file_size)
+        uploaded.sha256 = self.hasher.hexdigest()
+        return uploaded
+
+
+def use_hashing_upload_handler(request):
+    """
+    Ставит HashingFileUploadHandler первым для запроса с загрузкой резюме;
+    остальные обработчики (FILE_UPLOAD_HANDLERS) не меняются. Вызывать
+    до чтения request.POST/FILES, в том числе до проверки CSRF.
+    """
+    request.upload_handlers.insert(0, HashingFileUploadHandler(request))
+
+
+def file_sha256(uploaded):
+    """Хеш загруженного файла: из обработчика загрузки или чтением по частям"""
+    digest = getattr(uploaded, 'sha256', None)
+    if digest:
+        return digest
+    hasher = hashlib.sha256()
+    for chunk in uploaded.chunks(HASH_CHUNK_SIZE):
+        hasher.update(chunk)
+    uploaded.seek(0)
+    uploaded.sha256 = hasher.hexdigest()
+    return uploaded.sha256
+
+
+def blob_name(digest, original_name):
+    """resumes/sha256/ab/abcdef....pdf"""
+    extension = os.path.splitext(original_name or '')[1].lower()
+    if not EXTENSION_RE.match(extension):
+        extension = ''
+    return f'resumes/sha256/{digest[:2]}/{digest}{extension}'
+
+
+def acquire_resume(uploaded, written=None):
+    """
+    Возвращает ResumeBlob для загруженного файла, увеличивая счетчик ссылок.
+    Если файл с таким содержимым уже хранится, повторной записи
+    в хранилище не происходит.
+
+    Вызывать внутри транзакции, в которой создается заявка: при откате
+    откатится и счетчик. Записанный в хранилище новый файл добавляется
+    в список written - откат его не удалит (см. resume_upload).
+    """
+    digest = file_sha256(uploaded)
+    while True:
+        blob = ResumeBlob.objects.filter(sha256=digest).first()
+        if blob is None:
+            name = blob_name(digest, uploaded.name)
+            if not default_storage.exists(name):
+                name = default_storage.save(name, uploaded)
+                if written is not None:
+                    written.append((digest, name))
+            try:
+                with transaction.atomic():
+                    blob = ResumeBlob.objects.create(
+                        sha256=digest, file=name, size=uploaded.size,
+                        content_type=getattr(uploaded, 'content_type', '') or '', ref_count=1
+                    )
+                return blob
+            except IntegrityError:
+                # Такой же файл параллельно сохранил другой запрос
+                continue
+        # Запись могла быть удалена между SELECT и UPDATE - тогда повторяем
+        if ResumeBlob.objects.filter(pk=blob.pk).update(ref_count=F('ref_count') + 1):
+            blob.ref_count += 1
+            return blob
+
+
+@contextmanager
+def resume_upload(uploaded):
+    """
+    Транзакция сохранения заявки с загруженным резюме. Отдает поля заявки:
+    общий blob и путь к его файлу. Если транзакция откатится, файл,
+    записанный в хранилище в этом блоке, удаляется - иначе он остался бы
+    без записи ResumeBlob.
+    """
+    written = []
+    try:
+        with transaction.atomic():
+            blob = acquire_resume(uploaded, written)
+            yield {'resume': blob.file.name, 'resume_blob': blob}
+    except BaseException:
+        for digest, name in written:
+            # Тот же файл мог успеть сохранить параллельный запрос
+            if not ResumeBlob.objects.filter(sha256=digest).exists():
+                default_storage.delete(name)
+        raise
+
+
+def release_resume(blob_id):
+    """
+    Уменьшает счетчик ссылок; удаляет запись и файл, когда ссылок не осталось.
+    Файл удаляется после фиксации транзакции и только если за это время
+    тот же файл не был загружен заново.
+    """
+    ResumeBlob.objects.filter(pk=blob_id, ref_count__gt=0).update(ref_count=F('ref_count') - 1)
+    blob = ResumeBlob.objects.filter(pk=blob_id, ref_count=0).first()
+    if blob is None:
+        return
+    if not ResumeBlob.objects.filter(pk=blob.pk, ref_count=0).delete()[0]:
+        return
+
+    def delete_file():
+        if not ResumeBlob.objects.filter(sha256=blob.sha256).exists():
+            default_storage.delete(blob.file.name)
+
+    transaction.on_commit(delete_file)
@@ -0,0 +1,160 @@
+import re
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import connection
+from django.db.models import Q
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def tokenize(query):
+    """
+    Разбивает поисковую строку на слова (без спецсимволов и операторов)
+    """
+    return TOKEN_RE.findall(query or '')
+
+
+class BaseSearchBackend:
+    """
+    Базовый класс поискового бэкенда по вакансиям
+    """
+
+    def index(self, job):
+        """Добавить или обновить вакансию в индексе"""
+        raise NotImplementedError
+
+    def remove(self, job_id):
+        """Удалить вакансию из индекса"""
+        raise NotImplementedError
+
+    def rebuild(self):
+        """Полностью перестроить индекс"""
+        raise NotImplementedError
+
+    def search(self, queryset, query):
+        """
+        Отфильтровать queryset по поисковому запросу и отсортировать по релевантности.
+        queryset - вакансии (Job) или их карточки (JobCard)
+        """
+        raise NotImplementedError
+
+
+class SimpleSearchBackend(BaseSearchBackend):
+    """
+    Резервный бэкенд без индекса: LIKE-поиск по названию и описанию.
+    Используется для СУБД без полнотекстового поиска.
+    """
+
+    def index(self, job):
+        pass
+
+    def remove(self, job_id):
+        pass
+
+    def rebuild(self):
+        pass
+
+    def search(self, queryset, query):
+        tokens = tokenize(query)
+        if not tokens:
+            return queryset
+        for token in tokens:
+            queryset = queryset.filter(
+                Q(title__icontains=token) | Q(description__icontains=token)
+            )
+        return queryset.order_by('-created_at')
+
+
+class SQLiteFTSBackend(BaseSearchBackend):
+    """
+    Инвертированный индекс на основе теневой таблицы SQLite FTS5.
+    rowid таблицы совпадает с id вакансии, результаты ранжируются по BM25.
+    """
+    table = 'myproject_job_fts'
+    # Веса колонок для bm25(): совпадение в названии важнее, чем в описании
+    title_weight = 10.0
+    description_weight = 1.0
+
+    def index(self, job):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table} WHERE rowid = %s', [job.pk])
+            cursor.execute(
+                f'INSERT INTO {self.table} (rowid, title, description) VALUES (%s, %s, %s)',
+                [job.pk, job.title, job.description]
+            )
+
+    def remove(self, job_id):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table} WHERE rowid = %s', [job_id])
+
+    def rebuild(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table}')
+            cursor.execute(
+                f'INSERT INTO {self.table} (rowid, title, description) '
+                f'SELECT id, title, description FROM myproject_job'
+            )
+
+    def build_match(self, query):
+        """
+        Преобразует пользовательский ввод в безопасное выражение FTS5.
+        Каждое слово берется в кавычки, последнее ищется по префиксу,
+        чтобы поиск работал при наборе текста.
+        """
+        tokens = tokenize(query)
+        if not tokens:
+            return None
+        terms = [f'"{token}"' for token in tokens]
+        terms[-1] += '*'
+        return ' '.join(terms)
+
+    def search(self, queryset, query):
+        match = self.build_match(query)
+        if match is None:
+            return queryset
+        # rowid совпадает с id вакансии - и в самой вакансии, и в ее карточке (JobCard).
+        # Таблица индекса присоединяется к запросу: MATCH выполняется один раз,
+        # а bm25() считается для найденных строк без коррелированного подзапроса
+        opts = queryset.model._meta
+        job_id_column = f'{opts.db_table}.{opts.pk.column}'
+        # bm25() возвращает отрицательные значения: чем меньше, тем релевантнее
+        return queryset.extra(
+            select={'search_rank': f'bm25({self.table}, %s, %s)'},
+            select_params=[self.title_weight, self.description_weight],
+            tables=[self.table],
+            where=[f'{self.table} MATCH %s', f'{self.table}.rowid = {job_id_column}'],
+            params=[match],
+        ).order_by('search_rank', '-created_at')
+
+
+@lru_cache(maxsize=None)
+def get_search_backend():
+    """
+    Возвращает экземпляр бэкенда, заданного в settings.SEARCH_BACKEND
+    """
+    backend_path = getattr(settings, 'SEARCH_BACKEND', None)
+    if backend_path is None:
+        backend_path = (
+            'myproject.utils.search.SQLiteFTSBackend'
+            if connection.vendor == 'sqlite'
+            else 'myproject.utils.search.SimpleSearchBackend'
+        )
+    return import_string(backend_path)()
+
+
+@receiver(setting_changed)
+def reset_search_backend(setting, **kwargs):
+    """Бэкенд кешируется - смена SEARCH_BACKEND (override_settings) сбрасывает кеш"""
+    if setting == 'SEARCH_BACKEND':
+        get_search_backend.cache_clear()
+
+
+def search_jobs(queryset, query):
+    """
+    Применяет полнотекстовый поиск к queryset вакансий
+    """
+    return get_search_backend().search(queryset, query)
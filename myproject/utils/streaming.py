@@ -0,0 +1,280 @@
+import csv
+import json
+import re
+import zipfile
+from itertools import chain
+from xml.sax.saxutils import escape
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+
+from ..exceptions import ValidationError
+
+EXPORT_FORMATS = {
+    'ndjson': 'application/x-ndjson; charset=utf-8',
+    'json': 'application/json; charset=utf-8',
+}
+# Табличные форматы: строки - кортежи значений в порядке заголовка
+TABULAR_EXPORT_FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+}
+ALL_EXPORT_FORMATS = (*EXPORT_FORMATS, *TABULAR_EXPORT_FORMATS)
+# Сколько строк читается из БД за один проход курсора
+EXPORT_CHUNK_SIZE = 500
+# Сколько сериализованных строк отправляется клиенту одним куском
+EXPORT_BATCH_SIZE = 100
+
+
+class InvalidExportFormatError(ValidationError):
+    default_code = 'invalid_export_format'
+
+    def __init__(self, formats):
+        """formats - форматы, которые принимает вызвавший эндпоинт"""
+        super().__init__('Неподдерживаемый формат выгрузки. Допустимые значения: ' + ', '.join(formats))
+
+
+def is_asgi_request(request):
+    """
+    Запрос обслуживает ASGI-обработчик. Тело StreamingHttpResponse должно
+    совпадать с ним по типу: под ASGI Django собирает синхронный итератор
+    в список целиком, под WSGI - асинхронный, и ответ перестает быть потоковым.
+    """
+    return isinstance(getattr(request, '_request', request), ASGIRequest)
+
+
+async def _aiter_sync(chunks):
+    """
+    Асинхронная обертка над синхронным генератором выгрузки: каждый кусок
+    вычисляется через sync_to_async в потоке запроса (thread_sensitive),
+    потому что курсор queryset.iterator() привязан к соединению этого потока
+    """
+    next_chunk = sync_to_async(next, thread_sensitive=True)
+    try:
+        while (chunk := await next_chunk(chunks, None)) is not None:
+            yield chunk
+    finally:
+        # Клиент отключился - закрываем генератор и курсор в том же потоке
+        await sync_to_async(chunks.close, thread_sensitive=True)()
+
+
+def _dumps(item):
+    return json.dumps(item, cls=DjangoJSONEncoder, ensure_ascii=False)
+
+
+def _batched(lines):
+    batch = []
+    for line in lines:
+        batch.append(line)
+        if len(batch) >= EXPORT_BATCH_SIZE:
+            yield ''.join(batch)
+            batch = []
+    if batch:
+        yield ''.join(batch)
+
+
+def iter_ndjson(items):
+    """Одна JSON-запись на строку"""
+    return _batched(_dumps(item) + '\n' for item in items)
+
+
+def iter_json_array(items):
+    """
+    JSON-массив, отдаваемый по частям. Открывающая скобка уходит клиенту
+    до выполнения запроса к БД.
+    """
+    yield '['
+    def lines():
+        for index, item in enumerate(items):
+            yield (',' if index else '') + _dumps(item)
+    yield from _batched(lines())
+    yield ']'
+
+
+def aiter_ndjson(items):
+    return _aiter_sync(iter_ndjson(items))
+
+
+def aiter_json_array(items):
+    return _aiter_sync(iter_json_array(items))
+
+
+def streaming_export_response(request, queryset, serialize, export_format, allowed_formats=EXPORT_FORMATS):
+    """
+    Потоковая выгрузка queryset без загрузки всех строк в память.
+    serialize - функция, превращающая объект модели в словарь.
+    allowed_formats - все форматы эндпоинта (для сообщения об ошибке), если
+    табличные форматы он обрабатывает сам. Под ASGI тело - асинхронный итератор.
+    """
+    if export_format not in EXPORT_FORMATS:
+        raise InvalidExportFormatError(allowed_formats)
+    rows = (serialize(obj) for obj in queryset.iterator(chunk_size=EXPORT_CHUNK_SIZE))
+    if is_asgi_request(request):
+        stream = aiter_ndjson(rows) if export_format == 'ndjson' else aiter_json_array(rows)
+    else:
+        stream = iter_ndjson(rows) if export_format == 'ndjson' else iter_json_array(rows)
+    response = StreamingHttpResponse(stream, content_type=EXPORT_FORMATS[export_format])
+    # Не даем прокси (nginx) буферизовать ответ целиком
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+class _Echo:
+    """Псевдофайл для csv.writer: writerow возвращает готовую строку"""
+
+    def write(self, value):
+        return value
+
+
+# Значения, которые Excel и LibreOffice выполнят как формулу
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+def _csv_cell(value):
+    if value is None:
+        return ''
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def iter_csv(header, rows):
+    """
+    CSV построчно. BOM в начале нужен, чтобы Excel распознал UTF-8.
+    Строковые значения, похожие на формулы, экранируются апострофом.
+    """
+    writer = csv.writer(_Echo())
+    yield '\ufeff'
+    yield from _batched(
+        writer.writerow([_csv_cell(value) for value in row]) for row in chain([header], rows)
+    )
+
+
+class _ZipStream:
+    """
+    Файловый объект только для записи: zipfile пишет в него архив,
+    генератор забирает накопленные байты. Метода tell нет, поэтому
+    zipfile пишет архив последовательно, без перемотки назад.
+    """
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self.chunks)
+        self.chunks = []
+        return data
+
+
+XLSX_NAMESPACE = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+XLSX_RELATIONSHIPS = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+XLSX_PACKAGE_RELATIONSHIPS = 'http://schemas.openxmlformats.org/package/2006/relationships'
+XML_DECLARATION = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+# Символы, недопустимые в XML 1.0
+XML_INVALID_RE = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+
+def _xlsx_parts(sheet_name):
+    """Служебные части книги с одним листом"""
+    sheet_name = escape(sheet_name, {'"': '&quot;'})
+    return {
+        '[Content_Types].xml': (
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/xl/workbook.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+            '<Override PartName="/xl/worksheets/sheet1.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+            '</Types>'
+        ),
+        '_rels/.rels': (
+            f'<Relationships xmlns="{XLSX_PACKAGE_RELATIONSHIPS}">'
+            f'<Relationship Id="rId1" Type="{XLSX_RELATIONSHIPS}/officeDocument" Target="xl/workbook.xml"/>'
+            '</Relationships>'
+        ),
+        'xl/workbook.xml': (
+            f'<workbook xmlns="{XLSX_NAMESPACE}" xmlns:r="{XLSX_RELATIONSHIPS}">'
+            f'<sheets><sheet name="{sheet_name}" sheetId="1" r:id="rId1"/></sheets>'
+            '</workbook>'
+        ),
+        'xl/_rels/workbook.xml.rels': (
+            f'<Relationships xmlns="{XLSX_PACKAGE_RELATIONSHIPS}">'
+            f'<Relationship Id="rId1" Type="{XLSX_RELATIONSHIPS}/worksheet" Target="worksheets/sheet1.xml"/>'
+            '</Relationships>'
+        ),
+    }
+
+
+def _xlsx_cell(value):
+    if value is None:
+        return '<c/>'
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return f'<c><v>{value}</v></c>'
+    text = escape(XML_INVALID_RE.sub('', str(value)))
+    return f'<c t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+
+def _xlsx_row(number, row):
+    return f'<row r="{number}">' + ''.join(_xlsx_cell(value) for value in row) + '</row>'
+
+
+def iter_xlsx(header, rows, sheet_name='Лист1'):
+    """
+    Книга XLSX из одного листа, которая пишется в zip по мере чтения строк.
+    Строки хранятся как inline-строки, без общей таблицы строк (sharedStrings),
+    которую пришлось бы держать в памяти до конца выгрузки.
+    """
+    stream = _ZipStream()
+    with zipfile.ZipFile(stream, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, content in _xlsx_parts(sheet_name).items():
+            archive.writestr(name, XML_DECLARATION + content)
+        yield stream.drain()
+        # Размер листа заранее неизвестен - сразу разрешаем zip64
+        with archive.open('xl/worksheets/sheet1.xml', 'w', force_zip64=True) as sheet:
+            sheet.write(f'{XML_DECLARATION}<worksheet xmlns="{XLSX_NAMESPACE}"><sheetData>'.encode())
+            lines = (_xlsx_row(number, row) for number, row in enumerate(chain([header], rows), start=1))
+            for batch in _batched(lines):
+                sheet.write(batch.encode())
+                data = stream.drain()
+                if data:
+                    yield data
+            sheet.write(b'</sheetData></worksheet>')
+    yield stream.drain()
+
+
+def aiter_csv(header, rows):
+    return _aiter_sync(iter_csv(header, rows))
+
+
+def aiter_xlsx(header, rows, sheet_name='Лист1'):
+    return _aiter_sync(iter_xlsx(header, rows, sheet_name))
+
+
+def tabular_export_response(request, header, rows, export_format, filename, sheet_name='Лист1',
+                            allowed_formats=TABULAR_EXPORT_FORMATS):
+    """
+    Потоковая выгрузка таблицы в CSV или XLSX файлом-вложением.
+    rows - итератор кортежей (обычно values_list(...).iterator()),
+    поэтому память не растет с числом строк. Под ASGI тело - асинхронный итератор.
+    """
+    if export_format not in TABULAR_EXPORT_FORMATS:
+        raise InvalidExportFormatError(allowed_formats)
+    asgi = is_asgi_request(request)
+    if export_format == 'csv':
+        stream = aiter_csv(header, rows) if asgi else iter_csv(header, rows)
+    else:
+        stream = aiter_xlsx(header, rows, sheet_name) if asgi else iter_xlsx(header, rows, sheet_name)
+    response = StreamingHttpResponse(stream, content_type=TABULAR_EXPORT_FORMATS[export_format])
+    response['Content-Disposition'] = f'attachment; filename="{filename}.{export_format}"'
+    response['X-Accel-Buffering'] = 'no'
+    return response
@@ -1,18 +1,18 @@
-from django.shortcuts import render, get_object_or_404, redirect
+from django.shortcuts import render, get_object_or_404, aget_object_or_404, redirect
 from django.contrib.auth.decorators import login_required, permission_required
 from django.core.paginator import Paginator
-from django.db.models import Q
-from .models import Job, Department, Skill, Application, UserSkill, JobSkill, User, Message, Review, Notification, Favorite, Profile
-from django.http import JsonResponse, Http404, FileResponse
+from django.db.models import OuterRef, Q, Subquery
+from .models import Job, JobCard, Department, Skill, Application, UserSkill, JobSkill, User, Message, Review, Notification, Favorite, Profile, ConversationParticipant
+from django.http import JsonResponse, Http404
 from django.contrib import messages
 from django.contrib.auth import login, authenticate, logout
 from django.contrib.auth.forms import AuthenticationForm
-from django.views.decorators.http import require_POST
+from django.views.decorators.http import require_GET, require_POST
 from django.core.exceptions import PermissionDenied as DjangoPermissionDenied
 from django.utils import timezone
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated, IsAuthenticatedOrReadOnly, AllowAny
-from rest_framework.exceptions import NotAuthenticated, ValidationError, PermissionDenied, NotFound
+from rest_framework.exceptions import APIException, NotAuthenticated, ValidationError, PermissionDenied, NotFound
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 from .forms import ApplicationForm, UserRegistrationForm, ProfileForm, UserSkillForm
@@ -33,67 +33,173 @@ from .exceptions import (
     ApplicationAlreadyExistsError, JobDeadlineExpiredError,
     InvalidFileTypeError, FileTooLargeError, ValidationError
 )
-from django.db import IntegrityError
+from django.db import IntegrityError, transaction
 from django.urls import reverse
-from django.http import HttpResponse
+from django.http import HttpResponse, StreamingHttpResponse
 from django.template.loader import render_to_string
 from django.views.generic import TemplateView
-from django.views.decorators.csrf import csrf_exempt, requires_csrf_token
+from django.views.decorators.csrf import csrf_exempt, csrf_protect, requires_csrf_token
 import json
 from django.http import HttpResponseServerError
 from datetime import date, datetime
 import os
+from django.conf import settings
+from asgiref.sync import sync_to_async
+from .utils.search import search_jobs
+from .api.optimization import optimize_queryset
+from .utils.streaming import streaming_export_response
+from .utils.facets import JobFacets
+from .utils.cache import get_jobs_version, get_or_set_jobs_cache, aget_jobs_version, aget_or_set_jobs_cache
+from .utils.job_cards import deferred_job_card_refresh
+from .utils.job_stats import with_job_stats, status_counts, format_duration
+from .utils.application_status import bulk_update_status, parse_application_ids
+from .utils.outbox import enqueue
+from .utils.resumes import resume_upload, use_hashing_upload_handler
+from .utils.application_events import record_created, record_status_change
+from .utils.file_delivery import adeliver_file
+from .utils.conversations import mark_conversation_read
+from .utils.events import current_cursor, parse_event_id, stream_events
+from django.utils.safestring import mark_safe
 
 # API Views
+def _job_to_dict(job):
+    """Краткое представление вакансии для JSON-ответов"""
+    return {
+        'id': job.id,
+        'title': job.title,
+        'description': job.description,
+        'department': job.department.name,
+        'job_type': job.get_job_type_display(),
+        'salary': job.salary,
+        'deadline': job.deadline,
+        'created_at': job.created_at
+    }
+
+def _job_card_to_dict(card):
+    """То же представление по карточке вакансии (без обращения к связанным таблицам)"""
+    return {
+        'id': card.pk,
+        'title': card.title,
+        'description': card.description,
+        'department': card.department_name,
+        'job_type': card.get_job_type_display(),
+        'salary': card.salary,
+        'deadline': card.deadline,
+        'created_at': card.created_at
+    }
+
+def _favorite_job_cards(user):
+    """Карточки избранных вакансий пользователя, последние добавленные первыми"""
+    favorites = Favorite.objects.filter(user=user, job_id=OuterRef('pk'))
+    return (
+        JobCard.objects.filter(pk__in=Favorite.objects.filter(user=user).values('job_id'))
+        .annotate(favorited_at=Subquery(favorites.values('created_at')))
+        .order_by('-favorited_at')
+    )
+
+def _facet_filter_options(facets):
+    """Типы вакансий и отделы для фильтров формы вместе с фасетными счетчиками"""
+    job_type_counts = JobFacets.counts(facets, 'job_type')
+    department_counts = JobFacets.counts(facets, 'department')
+    job_types = [
+        (value, label, job_type_counts.get(value, 0))
+        for value, label in Job.JOB_TYPE_CHOICES
+    ]
+    all_departments = get_or_set_jobs_cache(
+        'departments', None, lambda: list(Department.objects.values('id', 'name'))
+    )
+    departments = [
+        dict(department, facet_count=department_counts.get(str(department['id']), 0))
+        for department in all_departments
+    ]
+    return job_types, departments
+
+def _paginate_jobs(request, queryset):
+    """Разбивает список вакансий на страницы, сохраняя параметры фильтрации"""
+    page_obj = Paginator(queryset, settings.JOBS_PER_PAGE).get_page(request.GET.get('page'))
+    query_params = request.GET.copy()
+    query_params.pop('page', None)
+    return page_obj, query_params.urlencode()
+
+def _cached_job_results(request, queryset, namespace):
+    """
+    HTML-фрагмент со списком вакансий и пагинацией. Кешируется по параметрам
+    фильтра и версии данных вакансий, поэтому при попадании в кеш запросы
+    к вакансиям не выполняются.
+    """
+    def render_results():
+        page_obj, query_params = _paginate_jobs(request, queryset)
+        return render_to_string('jobs/_job_results.html', {
+            'jobs': page_obj,
+            'page_obj': page_obj,
+            'query_params': query_params,
+            'jobs_version': get_jobs_version(),
+        })
+    return mark_safe(get_or_set_jobs_cache(namespace, request.GET, render_results))
+
 @swagger_auto_schema(
     method='get',
     operation_description="Получить список всех вакансий",
     manual_parameters=[
+        openapi.Parameter('q', openapi.IN_QUERY, description="Полнотекстовый поиск по названию и описанию", type=openapi.TYPE_STRING),
         openapi.Parameter('job_type', openapi.IN_QUERY, description="Тип вакансии", type=openapi.TYPE_STRING),
         openapi.Parameter('department', openapi.IN_QUERY, description="ID отдела", type=openapi.TYPE_INTEGER),
+        openapi.Parameter('page', openapi.IN_QUERY, description="Номер страницы результатов поиска", type=openapi.TYPE_INTEGER),
         openapi.Parameter('format', openapi.IN_QUERY, description="Формат ответа (html или json)", type=openapi.TYPE_STRING),
+        openapi.Parameter('export', openapi.IN_QUERY, description="Потоковая выгрузка всех вакансий: ndjson или json", type=openapi.TYPE_STRING),
     ]
 )
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def job_list(request):
-    queryset = Job.objects.filter(is_active=True)
+    queryset = JobCard.objects.filter(is_active=True)
     
     job_type = request.GET.get('job_type')
     department = request.GET.get('department')
+    query = request.GET.get('q', '').strip()
     format = request.GET.get('format', 'html')
     
-    if job_type:
-        queryset = queryset.filter(job_type=job_type)
-    if department:
-        queryset = queryset.filter(department_id=department)
+    if query:
+        queryset = search_jobs(queryset, query)
+    
+    # Фасеты считаются до применения фильтров по типу и отделу
+    selected_facets = JobFacets.selected_from(request.GET)
+    facet_engine = JobFacets(queryset, selected_facets)
+    queryset = JobFacets.apply(queryset, selected_facets)
+    
+    export_format = request.GET.get('export')
+    if export_format:
+        return streaming_export_response(request, queryset, _job_card_to_dict, export_format)
     
     if format == 'json':
-        return Response({
-            'jobs': [
-                {
-                    'id': job.id,
-                    'title': job.title,
-                    'description': job.description,
-                    'department': job.department.name,
-                    'job_type': job.get_job_type_display(),
-                    'salary': job.salary,
-                    'deadline': job.deadline,
-                    'created_at': job.created_at
-                }
-                for job in queryset
-            ]
-        })
+        def build_data():
+            data = {}
+            jobs = queryset
+            # Результаты поиска отдаются постранично в порядке релевантности
+            if query:
+                page_obj = Paginator(queryset, settings.JOBS_PER_PAGE).get_page(request.GET.get('page'))
+                jobs = page_obj.object_list
+                data.update({
+                    'count': page_obj.paginator.count,
+                    'page': page_obj.number,
+                    'num_pages': page_obj.paginator.num_pages,
+                })
+            data['jobs'] = [_job_card_to_dict(job) for job in jobs]
+            data['facets'] = facet_engine.get()
+            return data
+        return Response(get_or_set_jobs_cache('job_list_json', request.GET, build_data))
     
-    departments = Department.objects.all()
-    job_types = Job.JOB_TYPE_CHOICES
+    facets = facet_engine.get()
+    job_types, departments = _facet_filter_options(facets)
     
     return render(request, 'jobs/job_list.html', {
-        'jobs': queryset,
+        'results_html': _cached_job_results(request, queryset, 'job_list_html'),
+        'facets': facets,
         'departments': departments,
         'job_types': job_types,
         'current_job_type': job_type,
-        'current_department': department
+        'current_department': department,
+        'current_query': query
     })
 
 @api_view(['GET'])
@@ -102,16 +208,7 @@ def job_detail(request, job_id):
     try:
         job = Job.objects.get(id=job_id)
         if request.accepted_renderer.format == 'json':
-            return Response({
-                'id': job.id,
-                'title': job.title,
-                'description': job.description,
-                'department': job.department.name,
-                'job_type': job.get_job_type_display(),
-                'salary': job.salary,
-                'deadline': job.deadline,
-                'created_at': job.created_at
-            })
+            return Response(_job_to_dict(job))
         
         # Проверяем, подавал ли пользователь заявку на эту вакансию
         has_applied = False
@@ -137,23 +234,41 @@ def job_detail(request, job_id):
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def api_favorites(request):
-    jobs = Job.objects.filter(favorites=request.user)
+    jobs = _favorite_job_cards(request.user)
+    export_format = request.GET.get('export')
+    if export_format:
+        return streaming_export_response(request, jobs, _job_card_to_dict, export_format)
     return Response({
-        'jobs': [
-            {
-                'id': job.id,
-                'title': job.title,
-                'description': job.description,
-                'department': job.department.name,
-                'job_type': job.get_job_type_display(),
-                'salary': job.salary,
-                'deadline': job.deadline,
-                'created_at': job.created_at
-            }
-            for job in jobs
-        ]
+        'jobs': [_job_card_to_dict(job) for job in jobs]
     })
 
+@require_GET
+async def api_events(request):
+    """
+    Поток Server-Sent Events текущего пользователя: новые уведомления
+    (event: notification) и входящие сообщения чатов (event: message).
+    Продолжает с заголовка Last-Event-ID (или параметра last_event_id),
+    без него - начинает с новых событий. Требует ASGI-сервера.
+    """
+    user = await request.auser()
+    if not user.is_authenticated:
+        return JsonResponse({
+            'error': {
+                'code': 'authentication_error',
+                'message': 'Требуется аутентификация',
+                'details': 'Учетные данные не были предоставлены.'
+            }
+        }, status=401)
+
+    cursor = parse_event_id(request.headers.get('Last-Event-ID') or request.GET.get('last_event_id'))
+    if cursor is None:
+        cursor = await current_cursor(user.pk)
+    response = StreamingHttpResponse(stream_events(user.pk, cursor), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # nginx не должен буферизовать поток
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
 @api_view(['GET', 'POST'])
 @permission_classes([AllowAny])
 def api_applications(request):
@@ -166,6 +281,11 @@ def api_applications(request):
         else:
             applications = Application.objects.filter(applicant=request.user)
         
+        applications = optimize_queryset(applications, ApplicationSerializer)
+        export_format = request.GET.get('export')
+        if export_format:
+            serializer = ApplicationSerializer(context={'request': request})
+            return streaming_export_response(request, applications, serializer.to_representation, export_format)
         serializer = ApplicationSerializer(applications, many=True)
         return Response(serializer.data)
     
@@ -204,35 +324,42 @@ def api_applications(request):
             raise e
 
 # Web Views
-def home(request):
-    jobs = Job.objects.filter(is_active=True).order_by('-created_at')[:5]
-    return render(request, 'home.html', {'jobs': jobs})
+async def home(request):
+    async def latest_jobs():
+        return [card async for card in JobCard.objects.filter(is_active=True).order_by('-created_at')[:5]]
+
+    jobs = await aget_or_set_jobs_cache('home', None, latest_jobs)
+    # Шаблон шапки читает профиль пользователя синхронным ORM
+    return await sync_to_async(render)(request, 'home.html', {'jobs': jobs, 'jobs_version': await aget_jobs_version()})
 
 @login_required
 def job_list_view(request):
     """Список всех вакансий"""
-    jobs = Job.objects.all().order_by('-created_at')
+    jobs = JobCard.objects.order_by('-created_at')
     
     # Получаем параметры фильтрации
     job_type = request.GET.get('job_type')
     department_id = request.GET.get('department')
+    query = request.GET.get('q', '').strip()
     
-    # Применяем фильтры
-    if job_type:
-        jobs = jobs.filter(job_type=job_type)
-    if department_id:
-        jobs = jobs.filter(department_id=department_id)
+    # Применяем фильтры (фасеты считаются до фильтров по типу и отделу)
+    if query:
+        jobs = search_jobs(jobs, query)
+    selected_facets = JobFacets.selected_from(request.GET)
+    facets = JobFacets(jobs, selected_facets).get()
+    jobs = JobFacets.apply(jobs, selected_facets)
     
-    # Получаем все отделы и типы вакансий
-    departments = Department.objects.all()
-    job_types = Job.JOB_TYPE_CHOICES
+    # Получаем все отделы и типы вакансий со счетчиками
+    job_types, departments = _facet_filter_options(facets)
     
     return render(request, 'jobs/job_list.html', {
-        'jobs': jobs,
+        'results_html': _cached_job_results(request, jobs, 'job_list_view_html'),
+        'facets': facets,
         'departments': departments,
         'job_types': job_types,
         'current_job_type': job_type,
-        'current_department': department_id
+        'current_department': department_id,
+        'current_query': query
     })
 
 @login_required
@@ -290,29 +417,31 @@ def job_create(request):
         # Создаем сериализатор с модифицированными данными
         serializer = JobSerializer(data=data)
         if serializer.is_valid():
-            job = serializer.save(employer=request.user)
+            # Навыки заменяются целиком: карточка пересобирается один раз
+            with transaction.atomic(), deferred_job_card_refresh():
+                job = serializer.save(employer=request.user)
             
-            # Обработка навыков
-            skill_ids = request.POST.getlist('skill_ids[]')
-            skill_levels = request.POST.getlist('skill_levels[]')
-            skill_required = request.POST.getlist('skill_required[]')
+                # Обработка навыков
+                skill_ids = request.POST.getlist('skill_ids[]')
+                skill_levels = request.POST.getlist('skill_levels[]')
+                skill_required = request.POST.getlist('skill_required[]')
             
-            # Удаляем существующие навыки (если это редактирование)
-            JobSkill.objects.filter(job=job).delete()
+                # Удаляем существующие навыки (если это редактирование)
+                JobSkill.objects.filter(job=job).delete()
             
-            # Добавляем новые связи между навыками и вакансией
-            for i in range(len(skill_ids)):
-                if i < len(skill_levels) and i < len(skill_required):
-                    try:
-                        skill = Skill.objects.get(id=skill_ids[i])
-                        JobSkill.objects.create(
-                            job=job,
-                            skill=skill,
-                            level=skill_levels[i],
-                            is_required=skill_required[i] == 'true'
-                        )
-                    except Skill.DoesNotExist:
-                        continue
+                # Добавляем новые связи между навыками и вакансией
+                for i in range(len(skill_ids)):
+                    if i < len(skill_levels) and i < len(skill_required):
+                        try:
+                            skill = Skill.objects.get(id=skill_ids[i])
+                            JobSkill.objects.create(
+                                job=job,
+                                skill=skill,
+                                level=skill_levels[i],
+                                is_required=skill_required[i] == 'true'
+                            )
+                        except Skill.DoesNotExist:
+                            continue
             
             messages.success(request, 'Вакансия успешно создана')
             return redirect('job_detail', job_id=job.id)
@@ -338,29 +467,31 @@ def job_edit(request, job_id):
     if request.method == 'POST':
         serializer = JobSerializer(job, data=request.POST)
         if serializer.is_valid():
-            serializer.save()
+            # Навыки заменяются целиком: карточка пересобирается один раз
+            with transaction.atomic(), deferred_job_card_refresh():
+                serializer.save()
             
-            # Обработка навыков
-            skill_ids = request.POST.getlist('skill_ids[]')
-            skill_levels = request.POST.getlist('skill_levels[]')
-            skill_required = request.POST.getlist('skill_required[]')
+                # Обработка навыков
+                skill_ids = request.POST.getlist('skill_ids[]')
+                skill_levels = request.POST.getlist('skill_levels[]')
+                skill_required = request.POST.getlist('skill_required[]')
             
-            # Удаляем существующие навыки
-            JobSkill.objects.filter(job=job).delete()
+                # Удаляем существующие навыки
+                JobSkill.objects.filter(job=job).delete()
             
-            # Добавляем новые связи между навыками и вакансией
-            for i in range(len(skill_ids)):
-                if i < len(skill_levels) and i < len(skill_required):
-                    try:
-                        skill = Skill.objects.get(id=skill_ids[i])
-                        JobSkill.objects.create(
-                            job=job,
-                            skill=skill,
-                            level=skill_levels[i],
-                            is_required=skill_required[i] == 'true'
-                        )
-                    except Skill.DoesNotExist:
-                        continue
+                # Добавляем новые связи между навыками и вакансией
+                for i in range(len(skill_ids)):
+                    if i < len(skill_levels) and i < len(skill_required):
+                        try:
+                            skill = Skill.objects.get(id=skill_ids[i])
+                            JobSkill.objects.create(
+                                job=job,
+                                skill=skill,
+                                level=skill_levels[i],
+                                is_required=skill_required[i] == 'true'
+                            )
+                        except Skill.DoesNotExist:
+                            continue
             
             messages.success(request, 'Вакансия успешно обновлена')
             return redirect('job_detail', job_id=job.id)
@@ -413,9 +544,7 @@ def favorites(request):
     if not request.user.is_authenticated:
         return redirect('login')
         
-    favorites = Favorite.objects.filter(user=request.user).select_related('job')
-    jobs = [favorite.job for favorite in favorites]
-    return render(request, 'jobs/favorites.html', {'jobs': jobs})
+    return render(request, 'jobs/favorites.html', {'jobs': _favorite_job_cards(request.user)})
 
 @login_required
 def applications(request):
@@ -423,7 +552,11 @@ def applications(request):
         applications = Application.objects.filter(job__employer=request.user)
     else:
         applications = Application.objects.filter(applicant=request.user)
-    return render(request, 'applications/list.html', {'applications': applications})
+    applications = applications.select_related('job', 'job__department')
+    return render(request, 'applications/list.html', {
+        'applications': applications,
+        'status_choices': Application.STATUS_CHOICES,
+    })
 
 @login_required
 def application_detail(request, application_id):
@@ -436,19 +569,11 @@ def application_detail(request, application_id):
     # Получаем список сообщений, связанных с этой заявкой
     chat_messages = Message.objects.filter(application=application).order_by('created_at')
     
-    # Помечаем все непрочитанные сообщения как прочитанные
+    # Помечаем непрочитанные сообщения собеседника как прочитанные
     if request.user.role == 'employer':
-        Message.objects.filter(
-            application=application, 
-            sender=application.applicant, 
-            is_read=False
-        ).update(is_read=True)
+        mark_conversation_read(request.user, application.id, application.applicant_id)
     else:
-        Message.objects.filter(
-            application=application, 
-            sender=application.job.employer, 
-            is_read=False
-        ).update(is_read=True)
+        mark_conversation_read(request.user, application.id, application.job.employer_id)
     
     return render(request, 'applications/detail.html', {
         'application': application,
@@ -468,33 +593,36 @@ def update_application_status(request, application_id):
         new_status = request.POST.get('status')
         
         if new_status in dict(Application.STATUS_CHOICES):
-            old_status = application.status
-            application.status = new_status
-            application.save()
-            
-            # Создаем уведомление для соискателя
-            Notification.objects.create(
-                user=application.applicant,
-                title=f'Статус заявки изменен',
-                content=f'Статус вашей заявки на вакансию "{application.job.title}" изменен на "{application.get_status_display()}"',
-                type='application_update'
-            )
-            
-            # Если заявка была принята, создаем системное сообщение в чате
-            if new_status == 'accepted' and old_status != 'accepted':
-                Message.objects.create(
-                    sender=request.user,
-                    receiver=application.applicant,
-                    application=application,
-                    content=f'Ваша заявка на вакансию "{application.job.title}" была принята. Теперь вы можете общаться с работодателем.'
-                )
-            
-            messages.success(request, f'Статус заявки изменен на "{application.get_status_display()}"')
+            bulk_update_status(request.user, [application.id], new_status)
+            messages.success(request, f'Статус заявки изменен на "{dict(Application.STATUS_CHOICES)[new_status]}"')
         else:
             messages.error(request, 'Некорректный статус заявки')
     
     return redirect('application_detail', application_id=application.id)
 
+@login_required
+@require_POST
+def bulk_update_application_status(request):
+    """Изменение статуса нескольких заявок работодателем"""
+    if request.user.role != 'employer':
+        messages.error(request, 'Только работодатели могут изменять статус заявок')
+        return redirect('applications')
+
+    new_status = request.POST.get('status')
+    application_ids = request.POST.getlist('application_ids')
+    if not application_ids:
+        messages.error(request, 'Не выбрано ни одной заявки')
+    elif new_status not in dict(Application.STATUS_CHOICES):
+        messages.error(request, 'Некорректный статус заявки')
+    else:
+        try:
+            changed = bulk_update_status(request.user, parse_application_ids(application_ids), new_status)
+        except APIException as e:
+            messages.error(request, str(e.detail))
+        else:
+            messages.success(request, f'Изменен статус заявок: {len(changed)}')
+    return redirect('applications')
+
 @login_required
 def send_message(request):
     """Отправка сообщения в чате между работодателем и соискателем"""
@@ -526,21 +654,15 @@ def send_message(request):
                 messages.error(request, 'Отправка сообщений доступна только для принятых заявок')
                 return redirect('application_detail', application_id=application.id)
             
-            # Создаем сообщение
-            message = Message.objects.create(
-                sender=request.user,
-                receiver=receiver,
-                application=application,
-                content=content
-            )
-            
-            # Создаем уведомление для получателя
-            Notification.objects.create(
-                user=receiver,
-                title='Новое сообщение',
-                content=f'У вас новое сообщение от {request.user.username} по заявке на вакансию "{application.job.title}"',
-                type='new_message'
-            )
+            # Создаем сообщение; уведомление получателю создаст обработчик outbox
+            with transaction.atomic():
+                message = Message.objects.create(
+                    sender=request.user,
+                    receiver=receiver,
+                    application=application,
+                    content=content
+                )
+                enqueue('message_sent', {'message_id': message.id})
             
             messages.success(request, 'Сообщение отправлено')
             
@@ -553,9 +675,19 @@ def send_message(request):
     
     return redirect('application_detail', application_id=application_id)
 
+@csrf_exempt
 @login_required
 def job_apply(request, job_id):
     """Подача заявки на вакансию"""
+    # Хеш резюме считается при приеме файла. Обработчик загрузки ставится
+    # до того, как проверка CSRF прочитает тело запроса, поэтому сама
+    # проверка перенесена в _job_apply
+    use_hashing_upload_handler(request)
+    return _job_apply(request, job_id)
+
+
+@csrf_protect
+def _job_apply(request, job_id):
     job = get_object_or_404(Job, id=job_id)
     
     if request.user.role != 'student':
@@ -582,7 +714,12 @@ def job_apply(request, job_id):
             application = form.save(commit=False)
             application.job = job
             application.applicant = request.user
-            application.save()
+            # Одинаковые файлы резюме хранятся один раз
+            with resume_upload(form.cleaned_data['resume']) as resume:
+                for field, value in resume.items():
+                    setattr(application, field, value)
+                application.save()
+                record_created(application, request.user)
             messages.success(request, 'Заявка успешно отправлена')
             return redirect('applications')
         else:
@@ -612,7 +749,10 @@ def cancel_application(request, application_id):
     application = get_object_or_404(Application, id=application_id, applicant=request.user)
     
     if application.status == 'pending':
-        application.delete()
+        with transaction.atomic():
+            # Запись в журнале остается и после удаления заявки
+            record_status_change([application], 'withdrawn', request.user)
+            application.delete()
         messages.success(request, 'Заявка успешно отменена.')
     else:
         messages.error(request, 'Невозможно отменить заявку в текущем статусе.')
@@ -958,7 +1098,7 @@ def profile_view(request, username=None):
     # Если пользователь работодатель, получаем размещенные им вакансии
     posted_jobs = []
     if profile_user.role == 'employer':
-        posted_jobs = Job.objects.filter(employer=profile_user)
+        posted_jobs = with_job_stats(Job.objects.filter(employer=profile_user)).order_by('-created_at')
     
     context = {
         'profile_user': profile_user,
@@ -970,6 +1110,24 @@ def profile_view(request, username=None):
     
     return render(request, 'profile/profile.html', context)
 
+DASHBOARD_JOBS_PER_PAGE = 50
+
+@login_required
+def employer_dashboard(request):
+    """Статистика заявок, избранного и отзывов по вакансиям работодателя"""
+    if request.user.role != 'employer':
+        raise PermissionDenied("Панель доступна только работодателям")
+
+    jobs = with_job_stats(Job.objects.filter(employer=request.user)).order_by('-created_at', '-id')
+    page_obj = Paginator(jobs, DASHBOARD_JOBS_PER_PAGE).get_page(request.GET.get('page'))
+    for job in page_obj.object_list:
+        job.status_counts = status_counts(job)
+        job.median_response = format_duration(job.median_response_seconds)
+    return render(request, 'profile/dashboard.html', {
+        'page_obj': page_obj,
+        'statuses': Application.STATUS_CHOICES,
+    })
+
 @login_required
 def edit_profile(request):
     """Редактирование профиля пользователя."""
@@ -1046,94 +1204,42 @@ def delete_profile_skill(request, skill_id):
 
 @login_required
 def messages_list(request):
-    """Страница со списком чатов пользователя"""
-    # Получаем все сообщения, где пользователь является отправителем или получателем
-    user_messages = Message.objects.filter(
-        Q(sender=request.user) | Q(receiver=request.user)
-    ).select_related('sender', 'receiver', 'application', 'application__job').order_by('-created_at')
-    
-    # Собираем уникальные чаты, группируя по заявке и собеседнику
-    chats = {}
-    for message in user_messages:
-        # Определяем собеседника (не текущего пользователя)
-        chat_partner = message.receiver if message.sender == request.user else message.sender
-        
-        # Создаем ключ чата: комбинация ID заявки и ID собеседника
-        chat_key = f"{message.application_id}_{chat_partner.id}" if message.application else f"0_{chat_partner.id}"
-        
-        # Если чат еще не в словаре или сообщение новее, обновляем информацию о чате
-        if chat_key not in chats or message.created_at > chats[chat_key]['last_message'].created_at:
-            chats[chat_key] = {
-                'chat_partner': chat_partner,
-                'application': message.application,
-                'last_message': message,
-                'unread_count': 0
-            }
-    
-    # Подсчитываем непрочитанные сообщения для каждого чата
-    for chat_key, chat_data in chats.items():
-        app_id = chat_data['application'].id if chat_data['application'] else None
-        partner_id = chat_data['chat_partner'].id
-        
-        if app_id:
-            chat_data['unread_count'] = Message.objects.filter(
-                application_id=app_id,
-                sender_id=partner_id,
-                receiver=request.user,
-                is_read=False
-            ).count()
-        else:
-            chat_data['unread_count'] = Message.objects.filter(
-                application_id=None,
-                sender_id=partner_id,
-                receiver=request.user,
-                is_read=False
-            ).count()
-    
-    # Сортируем чаты по времени последнего сообщения (сначала новые)
-    sorted_chats = sorted(
-        chats.values(),
-        key=lambda x: x['last_message'].created_at,
-        reverse=True
-    )
-    
+    """Страница со списком чатов пользователя, последние активные первыми"""
+    chats = ConversationParticipant.objects.filter(user=request.user).select_related(
+        'partner', 'partner__profile', 'conversation__application__job', 'conversation__last_message'
+    ).order_by('-last_message_at', '-id')
+    page_obj = Paginator(chats, settings.CONVERSATIONS_PER_PAGE).get_page(request.GET.get('page'))
     return render(request, 'messages/list.html', {
-        'chats': sorted_chats
+        'chats': page_obj,
+        'page_obj': page_obj,
     })
 
 @login_required
-def download_resume(request, application_id):
+async def download_resume(request, application_id):
     """
-    Serves the resume file associated with a specific application for download.
-    Ensures the requesting user is the employer associated with the job.
+    Отдает резюме заявки работодателю вакансии или самому соискателю.
+    Django только проверяет права, передачу байтов по возможности берет на себя
+    фронтовой прокси или хранилище (см. utils/file_delivery.py).
+    Под ASGI ожидание БД и хранилища не занимает поток воркера.
     """
-    application = get_object_or_404(Application, pk=application_id)
+    application = await aget_object_or_404(
+        Application.objects.select_related('job', 'applicant', 'resume_blob'), pk=application_id
+    )
 
-    # Security check: Allow employer or applicant to download
-    if not (request.user == application.job.employer or request.user == application.applicant):
-        # Or raise PermissionDenied
+    # Скачивать резюме могут работодатель вакансии и сам соискатель
+    user = await request.auser()
+    if user.id not in (application.job.employer_id, application.applicant_id):
         raise Http404("У вас нет прав для просмотра этого резюме.")
 
-    try:
-        # Get the resume directly from the Application model
-        resume_file = application.resume
-
-        if not resume_file:
-            raise Http404("Резюме для этой заявки не найдено.")
-
-        # Check if the file exists on the filesystem
-        if not hasattr(resume_file, 'path') or not os.path.exists(resume_file.path):
-             raise Http404("Файл резюме не найден на сервере.")
-
-        # Use FileResponse to stream the file and set Content-Disposition
-        response = FileResponse(open(resume_file.path, 'rb'), as_attachment=True, filename=os.path.basename(resume_file.name))
-        return response
-
-    except AttributeError as e:
-         # This might still catch issues if application.resume is somehow invalid
-         print(f"Error accessing resume attribute on application: {e}")
-         raise Http404("Не удалось получить доступ к файлу резюме в заявке.")
-    except Exception as e:
-        # Log other potential errors
-        print(f"Error downloading resume: {e}")
-        raise Http404("Не удалось загрузить резюме.")
+    if not application.resume:
+        raise Http404("Резюме для этой заявки не найдено.")
+
+    blob = application.resume_blob
+    extension = os.path.splitext(application.resume.name)[1]
+    return await adeliver_file(
+        request,
+        application.resume.name,
+        filename=f'resume_{application.applicant.username}{extension}',
+        etag=blob.sha256 if blob else None,
+        content_type=blob.content_type if blob else None,
+    )